@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for the Pokédex backend.
+
+Each module is runnable with `python -m benchmarks.<name>` from the
+repository root. They run against an in-memory test database and never
+touch the real PokeAPI.
+"""
@@ -0,0 +1,62 @@
+"""
+Request overhead of the require_authentication user envelope.
+
+Compares authenticated endpoints with a cold envelope (rebuilt on every
+request, the old behaviour) against the cached envelope, and reports
+latency and DB queries per request. The envelope is only cached when
+the cache is shared by all workers, so the run uses a file-based cache.
+
+    python -m benchmarks.auth_envelope --iterations 500
+"""
+
+import argparse
+
+from benchmarks.setup_django import setup, use_shared_cache, seed_detail_cache, timed, summarize
+
+ENDPOINTS = [
+    ('check_auth', '/api/auth/me/'),
+    ('user_profile_view', '/api/profile/'),
+    ('favorite_pokemon_list', '/api/pokemon/favorites/'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--favorites', type=int, default=20)
+    args = parser.parse_args()
+
+    use_shared_cache()
+    setup()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from myapp.favorites import update_favorites
+    from myapp.user_envelope import invalidate_user_envelope
+
+    names = seed_detail_cache(args.favorites)
+    user = User.objects.create_user('bench@example.com', 'bench@example.com', 'bench-password-1')
+    update_favorites(user, add=names)
+    client = Client()
+    client.force_login(user)
+
+    print(f"{'endpoint':<24}{'envelope':<10}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}")
+    for label, url in ENDPOINTS:
+        client.get(url)  # warm the favorites page cache
+        for mode in ('cold', 'cached'):
+            def request():
+                if mode == 'cold':
+                    invalidate_user_envelope(user.pk)
+                client.get(url)
+
+            stats = summarize(timed(request, args.iterations))
+            if mode == 'cold':
+                invalidate_user_envelope(user.pk)
+            with CaptureQueriesContext(connection) as queries:
+                client.get(url)
+            print(f"{label:<24}{mode:<10}{stats['mean']:>9.3f}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{len(queries):>9}")
+
+
+if __name__ == '__main__':
+    main()
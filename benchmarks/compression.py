@@ -0,0 +1,70 @@
+"""
+Size and CPU cost of compressing the large catalog payloads.
+
+For representative abilities_list, pokemon_list and batch bodies, reports
+the raw and compressed sizes per encoding, the CPU time to compress once,
+and the time to serve a hit from the response cache with a stored
+variant versus compressing on every request.
+
+    python -m benchmarks.compression --iterations 200
+"""
+
+import argparse
+import json
+
+from benchmarks.setup_django import setup, timed, summarize
+
+
+def sample_payloads():
+    sprite = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+
+    def pokemon(i):
+        return {
+            'id': i, 'name': f"pokemon-{i}", 'sprite': sprite.format(i),
+            'types': ['grass', 'poison'], 'abilities': ['overgrow', 'chlorophyll'],
+            'height': 7, 'weight': 69,
+        }
+
+    return {
+        'abilities_list': [{'name': f"ability-name-{i}"} for i in range(367)],
+        'pokemon_list': {
+            'count': 1302, 'next': '?page=2&limit=9', 'previous': None,
+            'results': [pokemon(i) for i in range(1, 10)],
+        },
+        'batch_100': {
+            'count': 100,
+            'results': [{'query': str(i), 'status': 'ok', **pokemon(i)} for i in range(1, 101)],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from myapp import response_cache
+
+    print(f"{'payload':<16}{'encoding':<10}{'bytes':>9}{'ratio':>8}{'compress ms':>13}"
+          f"{'cached hit ms':>15}{'per-request ms':>16}")
+    for label, payload in sample_payloads().items():
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        print(f"{label:<16}{'identity':<10}{len(body):>9}{1:>8.2f}")
+        for encoding in response_cache.supported_encodings():
+            compressed = response_cache.compress(body, encoding)
+            compress_ms = summarize(timed(lambda: response_cache.compress(body, encoding), args.iterations))['mean']
+
+            cache_key = f"bench_{label}"
+            response_cache.set_cached_body(cache_key, body, encoding)
+            hit_ms = summarize(timed(lambda: response_cache.get_cached_body(cache_key, encoding), args.iterations))['mean']
+            per_request_ms = summarize(timed(
+                lambda: response_cache.compress(response_cache.get_cached_body(cache_key)[0], encoding),
+                args.iterations
+            ))['mean']
+            print(f"{'':<16}{encoding:<10}{len(compressed):>9}{len(body) / len(compressed):>8.2f}"
+                  f"{compress_ms:>13.3f}{hit_ms:>15.3f}{per_request_ms:>16.3f}")
+
+
+if __name__ == '__main__':
+    main()
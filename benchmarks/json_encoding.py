@@ -0,0 +1,60 @@
+"""
+Encoding time per page: DRF's JSONRenderer vs pre-encoded fragments.
+
+Renders pokemon_list-, favorites- and batch-shaped responses both ways.
+The fragment path is measured warm (fragments already encoded for the
+dataset version), which is the steady state between syncs.
+
+    python -m benchmarks.json_encoding --iterations 2000
+"""
+
+import argparse
+
+from benchmarks.setup_django import setup, timed, summarize
+
+PAGE_SIZES = [('pokemon_list', 9), ('favorites', 50), ('batch', 300)]
+
+
+def entry(i):
+    return {
+        'name': f"pokemon-{i}",
+        'id': i,
+        'sprite': f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{i}.png",
+        'types': ['grass', 'poison'],
+        'abilities': ['overgrow', 'chlorophyll'],
+        'height': 7,
+        'weight': 69,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+    from myapp.renderers import PokemonJSONRenderer, pokemon_fragments
+
+    print(f"{'shape':<14}{'items':>6}{'JSONRenderer ms':>17}{'fragments ms':>14}{'speedup':>9}")
+    for label, size in PAGE_SIZES:
+        entries = [entry(i) for i in range(1, size + 1)]
+        envelope = {'count': 1302, 'next': '?page=2&limit=9', 'previous': None}
+
+        def plain():
+            JSONRenderer().render({**envelope, 'results': [dict(e) for e in entries]})
+
+        def fragments():
+            PokemonJSONRenderer().render({**envelope, 'results': pokemon_fragments(entries)})
+
+        fragments()  # warm the fragment table
+        assert JSONRenderer().render({**envelope, 'results': entries}) == \
+            PokemonJSONRenderer().render({**envelope, 'results': pokemon_fragments(entries)})
+
+        plain_ms = summarize(timed(plain, args.iterations))['mean']
+        fragments_ms = summarize(timed(fragments, args.iterations))['mean']
+        print(f"{label:<14}{size:>6}{plain_ms:>17.4f}{fragments_ms:>14.4f}{plain_ms / fragments_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""
+Local stand-in for PokeAPI, so benchmarks and load tests run offline.
+
+Serves the resources the backend reads (pokemon, pokemon-species,
+evolution-chain, type, ability, move) from fixtures, with PokeAPI-style
+paginated list endpoints. Fixtures are either recorded from the live API
+with `python -m benchmarks.record_fixtures` or, by default, a
+deterministic synthetic dataset with the real type chart.
+
+Latency (plus jitter) and an error rate can be injected per request. Run
+it standalone and point the backend at it:
+
+    python -m benchmarks.pokeapi_stub --port 8765 --latency 0.05 --error-rate 0.01
+    POKEAPI_BASE_URL=http://127.0.0.1:8765/api/v2 python manage.py runserver
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Recorded and synthetic fixtures use this in place of the API root
+BASE_PLACEHOLDER = '__POKEAPI__'
+API_PREFIX = '/api/v2'
+
+TYPE_CHART = {
+    # attacking type: (double damage to, half damage to, no damage to)
+    'normal': ((), ('rock', 'steel'), ('ghost',)),
+    'fire': (('grass', 'ice', 'bug', 'steel'), ('fire', 'water', 'rock', 'dragon'), ()),
+    'water': (('fire', 'ground', 'rock'), ('water', 'grass', 'dragon'), ()),
+    'electric': (('water', 'flying'), ('electric', 'grass', 'dragon'), ('ground',)),
+    'grass': (('water', 'ground', 'rock'), ('fire', 'grass', 'poison', 'flying', 'bug', 'dragon', 'steel'), ()),
+    'ice': (('grass', 'ground', 'flying', 'dragon'), ('fire', 'water', 'ice', 'steel'), ()),
+    'fighting': (('normal', 'ice', 'rock', 'dark', 'steel'), ('poison', 'flying', 'psychic', 'bug', 'fairy'), ('ghost',)),
+    'poison': (('grass', 'fairy'), ('poison', 'ground', 'rock', 'ghost'), ('steel',)),
+    'ground': (('fire', 'electric', 'poison', 'rock', 'steel'), ('grass', 'bug'), ('flying',)),
+    'flying': (('grass', 'fighting', 'bug'), ('electric', 'rock', 'steel'), ()),
+    'psychic': (('fighting', 'poison'), ('psychic', 'steel'), ('dark',)),
+    'bug': (('grass', 'psychic', 'dark'), ('fire', 'fighting', 'poison', 'flying', 'ghost', 'steel', 'fairy'), ()),
+    'rock': (('fire', 'ice', 'flying', 'bug'), ('fighting', 'ground', 'steel'), ()),
+    'ghost': (('psychic', 'ghost'), ('dark',), ('normal',)),
+    'dragon': (('dragon',), ('steel',), ('fairy',)),
+    'dark': (('psychic', 'ghost'), ('fighting', 'dark', 'fairy'), ()),
+    'steel': (('ice', 'rock', 'fairy'), ('fire', 'water', 'electric', 'steel'), ()),
+    'fairy': (('fighting', 'dragon', 'dark'), ('fire', 'poison', 'steel'), ()),
+}
+STAT_NAMES = ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')
+GENERATIONS = ('generation-i', 'generation-ii', 'generation-iii', 'generation-iv', 'generation-v')
+
+
+def _ref(resource, resource_id, name):
+    return {'name': name, 'url': f"{BASE_PLACEHOLDER}/{resource}/{resource_id}/"}
+
+
+def synthetic_fixtures(count=151, abilities=40, moves=120, seed=0):
+    """
+    A deterministic PokeAPI-shaped dataset: {resource: [payload, ...]}.
+    Pokémon come in evolution families of three and cover every type.
+    """
+    rng = random.Random(seed)
+    type_names = list(TYPE_CHART)
+    ability_names = [f"ability-{i}" for i in range(1, abilities + 1)]
+    move_names = [f"move-{i}" for i in range(1, moves + 1)]
+
+    pokemon, species, chains = [], [], []
+    for i in range(1, count + 1):
+        name = f"stubmon-{i}"
+        types = rng.sample(type_names, rng.choice((1, 2)))
+        pokemon.append({
+            'id': i,
+            'name': name,
+            'height': rng.randint(2, 40),
+            'weight': rng.randint(10, 2000),
+            'sprites': {'front_default': f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{i}.png"},
+            'species': _ref('pokemon-species', i, name),
+            'types': [{'slot': slot, 'type': _ref('type', type_names.index(t) + 1, t)} for slot, t in enumerate(types, 1)],
+            'abilities': [
+                {'slot': slot, 'is_hidden': slot == 3, 'ability': _ref('ability', ability_names.index(a) + 1, a)}
+                for slot, a in enumerate(rng.sample(ability_names, rng.randint(1, 3)), 1)
+            ],
+            'stats': [
+                {'base_stat': rng.randint(20, 160), 'effort': 0, 'stat': _ref('stat', s, stat)}
+                for s, stat in enumerate(STAT_NAMES, 1)
+            ],
+            'moves': [{'move': _ref('move', move_names.index(m) + 1, m)} for m in rng.sample(move_names, rng.randint(8, 30))],
+        })
+        family = (i - 1) // 3 * 3 + 1
+        generation = (i - 1) * len(GENERATIONS) // count
+        species.append({
+            'id': i,
+            'name': name,
+            'generation': _ref('generation', generation + 1, GENERATIONS[generation]),
+            'is_legendary': i % 50 == 0,
+            'is_mythical': i % 75 == 0,
+            'evolution_chain': {'url': f"{BASE_PLACEHOLDER}/evolution-chain/{family}/"},
+            'varieties': [{'is_default': True, 'pokemon': _ref('pokemon', i, name)}],
+        })
+
+    for family in range(1, count + 1, 3):
+        members = list(range(family, min(family + 3, count + 1)))
+        node = None
+        for member in reversed(members):
+            node = {
+                'species': _ref('pokemon-species', member, f"stubmon-{member}"),
+                'evolves_to': [node] if node else [],
+            }
+        chains.append({'id': family, 'chain': node})
+
+    def members_of(predicate):
+        return [{'pokemon': _ref('pokemon', p['id'], p['name']), 'slot': 1} for p in pokemon if predicate(p)]
+
+    types = []
+    for type_id, type_name in enumerate(type_names, 1):
+        relations = {key: [] for key in (
+            'double_damage_to', 'half_damage_to', 'no_damage_to',
+            'double_damage_from', 'half_damage_from', 'no_damage_from',
+        )}
+        for attacker, (double, half, zero) in TYPE_CHART.items():
+            for key, defenders in (('double_damage', double), ('half_damage', half), ('no_damage', zero)):
+                if attacker == type_name:
+                    relations[f"{key}_to"] += [_ref('type', type_names.index(d) + 1, d) for d in defenders]
+                if type_name in defenders:
+                    relations[f"{key}_from"].append(_ref('type', type_names.index(attacker) + 1, attacker))
+        types.append({
+            'id': type_id,
+            'name': type_name,
+            'damage_relations': relations,
+            'pokemon': members_of(lambda p: any(t['type']['name'] == type_name for t in p['types'])),
+        })
+
+    ability_payloads = [
+        {
+            'id': ability_id,
+            'name': ability_name,
+            'pokemon': members_of(lambda p: any(a['ability']['name'] == ability_name for a in p['abilities'])),
+        }
+        for ability_id, ability_name in enumerate(ability_names, 1)
+    ]
+    move_payloads = [
+        {
+            'id': move_id,
+            'name': move_name,
+            'type': _ref('type', move_id % 18 + 1, type_names[move_id % 18]),
+            'learned_by_pokemon': [
+                _ref('pokemon', p['id'], p['name'])
+                for p in pokemon if any(m['move']['name'] == move_name for m in p['moves'])
+            ],
+        }
+        for move_id, move_name in enumerate(move_names, 1)
+    ]
+
+    return {
+        'pokemon': pokemon,
+        'pokemon-species': species,
+        'evolution-chain': chains,
+        'type': types,
+        'ability': ability_payloads,
+        'move': move_payloads,
+    }
+
+
+def load_fixtures(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class StubPokeAPI:
+    """
+    The stub server. start() binds to a free port (unless one is given) and
+    returns the base URL to use as POKEAPI_BASE_URL; `calls` counts the
+    requests served per resource.
+    """
+
+    def __init__(self, fixtures=None, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, port=0):
+        self.fixtures = fixtures if fixtures is not None else synthetic_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.port = port
+        self.calls = Counter()
+        self.base_url = None
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server = None
+        self._rendered = {}
+
+        # Resources are addressable by id and by name
+        self._index = {
+            resource: {
+                **{str(item['id']): item for item in items},
+                **{item['name']: item for item in items if 'name' in item},
+            }
+            for resource, items in self.fixtures.items()
+        }
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = stub.handle(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # The backend fans out up to MAX_CONCURRENT_REQUESTS connections at once
+            request_queue_size = 128
+
+        self._server = Server(('127.0.0.1', self.port), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}{API_PREFIX}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def _render(self, payload):
+        return json.dumps(payload).replace(BASE_PLACEHOLDER, self.base_url).encode()
+
+    def _list(self, resource, query):
+        items = sorted(self.fixtures[resource], key=lambda item: item['id'])
+        offset = int(query.get('offset', ['0'])[0])
+        limit = int(query.get('limit', ['20'])[0])
+        base = f"{BASE_PLACEHOLDER}/{resource}"
+        page = {
+            'count': len(items),
+            'next': f"{base}?offset={offset + limit}&limit={limit}" if offset + limit < len(items) else None,
+            'previous': f"{base}?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None,
+            'results': [_ref(resource, item['id'], item['name']) for item in items[offset:offset + limit]],
+        }
+        return self._render(page)
+
+    def handle(self, raw_path):
+        """Return (status, body) for a request path."""
+        parts = urlsplit(raw_path)
+        path = parts.path[len(API_PREFIX):] if parts.path.startswith(API_PREFIX) else parts.path
+        segments = [segment for segment in path.split('/') if segment]
+        resource = segments[0] if segments else ''
+        self.calls[resource] += 1
+
+        delay = self.latency
+        with self._random_lock:
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 500, b'{"detail": "Injected error"}'
+
+        if resource not in self._index or len(segments) > 2:
+            return 404, b'{"detail": "Not found."}'
+        if len(segments) == 1:
+            return 200, self._list(resource, parse_qs(parts.query))
+
+        item = self._index[resource].get(segments[1].lower())
+        if item is None:
+            return 404, b'{"detail": "Not found."}'
+        key = (resource, item['id'])
+        body = self._rendered.get(key)
+        if body is None:
+            body = self._rendered[key] = self._render(item)
+        return 200, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', help="Recorded fixtures file; synthetic data when omitted")
+    parser.add_argument('--count', type=int, default=151, help="Synthetic Pokémon to generate")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(args.count)
+    stub = StubPokeAPI(fixtures, args.latency, args.jitter, args.error_rate, port=args.port)
+    print(f"PokeAPI stub serving {len(fixtures['pokemon'])} Pokémon at {stub.start()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Record PokeAPI fixtures for the offline stub (needs network access once).
+
+Downloads the first --count Pokémon with their species, evolution chains,
+types, abilities and moves, trims the payloads to the fields the backend
+reads, and writes them with the API root replaced by a placeholder:
+
+    python -m benchmarks.record_fixtures --count 151 --output benchmarks/fixtures.json
+    python -m benchmarks.pokeapi_stub --fixtures benchmarks/fixtures.json
+"""
+
+import argparse
+import concurrent.futures
+import json
+
+import requests
+
+from benchmarks.pokeapi_stub import BASE_PLACEHOLDER
+
+LIVE_BASE_URL = 'https://pokeapi.co/api/v2'
+
+KEEP_FIELDS = {
+    'pokemon': ('id', 'name', 'height', 'weight', 'sprites', 'species', 'types', 'abilities', 'stats', 'moves'),
+    'pokemon-species': ('id', 'name', 'generation', 'is_legendary', 'is_mythical', 'evolution_chain'),
+    'evolution-chain': ('id', 'chain'),
+    'type': ('id', 'name', 'damage_relations', 'pokemon'),
+    'ability': ('id', 'name', 'pokemon'),
+    'move': ('id', 'name', 'type'),
+}
+
+
+def _get(url):
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def _trim(resource, payload):
+    trimmed = {key: payload[key] for key in KEEP_FIELDS[resource] if key in payload}
+    if resource == 'pokemon':
+        trimmed['sprites'] = {'front_default': payload['sprites'].get('front_default')}
+        trimmed['moves'] = [{'move': move['move']} for move in payload.get('moves', [])]
+    return trimmed
+
+
+def _fetch_all(resource, urls, workers):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return [_trim(resource, payload) for payload in executor.map(_get, sorted(urls))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=151)
+    parser.add_argument('--output', default='benchmarks/fixtures.json')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    listing = _get(f"{LIVE_BASE_URL}/pokemon?offset=0&limit={args.count}")
+    pokemon = _fetch_all('pokemon', [entry['url'] for entry in listing['results']], args.workers)
+    species = _fetch_all('pokemon-species', {p['species']['url'] for p in pokemon}, args.workers)
+    chains = _fetch_all('evolution-chain', {s['evolution_chain']['url'] for s in species if s.get('evolution_chain')}, args.workers)
+    types = _fetch_all('type', {entry['url'] for entry in _get(f"{LIVE_BASE_URL}/type?limit=100")['results']}, args.workers)
+    abilities = _fetch_all('ability', {a['ability']['url'] for p in pokemon for a in p['abilities']}, args.workers)
+    moves = _fetch_all('move', {m['move']['url'] for p in pokemon for m in p['moves']}, args.workers)
+
+    fixtures = {
+        'pokemon': pokemon,
+        'pokemon-species': species,
+        'evolution-chain': chains,
+        'type': types,
+        'ability': abilities,
+        'move': moves,
+    }
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(fixtures).replace(LIVE_BASE_URL, BASE_PLACEHOLDER))
+    print(f"Recorded {sum(len(items) for items in fixtures.values())} resources to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Request scenarios for the offline benchmark suite (see benchmarks.suite).
+
+Each scenario prepares its state once, then issues one request per
+iteration. Cold scenarios clear the shared cache and move to a new
+dataset version before every request (untimed), so the request pays for
+the catalog, upstream fetches and rendering; warm scenarios run against
+whatever the previous iterations cached.
+"""
+
+FAVORITES_COUNT = 60
+LIST_PAGES = 5
+FILTER_TYPES = ('fire', 'water', 'grass', 'psychic', 'dragon')
+EVOLUTION_FAMILIES = 5
+
+
+def reset_caches():
+    from django.core.cache import cache
+    from myapp.dataset import bump_dataset_version, state_cache
+
+    cache.clear()
+    state_cache().clear()
+    bump_dataset_version()
+
+
+class Scenario:
+    def __init__(self, name, description, request, setup=None, cold=False):
+        self.name = name
+        self.description = description
+        self.cold = cold
+        self._request = request
+        self._setup = setup
+
+    def setup(self, client):
+        if self._setup:
+            self._setup(client)
+
+    def request(self, client, iteration):
+        return self._request(client, iteration)
+
+
+def _list_page(client, i):
+    return client.get(f"/api/pokemon/?page={i % LIST_PAGES + 1}")
+
+
+def _list_filtered(client, i):
+    return client.get(f"/api/pokemon/?type={FILTER_TYPES[i % len(FILTER_TYPES)]}&search=1")
+
+
+def _favorites_user(client):
+    from django.contrib.auth.models import User
+    from myapp.catalog import get_catalog
+    from myapp.favorites import update_favorites
+
+    user, created = User.objects.get_or_create(username='bench-favorites')
+    if created:
+        user.set_password('bench-password')
+        user.save()
+        update_favorites(user, add=get_catalog().names[:FAVORITES_COUNT])
+    client.force_login(user)
+
+
+def _favorites(client, i):
+    return client.get('/api/pokemon/favorites/')
+
+
+def _evolution(client, i):
+    return client.get(f"/api/pokemon/stubmon-{(i % EVOLUTION_FAMILIES) * 3 + 1}/evolution/?expand=details")
+
+
+def _types_abilities(client, i):
+    return client.get('/api/types/' if i % 2 == 0 else '/api/abilities/')
+
+
+SCENARIOS = [
+    Scenario('list_cold', "pokemon_list pages 1-5, empty caches", _list_page, cold=True),
+    Scenario('list_warm', "pokemon_list pages 1-5, warm caches", _list_page),
+    Scenario('list_filtered_cold', "pokemon_list type+search filters, empty caches", _list_filtered, cold=True),
+    Scenario('list_filtered_warm', "pokemon_list type+search filters, warm caches", _list_filtered),
+    Scenario('favorites_cold', f"favorites page with {FAVORITES_COUNT} Pokémon, empty caches",
+             _favorites, setup=_favorites_user, cold=True),
+    Scenario('favorites_warm', f"favorites page with {FAVORITES_COUNT} Pokémon, warm caches",
+             _favorites, setup=_favorites_user),
+    Scenario('evolution_cold', "evolution chains with ?expand=details, empty caches", _evolution, cold=True),
+    Scenario('evolution_warm', "evolution chains with ?expand=details, warm caches", _evolution),
+    Scenario('types_abilities_cold', "types and abilities lists, empty caches", _types_abilities, cold=True),
+    Scenario('types_abilities_warm', "types and abilities lists, warm caches", _types_abilities),
+]
@@ -0,0 +1,76 @@
+"""
+Load test for per-request DB queries on authenticated endpoints.
+
+Logs in a pool of users, then replays requests round-robin across them
+and counts the queries each request issues: once with cold caches (the
+first request of every session) and once with warm sessions. Sessions
+and session users are only cached when the cache is shared by all
+workers, so the run uses a file-based cache. Queries are counted with an
+execute wrapper rather than the debug query log, which keeps only the
+last 9000 queries.
+
+    python -m benchmarks.session_queries --users 50 --rounds 20
+"""
+
+import argparse
+import time
+
+from benchmarks.setup_django import setup, use_shared_cache, seed_detail_cache
+
+ENDPOINTS = [
+    ('check_auth', '/api/auth/me/'),
+    ('favorite_pokemon_list', '/api/pokemon/favorites/'),
+    ('user_profile_view', '/api/profile/'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    use_shared_cache()
+    setup()
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from myapp.favorites import update_favorites
+
+    queries = [0]
+
+    def count_queries(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    names = seed_detail_cache(10)
+    clients = []
+    for i in range(args.users):
+        email = f"load-{i}@example.com"
+        user = User.objects.create_user(email, email, 'load-password-1')
+        update_favorites(user, add=names[:i % len(names) + 1])
+        client = Client()
+        client.post('/api/auth/login/', {'username': email, 'password': 'load-password-1'}, content_type='application/json')
+        clients.append(client)
+
+    print(f"{'endpoint':<24}{'phase':<7}{'requests':>9}{'queries/req':>13}{'req/s':>10}")
+    for label, url in ENDPOINTS:
+        # Cold: drop every cached session/user/envelope/page, then one request per session
+        cache.clear()
+        seed_detail_cache(10)
+        phases = [('cold', 1), ('warm', args.rounds)]
+        for phase, rounds in phases:
+            requests, queries[0] = 0, 0
+            with connection.execute_wrapper(count_queries):
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    for client in clients:
+                        client.get(url)
+                        requests += 1
+                elapsed = time.perf_counter() - start
+            print(f"{label:<24}{phase:<7}{requests:>9}{queries[0] / requests:>13.2f}{requests / elapsed:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Bootstrap Django for a benchmark run: test settings and an in-memory database.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokedex_backend.settings')
+# A fresh dataset version and no catalog snapshot left over from other runs
+os.environ.setdefault('POKEDEX_STATE_DIR', tempfile.mkdtemp(prefix='pokedex-bench-state-'))
+
+
+def use_shared_cache():
+    """
+    Run with POKEDEX_CACHE_DIR set, as a multi-worker deployment does: the
+    caches that are only enabled with a shared cache (sessions, session
+    users, user envelopes) are then active. Call before setup().
+    """
+    os.environ.setdefault('POKEDEX_CACHE_DIR', tempfile.mkdtemp(prefix='pokedex-bench-cache-'))
+
+
+def setup():
+    import django
+    from django.test.utils import setup_test_environment
+    from django.db import connection
+
+    django.setup()
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def seed_detail_cache(count=60):
+    """
+    Put synthetic Pokémon in the catalog snapshot and their details in the
+    cache, under the catalog URLs every endpoint reads, so endpoints never
+    go upstream.
+    """
+    from django.core.cache import cache
+    from myapp.api_integrations.pokemon.pokemon_api import POKEMON_URL, DETAIL_CACHE_TIMEOUT
+    from myapp.catalog.refresh import CATALOG_SNAPSHOT_CACHE_KEY
+    from myapp.dataset import state_cache
+
+    names = [f"bench-mon-{i}" for i in range(1, count + 1)]
+    results = [{'name': name, 'url': f"{POKEMON_URL}/{i}/"} for i, name in enumerate(names, 1)]
+    state_cache().set(CATALOG_SNAPSHOT_CACHE_KEY, {'count': count, 'results': results}, None)
+    cache.set_many({
+        f"pokemon_detail_{entry['url']}": {
+            'id': i,
+            'name': entry['name'],
+            'sprite': f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{i}.png",
+            'types': ['grass', 'poison'],
+            'abilities': ['overgrow', 'chlorophyll'],
+            'height': 7,
+            'weight': 69,
+        }
+        for i, entry in enumerate(results, 1)
+    }, DETAIL_CACHE_TIMEOUT)
+    return names
+
+
+def timed(func, iterations):
+    """Run func `iterations` times and return per-call latencies in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
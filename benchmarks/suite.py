@@ -0,0 +1,172 @@
+"""
+Offline benchmark suite: the API against a local PokeAPI stub.
+
+Runs every scenario from benchmarks.scenarios in-process, with PokeAPI
+replaced by benchmarks.pokeapi_stub, and reports throughput, latency
+percentiles and upstream calls per request. Results are compared against
+a stored baseline; the run exits non-zero when a scenario regressed by
+more than --max-regression.
+
+    python -m benchmarks.suite --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.suite                          # compare against it
+    python -m benchmarks.suite --latency 0.05 --concurrency 4 --scenarios list_warm,favorites_warm
+
+Warm scenarios run with --concurrency client threads; cold scenarios
+always run sequentially, since each request starts from empty caches.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.pokeapi_stub import StubPokeAPI, load_fixtures, synthetic_fixtures
+from benchmarks.setup_django import setup, summarize
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def run_scenario(scenario, stub, iterations, warmup, concurrency):
+    from django.test import Client
+    from benchmarks.scenarios import reset_caches
+
+    threads = 1 if scenario.cold else concurrency
+    clients = [Client() for _ in range(threads)]
+    for client in clients:
+        scenario.setup(client)
+    for i in range(warmup):
+        if scenario.cold:
+            reset_caches()
+        scenario.request(clients[0], i)
+
+    samples, errors, upstream_calls = [], [0], [0]
+    lock = threading.Lock()
+
+    def worker(client, indexes):
+        for i in indexes:
+            if scenario.cold:
+                reset_caches()
+                calls_before = stub.total_calls()
+            start = time.perf_counter()
+            response = scenario.request(client, i)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                samples.append(elapsed)
+                if response.status_code >= 400:
+                    errors[0] += 1
+                if scenario.cold:
+                    upstream_calls[0] += stub.total_calls() - calls_before
+
+    calls_before = stub.total_calls()
+    started = time.perf_counter()
+    if threads == 1:
+        worker(clients[0], range(iterations))
+    else:
+        workers = [
+            threading.Thread(target=worker, args=(client, range(t, iterations, threads)))
+            for t, client in enumerate(clients)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    wall = time.perf_counter() - started
+    if not scenario.cold:
+        upstream_calls[0] = stub.total_calls() - calls_before
+
+    stats = summarize(samples)
+    return {
+        'requests': iterations,
+        'errors': errors[0],
+        'throughput': iterations / wall,
+        'p50': stats['p50'],
+        'p95': stats['p95'],
+        'p99': stats['p99'],
+        'upstream_per_request': upstream_calls[0] / iterations,
+    }
+
+
+def regressions(result, baseline, max_regression):
+    """Human-readable reasons a scenario result is worse than its baseline."""
+    reasons = []
+    if result['p95'] > baseline['p95'] * (1 + max_regression):
+        reasons.append(f"p95 {baseline['p95']:.2f} -> {result['p95']:.2f} ms")
+    if result['throughput'] < baseline['throughput'] * (1 - max_regression):
+        reasons.append(f"throughput {baseline['throughput']:.1f} -> {result['throughput']:.1f} req/s")
+    if result['upstream_per_request'] > baseline['upstream_per_request'] + 0.01:
+        reasons.append(
+            f"upstream calls/request {baseline['upstream_per_request']:.2f} -> {result['upstream_per_request']:.2f}"
+        )
+    return reasons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--scenarios', help="Comma-separated scenario names (default: all)")
+    parser.add_argument('--fixtures', help="Recorded fixtures file; synthetic data when omitted")
+    parser.add_argument('--latency', type=float, default=0.01, help="Stub latency per upstream request, seconds")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed relative p95/throughput regression before failing")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+    stub = StubPokeAPI(fixtures, args.latency, args.jitter, args.error_rate)
+    # Must be set before Django loads the settings
+    os.environ['POKEAPI_BASE_URL'] = stub.start()
+    setup()
+    from benchmarks.scenarios import SCENARIOS
+
+    selected = SCENARIOS
+    if args.scenarios:
+        names = set(args.scenarios.split(','))
+        selected = [scenario for scenario in SCENARIOS if scenario.name in names]
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print(f"{'scenario':<22}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'upstream/req':>14}{'errors':>8}  vs baseline")
+    results, failed = {}, False
+    for scenario in selected:
+        result = results[scenario.name] = run_scenario(
+            scenario, stub, args.iterations, args.warmup, args.concurrency
+        )
+        comparison = ''
+        if scenario.name in baseline:
+            reasons = regressions(result, baseline[scenario.name], args.max_regression)
+            failed = failed or bool(reasons)
+            comparison = 'REGRESSION: ' + '; '.join(reasons) if reasons else \
+                f"p95 {(result['p95'] / baseline[scenario.name]['p95'] - 1) * 100:+.0f}%"
+        print(
+            f"{scenario.name:<22}{result['throughput']:>9.1f}{result['p50']:>9.2f}{result['p95']:>9.2f}"
+            f"{result['p99']:>9.2f}{result['upstream_per_request']:>14.2f}{result['errors']:>8}  {comparison}"
+        )
+    stub.stop()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'settings': {
+                    'iterations': args.iterations,
+                    'concurrency': args.concurrency,
+                    'latency': args.latency,
+                    'fixtures': args.fixtures or 'synthetic',
+                },
+                'results': results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
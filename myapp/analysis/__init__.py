@@ -0,0 +1,13 @@
+from .typechart import (
+    TYPE_NAMES,
+    TEAM_MAX_SIZE,
+    get_effectiveness_matrix,
+    analyze_team
+)
+from .similarity import (
+    SIMILARITY_METRICS,
+    SIMILAR_DEFAULT_LIMIT,
+    SIMILAR_MAX_LIMIT,
+    get_similarity_index
+)
+from .aggregates import AGGREGATE_GROUPS, aggregate
@@ -0,0 +1,141 @@
+"""
+Per-type and per-ability aggregates over the catalog's numeric columns.
+
+Group membership is kept as two parallel arrays of (catalog position,
+group) pairs, one pair per type or ability a Pokémon has, built once
+per catalog. Aggregating a filtered set keeps the pairs whose position
+matches, sorts them by (group, value) per column, and reads counts,
+means, extremes and quantiles off the sorted segments with bincount and
+index arithmetic: no per-group Python loop and no detail fetches.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..catalog import bitmap
+from ..catalog.columns import NUMERIC_COLUMNS
+from .typechart import TYPE_NAMES
+import logging
+
+AGGREGATE_GROUPS = ('type', 'ability')
+SUMMARY_FIELDS = ('mean', 'min', 'p25', 'median', 'p75', 'max')
+_QUANTILES = (('p25', 0.25), ('median', 0.5), ('p75', 0.75))
+
+logger = logging.getLogger(__name__)
+
+_groupings = None
+_groupings_lock = threading.Lock()
+
+
+class Grouping:
+    """(position, group) membership pairs for one way of grouping the catalog."""
+
+    def __init__(self, names: List[str], positions: List[int], groups: List[int]):
+        self.names = names
+        self.positions = np.array(positions, dtype=np.intp)
+        self.groups = np.array(groups, dtype=np.intp)
+
+
+def build_groupings(catalog) -> Dict[str, Grouping]:
+    abilities = sorted({ability for trait in catalog.traits if trait for ability in trait[1]})
+    vocabularies = {'type': list(TYPE_NAMES), 'ability': abilities}
+
+    groupings = {}
+    for by, names in vocabularies.items():
+        group_index = {name: i for i, name in enumerate(names)}
+        positions, groups = [], []
+        for position, trait in enumerate(catalog.traits):
+            if trait:
+                for name in trait[AGGREGATE_GROUPS.index(by)]:
+                    if name in group_index:
+                        positions.append(position)
+                        groups.append(group_index[name])
+        groupings[by] = Grouping(names, positions, groups)
+    return groupings
+
+
+def get_groupings(catalog) -> Dict[str, Grouping]:
+    """The groupings for a catalog, built on first use."""
+    global _groupings
+    cached = _groupings
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+
+    with _groupings_lock:
+        if _groupings is not None and _groupings[0] is catalog:
+            return _groupings[1]
+        groupings = build_groupings(catalog)
+        _groupings = (catalog, groupings)
+        logger.info(f"Built type and ability groupings v{catalog.version}")
+        return groupings
+
+
+def summarize_groups(values: np.ndarray, groups: np.ndarray, size: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Per-group summaries of every column of values, one row per member.
+    Returns the (size, columns) counts of non-missing values and a
+    (size, columns) array per SUMMARY_FIELDS entry, NaN where a group
+    has no values for a column.
+    """
+    counts = np.zeros((size, values.shape[1]), dtype=np.intp)
+    summary = {field: np.full((size, values.shape[1]), np.nan) for field in SUMMARY_FIELDS}
+    for c in range(values.shape[1]):
+        present = ~np.isnan(values[:, c])
+        column, column_groups = values[present, c], groups[present]
+        if not len(column):
+            continue
+        order = np.lexsort((column, column_groups))
+        column, column_groups = column[order], column_groups[order]
+
+        n = np.bincount(column_groups, minlength=size)
+        has = n > 0
+        starts = np.cumsum(n) - n
+        counts[:, c] = n
+        summary['mean'][has, c] = np.bincount(column_groups, weights=column, minlength=size)[has] / n[has]
+        summary['min'][has, c] = column[starts[has]]
+        summary['max'][has, c] = column[starts[has] + n[has] - 1]
+        for field, q in _QUANTILES:
+            # Linear interpolation between the two closest ranks, as np.quantile does
+            rank = starts[has] + (n[has] - 1) * q
+            low = np.floor(rank).astype(np.intp)
+            high = np.ceil(rank).astype(np.intp)
+            summary[field][has, c] = column[low] + (column[high] - column[low]) * (rank - low)
+    return counts, summary
+
+
+def _column_summaries(counts: np.ndarray, summary: Dict[str, np.ndarray], row: int) -> Dict[str, Optional[Dict]]:
+    return {
+        column: {
+            'count': int(counts[row, c]),
+            **{field: round(float(summary[field][row, c]), 2) for field in SUMMARY_FIELDS},
+        } if counts[row, c] else None
+        for c, column in enumerate(NUMERIC_COLUMNS)
+    }
+
+
+def aggregate(catalog, matches: int, by: str) -> Dict:
+    """
+    Aggregates of the numeric columns over the matching positions, overall
+    and per group (type or ability). Groups without matches are left out.
+    """
+    mask = bitmap.to_mask(matches, len(catalog))
+    values = catalog.columns.values
+
+    overall_counts, overall = summarize_groups(values[mask], np.zeros(int(mask.sum()), dtype=np.intp), 1)
+
+    grouping = get_groupings(catalog)[by]
+    keep = mask[grouping.positions]
+    positions, groups = grouping.positions[keep], grouping.groups[keep]
+    members = np.bincount(groups, minlength=len(grouping.names))
+    counts, summary = summarize_groups(values[positions], groups, len(grouping.names))
+
+    return {
+        'count': int(mask.sum()),
+        'covered': int((~np.isnan(values[mask]).all(axis=1)).sum()),
+        'overall': _column_summaries(overall_counts, overall, 0),
+        'group_by': by,
+        'groups': [
+            {by: name, 'count': int(members[i]), 'columns': _column_summaries(counts, summary, i)}
+            for i, name in enumerate(grouping.names) if members[i]
+        ],
+    }
@@ -0,0 +1,108 @@
+"""
+"Similar Pokémon" by nearest neighbours in a feature space.
+
+Every catalog position gets a feature row: its six base stats z-scored
+across the catalog, followed by one-hot columns for its types and its
+abilities. The matrix is built once per catalog, i.e. per dataset
+version and per process, together with an L2-normalized copy for cosine
+similarity and the squared row norms for Euclidean distance, so a query
+is one matrix-vector product over the whole catalog plus an
+argpartition for the top k.
+
+Positions without stats have no meaningful features; they are never
+returned as neighbours and can't be queried.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+from ..catalog import get_catalog
+from ..catalog.columns import STAT_COLUMNS
+from .typechart import TYPE_NAMES, TYPE_INDEX
+import logging
+
+SIMILARITY_METRICS = ('cosine', 'euclidean')
+SIMILAR_DEFAULT_LIMIT = 6
+SIMILAR_MAX_LIMIT = 20
+
+# Relative weight of each feature group; a one-hot column is 0 or the weight
+TYPE_WEIGHT = 1.0
+ABILITY_WEIGHT = 0.5
+
+logger = logging.getLogger(__name__)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+class SimilarityIndex:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        stats = catalog.columns.values[:, :len(STAT_COLUMNS)]
+        self.valid = ~np.isnan(stats).any(axis=1)
+
+        mean = stats[self.valid].mean(axis=0) if self.valid.any() else np.zeros(len(STAT_COLUMNS))
+        std = stats[self.valid].std(axis=0) if self.valid.any() else np.ones(len(STAT_COLUMNS))
+        scaled = np.where(self.valid[:, None], (stats - mean) / np.where(std > 0, std, 1.0), 0.0)
+
+        traits = catalog.traits
+        abilities = sorted({ability for trait in traits if trait for ability in trait[1]})
+        ability_index = {name: i for i, name in enumerate(abilities)}
+        types = np.zeros((len(traits), len(TYPE_NAMES)))
+        owned = np.zeros((len(traits), len(abilities)))
+        for position, trait in enumerate(traits):
+            if trait:
+                types[position, [TYPE_INDEX[t] for t in trait[0] if t in TYPE_INDEX]] = TYPE_WEIGHT
+                owned[position, [ability_index[a] for a in trait[1]]] = ABILITY_WEIGHT
+
+        self.features = np.hstack([scaled, types, owned])
+        self.features[~self.valid] = 0.0
+        self.squared_norms = (self.features ** 2).sum(axis=1)
+        norms = np.sqrt(self.squared_norms)
+        self.normalized = self.features / np.where(norms > 0, norms, 1.0)[:, None]
+        for array in (self.features, self.squared_norms, self.normalized, self.valid):
+            array.setflags(write=False)
+
+    def nearest(self, position: int, limit: int, metric: str = 'cosine') -> List[Tuple[int, float]]:
+        """
+        The limit positions closest to position, best first, as
+        (position, score) pairs: cosine similarity, or Euclidean distance.
+        """
+        if metric == 'cosine':
+            # Higher is closer; negate so both metrics rank ascending
+            scores = self.normalized @ self.normalized[position]
+            ranking = -scores
+        else:
+            # |a - b|^2 = |a|^2 - 2ab + |b|^2, clipped against rounding below zero
+            scores = np.sqrt(np.maximum(
+                self.squared_norms - 2 * (self.features @ self.features[position]) + self.squared_norms[position], 0.0
+            ))
+            ranking = scores.copy()
+        ranking[~self.valid] = np.inf
+        ranking[position] = np.inf
+
+        limit = min(limit, int(self.valid.sum()) - 1)
+        if limit <= 0:
+            return []
+        top = np.argpartition(ranking, limit - 1)[:limit]
+        top = top[np.argsort(ranking[top], kind='stable')]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+def get_similarity_index() -> Optional[SimilarityIndex]:
+    """The index for the current catalog, or None if the catalog is unavailable."""
+    global _index
+    catalog = get_catalog()
+    if catalog is None:
+        return None
+    cached = _index
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+
+    with _index_lock:
+        if _index is not None and _index[0] is catalog:
+            return _index[1]
+        index = SimilarityIndex(catalog)
+        _index = (catalog, index)
+        logger.info(f"Built similarity index v{catalog.version} over {int(index.valid.sum())} Pokémon")
+        return index
@@ -0,0 +1,131 @@
+"""
+Type effectiveness matrix and team coverage analysis.
+
+The 18x18 matrix holds the damage multiplier of every attacking type
+(rows) against every defending type (columns), built from the
+`damage_relations` of PokeAPI's /type/{name} responses. It is built
+once per dataset version and per process and kept read-only.
+
+A dual-type defender takes the product of both columns. The matrix gets
+an extra all-ones column for "no second type", so mono- and dual-typed
+Pokémon go through the same indexing: multipliers for any list of type
+pairs are one fancy-indexing product, with no per-pair Python loop.
+"""
+
+import threading
+import concurrent.futures
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from ..api_integrations.pokemon.pokemon_api import fetch_type_damage_relations, MAX_CONCURRENT_REQUESTS
+from ..dataset import get_dataset_version
+import logging
+
+TYPE_NAMES = (
+    'normal', 'fighting', 'flying', 'poison', 'ground', 'rock', 'bug', 'ghost', 'steel',
+    'fire', 'water', 'grass', 'electric', 'psychic', 'ice', 'dragon', 'dark', 'fairy',
+)
+TYPE_INDEX = {name: i for i, name in enumerate(TYPE_NAMES)}
+NO_TYPE = len(TYPE_NAMES)  # column index of the all-ones "no second type" column
+TEAM_MAX_SIZE = 6
+
+logger = logging.getLogger(__name__)
+
+# Every defending type combination: the 18 mono types, then the 153 dual types
+_mono = np.arange(len(TYPE_NAMES))
+_first, _second = np.triu_indices(len(TYPE_NAMES), k=1)
+COMBO_PRIMARY = np.concatenate([_mono, _first])
+COMBO_SECONDARY = np.concatenate([np.full(len(TYPE_NAMES), NO_TYPE), _second])
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def build_effectiveness_matrix() -> Optional[np.ndarray]:
+    """
+    The (18, 19) multiplier matrix, including the "no second type" column,
+    or None if any type's relations could not be fetched.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        relations = list(executor.map(fetch_type_damage_relations, TYPE_NAMES))
+    if any(r is None for r in relations):
+        return None
+
+    matrix = np.ones((len(TYPE_NAMES), len(TYPE_NAMES) + 1))
+    for attacker, relation in enumerate(relations):
+        for key, multiplier in (('double_damage_to', 2.0), ('half_damage_to', 0.5), ('no_damage_to', 0.0)):
+            defenders = [TYPE_INDEX[name] for name in relation[key] if name in TYPE_INDEX]
+            matrix[attacker, defenders] = multiplier
+    matrix.setflags(write=False)
+    return matrix
+
+
+def get_effectiveness_matrix() -> Optional[np.ndarray]:
+    """The matrix for the current dataset version, or None if upstream is unavailable."""
+    global _matrix
+    version = get_dataset_version()
+    cached = _matrix
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _matrix_lock:
+        if _matrix is not None and _matrix[0] == version:
+            return _matrix[1]
+        matrix = build_effectiveness_matrix()
+        if matrix is None:
+            return None
+        _matrix = (version, matrix)
+        logger.info(f"Built type effectiveness matrix v{version}")
+        return matrix
+
+
+def type_indexes(types: Sequence[str]):
+    """(primary, secondary) column indexes for a Pokémon's types."""
+    indexes = [TYPE_INDEX[t] for t in types if t in TYPE_INDEX][:2]
+    return indexes[0], indexes[1] if len(indexes) > 1 else NO_TYPE
+
+
+def _combo_name(primary: int, secondary: int) -> List[str]:
+    return [TYPE_NAMES[primary]] + ([TYPE_NAMES[secondary]] if secondary != NO_TYPE else [])
+
+
+def analyze_team(matrix: np.ndarray, team_types: List[Sequence[str]]) -> Dict:
+    """
+    Defensive and offensive profile of a team, given each member's types.
+
+    Defense: for every attacking type, how many members are weak to it,
+    resist it or are immune, and the types the team is weak to overall.
+    Offense: the best multiplier the team's own types (STAB) reach against
+    each of the 171 defending type combinations.
+    """
+    primary, secondary = np.array([type_indexes(types) for types in team_types]).T
+
+    # (attacking types, members): multiplier each member takes from each type
+    taken = matrix[:, primary] * matrix[:, secondary]
+    weak = (taken > 1).sum(axis=1)
+    resist = ((taken < 1) & (taken > 0)).sum(axis=1)
+    immune = (taken == 0).sum(axis=1)
+
+    # (team attacking types, combos), then the best attacker per combo
+    attackers = np.unique(np.concatenate([primary, secondary[secondary != NO_TYPE]]))
+    dealt = (matrix[attackers][:, COMBO_PRIMARY] * matrix[attackers][:, COMBO_SECONDARY]).max(axis=0)
+
+    return {
+        'defense': {
+            'by_type': [
+                {'type': name, 'weak': int(weak[i]), 'resist': int(resist[i]), 'immune': int(immune[i])}
+                for i, name in enumerate(TYPE_NAMES)
+            ],
+            'weaknesses': [TYPE_NAMES[i] for i in np.flatnonzero(weak > resist + immune)],
+            'resistances': [TYPE_NAMES[i] for i in np.flatnonzero(resist + immune > weak)],
+        },
+        'offense': {
+            'attacking_types': [TYPE_NAMES[i] for i in attackers],
+            'combinations': len(dealt),
+            'super_effective': int((dealt > 1).sum()),
+            'neutral': int((dealt == 1).sum()),
+            'resisted': int(((dealt < 1) & (dealt > 0)).sum()),
+            'immune': int((dealt == 0).sum()),
+            'coverage': round(float((dealt >= 1).mean()), 4),
+            'walls': [_combo_name(COMBO_PRIMARY[i], COMBO_SECONDARY[i]) for i in np.flatnonzero(dealt < 1)],
+        },
+    }
@@ -1,14 +1,20 @@
+import re
+import time
+import threading
 import requests
 import concurrent.futures
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+from django.conf import settings
 from django.core.cache import cache
 from .pokemon_serializer import PokemonAPISerializer, EvolutionChainSerializer, TypeSerializer, AbilitySerializer
+from ... import metrics, timing
 import logging
 
-BASE_URL = "https://pokeapi.co/api/v2"
+BASE_URL = getattr(settings, 'POKEAPI_BASE_URL', "https://pokeapi.co/api/v2").rstrip('/')
 POKEMON_URL = f"{BASE_URL}/pokemon"
 TYPE_URL = f"{BASE_URL}/type"
 ABILITY_URL = f"{BASE_URL}/ability"
+MOVE_URL = f"{BASE_URL}/move"
 REQUEST_TIMEOUT = 5
 MAX_CONCURRENT_REQUESTS = 9
 
@@ -16,17 +22,80 @@ MAX_CONCURRENT_REQUESTS = 9
 CACHE_TIMEOUT = 3600  # 1 hour for base list
 DETAIL_CACHE_TIMEOUT = 86400  # 24 hours for individual Pokémon details
 
+# Upstream budget for batch detail requests
+BATCH_MAX_ITEMS = 300
+BATCH_FETCH_TIMEOUT = 15  # seconds for the whole fan-out of cache misses
+
+# Upstream budget for hydrating an evolution chain with details
+EVOLUTION_EXPAND_MAX_NODES = 20
+EVOLUTION_EXPAND_TIMEOUT = 8  # seconds for the whole fan-out
+
+ALL_TYPES_CACHE_KEY = "pokemon_all_types"
+ALL_ABILITIES_CACHE_KEY = "pokemon_all_abilities"
+
+DAMAGE_RELATION_KEYS = ('double_damage_to', 'half_damage_to', 'no_damage_to')
+
 logger = logging.getLogger(__name__)
 
+# Number of foreground detail fan-outs currently waiting on PokeAPI, and
+# the detail requests they still have queued or running
+_foreground_fanouts = 0
+_fanout_pending = 0
+_foreground_lock = threading.Lock()
+
+
+def foreground_fanouts_active() -> int:
+    return _foreground_fanouts
+
+
+metrics.register_gauge('pokedex_foreground_fanouts', foreground_fanouts_active)
+metrics.register_gauge('pokedex_detail_fanout_pending', lambda: _fanout_pending)
+
+
+class PokemonNotFound(Exception):
+    """Raised when PokeAPI answers 404 for a Pokémon, species or chain: the resource doesn't exist."""
+
+
+def _empty_pokemon_detail() -> Dict:
+    return {
+        'sprite': None,
+        'types': [],
+        'abilities': [],
+        'height': None,
+        'weight': None,
+        'stats': {},
+    }
+
+
+def _upstream_endpoint(url: str) -> str:
+    """The PokeAPI resource a URL addresses (pokemon, pokemon-species, type, ...)."""
+    path = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+    return path.strip('/').split('/')[0].split('?')[0] or 'root'
 
-def _make_http_request(url: str) -> Optional[Dict]:
+
+@timing.span('upstream')
+def _make_http_request(url: str, raise_not_found: bool = False) -> Optional[Dict]:
+    """
+    GET a PokeAPI resource as JSON; None when the request failed.
+    With raise_not_found=True a 404 raises PokemonNotFound instead, so
+    callers can tell a missing resource from an upstream failure.
+    """
+    start = time.perf_counter()
     try:
         response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        return response.json() if response.status_code == 200 else None
+        outcome = str(response.status_code)
+        data = response.json() if response.status_code == 200 else None
     except:
+        outcome = 'error'
         return None
+    finally:
+        metrics.record_upstream(_upstream_endpoint(url), outcome, time.perf_counter() - start)
+    if raise_not_found and response.status_code == 404:
+        raise PokemonNotFound(url)
+    return data
 
 
+@timing.span('base_list')
 def fetch_pokemon_list(offset: int = 0, limit: int = 9, search: str = None) -> Optional[Dict]:
     """
     Fetch Pokémon list from PokeAPI with pagination and caching.
@@ -35,6 +104,7 @@ def fetch_pokemon_list(offset: int = 0, limit: int = 9, search: str = None) -> O
     # Generate cache key based on parameters
     cache_key = f"pokemon_list_{offset}_{limit}_{search}"
     cached_data = cache.get(cache_key)
+    metrics.record_cache('pokemon_list', bool(cached_data))
     
     if cached_data:
         return cached_data
@@ -49,10 +119,12 @@ def fetch_pokemon_list(offset: int = 0, limit: int = 9, search: str = None) -> O
     return data
 
 
-def fetch_pokemon_by_type(type_name: str) -> Optional[List[str]]:
-    """Fetch all Pokémon of a specific type with caching."""
+def fetch_pokemon_by_type(type_name: str, refresh: bool = False) -> Optional[List[str]]:
+    """Fetch all Pokémon of a specific type with caching. refresh=True bypasses the cached copy."""
     cache_key = f"pokemon_type_{type_name.lower()}"
-    cached_data = cache.get(cache_key)
+    cached_data = cache.get(cache_key) if not refresh else None
+    if not refresh:
+        metrics.record_cache('pokemon_type', bool(cached_data))
     
     if cached_data:
         return cached_data
@@ -64,13 +136,66 @@ def fetch_pokemon_by_type(type_name: str) -> Optional[List[str]]:
     
     pokemon_list = [p['pokemon']['name'] for p in data.get('pokemon', [])]
     cache.set(cache_key, pokemon_list, CACHE_TIMEOUT)
+    _cache_type_relations(type_name, data)
     return pokemon_list
 
 
-def fetch_pokemon_by_ability(ability_name: str) -> Optional[List[str]]:
-    """Fetch all Pokémon with a specific ability with caching."""
+def fetch_pokemon_by_move(move_name: str, refresh: bool = False) -> Optional[List[str]]:
+    """Fetch all Pokémon that learn a move with caching. refresh=True bypasses the cached copy."""
+    cache_key = f"pokemon_move_{move_name.lower()}"
+    cached_data = cache.get(cache_key) if not refresh else None
+    if not refresh:
+        metrics.record_cache('pokemon_move', bool(cached_data))
+
+    if cached_data:
+        return cached_data
+
+    data = _make_http_request(f"{MOVE_URL}/{move_name.lower()}")
+    if not data:
+        return None
+
+    pokemon_list = [p['name'] for p in data.get('learned_by_pokemon', [])]
+    cache.set(cache_key, pokemon_list, CACHE_TIMEOUT)
+    return pokemon_list
+
+
+def _cache_type_relations(type_name: str, data: Dict) -> Dict[str, List[str]]:
+    relations = {
+        key: [t['name'] for t in data.get('damage_relations', {}).get(key, [])]
+        for key in DAMAGE_RELATION_KEYS
+    }
+    cache.set(f"type_relations_{type_name.lower()}", relations, DETAIL_CACHE_TIMEOUT)
+    return relations
+
+
+def fetch_type_damage_relations(type_name: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Attacking damage relations of a type as {'double_damage_to', 'half_damage_to',
+    'no_damage_to'} lists of type names. Filled by the same /type/{name}
+    response that fetch_pokemon_by_type reads.
+    """
+    cached_data = cache.get(f"type_relations_{type_name.lower()}")
+    metrics.record_cache('type_relations', cached_data is not None)
+    if cached_data is not None:
+        return cached_data
+
+    data = _make_http_request(f"{TYPE_URL}/{type_name.lower()}")
+    if not data:
+        return None
+    cache.set(
+        f"pokemon_type_{type_name.lower()}",
+        [p['pokemon']['name'] for p in data.get('pokemon', [])],
+        CACHE_TIMEOUT
+    )
+    return _cache_type_relations(type_name, data)
+
+
+def fetch_pokemon_by_ability(ability_name: str, refresh: bool = False) -> Optional[List[str]]:
+    """Fetch all Pokémon with a specific ability with caching. refresh=True bypasses the cached copy."""
     cache_key = f"pokemon_ability_{ability_name.lower()}"
-    cached_data = cache.get(cache_key)
+    cached_data = cache.get(cache_key) if not refresh else None
+    if not refresh:
+        metrics.record_cache('pokemon_ability', bool(cached_data))
     
     if cached_data:
         return cached_data
@@ -85,107 +210,237 @@ def fetch_pokemon_by_ability(ability_name: str) -> Optional[List[str]]:
     return pokemon_list
 
 
-def fetch_pokemon_detail(pokemon_url: str) -> Dict:
-    """Fetch detailed information for a specific Pokémon."""
-    logger.info(f"Fetching pokemon detail from URL: {pokemon_url}")
+def fetch_pokemon_detail(pokemon_url: str, refresh: bool = False, harvest: bool = False) -> Dict:
+    """
+    Fetch detailed information for a specific Pokémon.
+    refresh=True skips the cached copy and re-caches the upstream data.
+    harvest=True always goes upstream and also returns the names of the
+    moves the Pokémon learns under 'moves' and its species under
+    'species'; neither is cached with the detail.
+    Raises PokemonNotFound when PokeAPI has no such Pokémon; any other
+    failure returns an empty detail (no sprite).
+    """
+    logger.debug(f"Fetching pokemon detail from URL: {pokemon_url}")
     
     # Check cache first
     cache_key = f"pokemon_detail_{pokemon_url}"
-    cached_data = cache.get(cache_key)
+    cached_data = cache.get(cache_key) if not (refresh or harvest) else None
+    if not refresh:
+        metrics.record_cache('pokemon_detail', bool(cached_data))
     if cached_data:
-        logger.info(f"Using cached data for {pokemon_url}")
         return cached_data
     
     # If not in cache, fetch from API
-    data = _make_http_request(pokemon_url)
+    data = _make_http_request(pokemon_url, raise_not_found=True)
     if not data:
         logger.error(f"Failed to fetch data for URL: {pokemon_url}")
-        return {
-            'sprite': None,
-            'types': [],
-            'abilities': [],
-            'height': None,
-            'weight': None,
-        }
+        return _empty_pokemon_detail()
 
-    logger.info(f"Raw API response for {pokemon_url}: {data}")
+    metrics.log_payload("Raw API response for %s: %s", pokemon_url, data)
     
     try:
         serializer = PokemonAPISerializer(data=data)
         if not serializer.is_valid():
             logger.error(f"Serializer validation failed for {pokemon_url}: {serializer.errors}")
-            return {
-                'sprite': None,
-                'types': [],
-                'abilities': [],
-                'height': None,
-                'weight': None,
-            }
+            return _empty_pokemon_detail()
         
         result = serializer.to_internal_value(data)
-        logger.info(f"Processed pokemon data for {pokemon_url}: {result}")
+        metrics.log_payload("Processed pokemon data for %s: %s", pokemon_url, result)
         
         # Cache the result
         cache.set(cache_key, result, DETAIL_CACHE_TIMEOUT)
+        if harvest:
+            return {
+                **result,
+                'moves': list(dict.fromkeys(m['move']['name'] for m in data.get('moves', []))),
+                'species': data.get('species', {}).get('name'),
+            }
         return result
     except Exception as e:
         logger.error(f"Error processing pokemon data for {pokemon_url}: {str(e)}")
-        return {
-            'sprite': None,
-            'types': [],
-            'abilities': [],
-            'height': None,
-            'weight': None,
-        }
+        return _empty_pokemon_detail()
+
+
+def canonical_pokemon_identifier(value: Any) -> Optional[str]:
+    """
+    Normalize a Pokémon name or numeric ID the way PokeAPI addresses it.
+    Returns None for values that can never match a Pokémon.
+    """
+    identifier = str(value).strip().lower()
+    if identifier.isdigit():
+        return str(int(identifier)) if int(identifier) > 0 else None
+    if not re.fullmatch(r"[a-z0-9][a-z0-9.'-]*", identifier):
+        return None
+    return identifier
+
+
+def _catalog_detail_url(identifier: str) -> Optional[str]:
+    """The catalog URL of a canonical name or ID, if the catalog has that Pokémon."""
+    from ...catalog import get_catalog
+
+    catalog = get_catalog()
+    position = catalog.lookup(identifier) if catalog is not None else None
+    return catalog.entries[position]['url'] if position is not None else None
+
+
+def pokemon_detail_url(identifier: str) -> str:
+    """
+    The detail URL for a canonical name or ID. Pokémon in the catalog are
+    addressed by their catalog URL, the one pokemon_list and the refresher
+    fetch, so every endpoint shares a single detail cache entry per Pokémon.
+    """
+    return _catalog_detail_url(identifier) or f"{POKEMON_URL}/{identifier}"
+
+
+@timing.span('details')
+def fetch_pokemon_details_bulk(identifiers: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch details for many canonical identifiers at once.
+    Cache hits are resolved with a single multi-get; only the misses go
+    upstream, through the bounded detail fan-out. Identifiers PokeAPI
+    doesn't know are left out of the result; failed or timed-out fetches
+    map to an empty detail (no sprite).
+    """
+    urls = {identifier: pokemon_detail_url(identifier) for identifier in identifiers}
+    unique_urls = list(dict.fromkeys(urls.values()))
+    cached = cache.get_many([f"pokemon_detail_{url}" for url in unique_urls])
+
+    details = {url: cached[f"pokemon_detail_{url}"] for url in unique_urls if cached.get(f"pokemon_detail_{url}")}
+    misses = [url for url in unique_urls if url not in details]
+    metrics.record_cache('pokemon_detail', True, len(details))
+    metrics.record_cache('pokemon_detail', False, len(misses))
 
+    if misses:
+        # Misses were counted above; the fan-out neither re-reads nor re-counts them
+        details.update(zip(misses, _fetch_details(misses, timeout=BATCH_FETCH_TIMEOUT, refresh=True)))
+    return {identifier: details[url] for identifier, url in urls.items() if details[url] is not None}
 
-def fetch_multiple_pokemon_details(pokemon_urls: List[str]) -> List[Dict]:
+
+def fetch_multiple_pokemon_details(pokemon_urls: List[str], timeout: Optional[float] = None) -> List[Dict]:
+    """
+    Fetch details for several Pokémon concurrently, preserving input order.
+    If a timeout is given, anything not finished in time is returned as an empty detail.
+    """
+    return [
+        detail if detail is not None else _empty_pokemon_detail()
+        for detail in _fetch_details(pokemon_urls, timeout)
+    ]
+
+
+_PENDING = object()
+
+
+@timing.span('detail_fanout')
+def _fetch_details(pokemon_urls: List[str], timeout: Optional[float] = None,
+                   refresh: bool = False) -> List[Optional[Dict]]:
+    """
+    The fan-out behind fetch_multiple_pokemon_details. Pokémon that PokeAPI
+    doesn't know come back as None; failed or unfinished fetches as empty details.
+    refresh=True goes straight upstream, for callers that already looked
+    the URLs up in the cache (and counted the misses).
+    """
+    global _foreground_fanouts, _fanout_pending
     if not pokemon_urls:
         return []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
-        future_to_index = {
-            executor.submit(fetch_pokemon_detail, url): i
-            for i, url in enumerate(pokemon_urls)
-        }
-
-        results = [None] * len(pokemon_urls)
-        for future in concurrent.futures.as_completed(future_to_index):
+    with _foreground_lock:
+        _foreground_fanouts += 1
+        _fanout_pending += len(pokemon_urls)
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_REQUESTS, len(pokemon_urls))
+    )
+    future_to_index = {
+        executor.submit(fetch_pokemon_detail, url, refresh): i
+        for i, url in enumerate(pokemon_urls)
+    }
+
+    results = [_PENDING] * len(pokemon_urls)
+    try:
+        for future in concurrent.futures.as_completed(future_to_index, timeout=timeout):
             index = future_to_index[future]
             try:
                 results[index] = future.result()
+            except PokemonNotFound:
+                results[index] = None
             except:
-                results[index] = {
-                    'sprite': None,
-                    'types': [],
-                    'abilities': [],
-                    'height': None,
-                    'weight': None
-                }
+                results[index] = _empty_pokemon_detail()
+            with _foreground_lock:
+                _fanout_pending -= 1
+    except concurrent.futures.TimeoutError:
+        pending = sum(1 for r in results if r is _PENDING)
+        logger.warning(f"Detail fan-out timed out after {timeout}s with {pending} pending requests")
+    finally:
+        executor.shutdown(wait=timeout is None, cancel_futures=True)
+        with _foreground_lock:
+            _foreground_fanouts -= 1
+            _fanout_pending -= sum(1 for r in results if r is _PENDING)
+
+    return [r if r is not _PENDING else _empty_pokemon_detail() for r in results]
+
 
-    return results
+def _resource_id(url: Optional[str]) -> Optional[int]:
+    last_segment = (url or '').rstrip('/').rsplit('/', 1)[-1]
+    return int(last_segment) if last_segment.isdigit() else None
 
 
+def fetch_pokemon_species(name: str, refresh: bool = False) -> Optional[Dict]:
+    """
+    Species attributes of a Pokémon with caching: generation number,
+    is_legendary, is_mythical, the ID and URL of its evolution chain, and
+    the URL of its default Pokémon (e.g. deoxys-normal for deoxys).
+    refresh=True bypasses the cached copy. Raises PokemonNotFound when
+    PokeAPI has no such species; None means the fetch failed.
+    """
+    cache_key = f"pokemon_species_{name.lower()}"
+    cached_data = cache.get(cache_key) if not refresh else None
+    if not refresh:
+        metrics.record_cache('pokemon_species', bool(cached_data))
+    if cached_data:
+        return cached_data
+
+    data = _make_http_request(f"{BASE_URL}/pokemon-species/{name.lower()}", raise_not_found=True)
+    if not data or 'evolution_chain' not in data:
+        logger.error(f"Failed to fetch species data for {name}")
+        return None
+
+    chain_url = (data.get('evolution_chain') or {}).get('url')
+    species = {
+        'generation': _resource_id((data.get('generation') or {}).get('url')),
+        'is_legendary': bool(data.get('is_legendary')),
+        'is_mythical': bool(data.get('is_mythical')),
+        'chain_id': _resource_id(chain_url),
+        'chain_url': chain_url,
+        'default_url': next(
+            (variety['pokemon']['url'] for variety in data.get('varieties', []) if variety.get('is_default')),
+            None
+        ),
+    }
+    cache.set(cache_key, species, DETAIL_CACHE_TIMEOUT)
+    return species
+
+
+@timing.span('evolution')
 def fetch_pokemon_evolution_chain(name: str) -> Optional[Dict]:
     """
     Fetch and return the full evolution chain for the given Pokémon name.
     This involves two API requests:
-      1. Get the Pokémon species URL from /pokemon/{name}
-      2. Get the evolution_chain URL from the species response
+      1. Get the evolution_chain URL from /pokemon-species/{name} (cached
+         on its own by fetch_pokemon_species)
+      2. Get the chain itself
+    Raises PokemonNotFound when PokeAPI has no such species; None means
+    the fetch failed.
     """
     cache_key = f"evolution_chain_{name.lower()}"
     cached_data = cache.get(cache_key)
+    metrics.record_cache('evolution_chain', bool(cached_data))
     if cached_data:
-        logger.info(f"Using cached evolution chain for {name}")
         return cached_data
 
-    species_url = f"{BASE_URL}/pokemon-species/{name.lower()}"
-    species_data = _make_http_request(species_url)
-    if not species_data or 'evolution_chain' not in species_data:
-        logger.error(f"Failed to fetch species data for {name}")
+    species = fetch_pokemon_species(name)
+    if not species or not species['chain_url']:
         return None
 
-    chain_url = species_data['evolution_chain']['url']
+    chain_url = species['chain_url']
     evolution_data = _make_http_request(chain_url)
     if not evolution_data or 'chain' not in evolution_data:
         logger.error(f"Failed to fetch evolution chain for {name}")
@@ -206,36 +461,111 @@ def fetch_pokemon_evolution_chain(name: str) -> Optional[Dict]:
         return None
 
 
+def _species_detail_url(name: str) -> Optional[str]:
+    """
+    Detail URL of a species' default Pokémon. Species names are usually
+    Pokémon names too, and then the catalog has the URL; species whose
+    default Pokémon carries a form suffix (deoxys, giratina, aegislash, ...)
+    are resolved through the species' default variety. None if the species
+    lookup failed; raises PokemonNotFound if the species doesn't exist.
+    """
+    url = _catalog_detail_url(name)
+    if url is not None:
+        return url
+    species = fetch_pokemon_species(name)
+    if species is None:
+        return None
+    return species.get('default_url') or f"{POKEMON_URL}/{name}"
+
+
+def hydrate_evolution_chain(chain: Dict) -> Tuple[Dict, bool]:
+    """
+    Return a copy of a parsed evolution chain where every node carries its
+    Pokémon details, and whether every node was resolved.
+    Nodes are resolved to their species' default Pokémon, and details come
+    from the detail cache and are fetched concurrently within
+    EVOLUTION_EXPAND_MAX_NODES / EVOLUTION_EXPAND_TIMEOUT. Nodes outside
+    that budget, and nodes PokeAPI has no Pokémon for, get 'details': None;
+    so do nodes whose fetch failed, which also makes the result incomplete.
+    """
+    names = EvolutionChainSerializer.chain_names(chain)[:EVOLUTION_EXPAND_MAX_NODES]
+    urls, complete = {}, True
+    for name in names:
+        try:
+            url = _species_detail_url(name)
+        except PokemonNotFound:
+            continue
+        if url is None:
+            complete = False
+        else:
+            urls[name] = url
+
+    details = _fetch_details(list(urls.values()), timeout=EVOLUTION_EXPAND_TIMEOUT)
+    details_by_name = {}
+    for name, detail in zip(urls, details):
+        if detail is None:
+            continue
+        if detail.get('sprite') is None:
+            complete = False
+        else:
+            details_by_name[name] = detail
+
+    def attach(node):
+        return {
+            'name': node['name'],
+            'details': details_by_name.get(node['name']),
+            'evolves_to': [attach(evo) for evo in node.get('evolves_to', [])],
+        }
+
+    return attach(chain), complete
+
+
 def fetch_all_types() -> List[Dict[str, Any]]:
-    """Fetch all Pokémon types from the PokeAPI."""
+    """Fetch all Pokémon types from the PokeAPI with caching."""
+    cached_data = cache.get(ALL_TYPES_CACHE_KEY)
+    metrics.record_cache('all_types', cached_data is not None)
+    if cached_data is not None:
+        return cached_data
+
     try:
-        response = requests.get(f"{BASE_URL}/type")
+        response = requests.get(f"{BASE_URL}/type", timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         # Only return the names
-        return [{"name": type_data["name"]} for type_data in data["results"]]
+        types = [{"name": type_data["name"]} for type_data in data["results"]]
     except requests.RequestException as e:
-        print(f"Error fetching types: {e}")
+        logger.error(f"Error fetching types: {str(e)}")
         return []
 
+    cache.set(ALL_TYPES_CACHE_KEY, types, DETAIL_CACHE_TIMEOUT)
+    return types
 
-import requests
-from typing import List, Dict, Any
 
 def fetch_all_abilities() -> List[Dict[str, Any]]:
-    """Fetch all Pokémon abilities from the PokeAPI using pagination."""
+    """Fetch all Pokémon abilities from the PokeAPI using pagination, with caching."""
+    cached_data = cache.get(ALL_ABILITIES_CACHE_KEY)
+    metrics.record_cache('all_abilities', cached_data is not None)
+    if cached_data is not None:
+        return cached_data
+
     abilities = []
     url = f"{BASE_URL}/ability?offset=0&limit=100"
+    complete = True
 
     while url:
         try:
-            response = requests.get(url)
+            response = requests.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             abilities.extend(data["results"])
             url = data.get("next")  # URL to next page
         except requests.RequestException as e:
-            print(f"Error fetching abilities: {e}")
+            logger.error(f"Error fetching abilities: {str(e)}")
+            complete = False
             break
 
-    return [{"name": ability["name"]} for ability in abilities]
+    abilities = [{"name": ability["name"]} for ability in abilities]
+    # Don't pin a partial list when a page failed
+    if complete:
+        cache.set(ALL_ABILITIES_CACHE_KEY, abilities, DETAIL_CACHE_TIMEOUT)
+    return abilities
@@ -30,14 +30,20 @@ class PokemonAPISerializer(serializers.Serializer):
                 'abilities': [],
                 'height': None,
                 'weight': None,
+                'stats': {},
             }
 
         return {
+            'id': data.get('id'),
+            'name': data.get('name'),
             'sprite': data.get('sprites', {}).get('front_default'),
             'types': [t['type']['name'] for t in data.get('types', [])],
             'abilities': [a['ability']['name'] for a in data.get('abilities', [])],
             'height': data.get('height'),
             'weight': data.get('weight'),
+            'stats': {
+                s['stat']['name'].replace('-', '_'): s['base_stat'] for s in data.get('stats', [])
+            },
         }
 
 
@@ -59,15 +65,33 @@ class EvolutionChainSerializer(serializers.Serializer):
                 'evolves_to': []
             }
 
-        def parse_chain(chain_node):
-            species = chain_node['species']['name']
-            evolves_to = chain_node['evolves_to']
-            return {
-                'name': species,
-                'evolves_to': [parse_chain(evo) for evo in evolves_to] if evolves_to else []
-            }
+        return self.parse_chain(data)
 
-        return parse_chain(data)
+    @classmethod
+    def parse_chain(cls, chain_node):
+        """
+        Recursively turn a raw PokeAPI chain node into {'name', 'evolves_to'}.
+        """
+        species = chain_node['species']['name']
+        evolves_to = chain_node['evolves_to']
+        return {
+            'name': species,
+            'evolves_to': [cls.parse_chain(evo) for evo in evolves_to] if evolves_to else []
+        }
+
+    @staticmethod
+    def chain_names(chain):
+        """
+        Return the names of every node in a parsed chain, breadth-first and deduplicated.
+        """
+        names = []
+        queue = [chain]
+        while queue:
+            node = queue.pop(0)
+            if node.get('name') and node['name'] not in names:
+                names.append(node['name'])
+            queue.extend(node.get('evolves_to', []))
+        return names
 
 
 class TypeSerializer(serializers.Serializer):
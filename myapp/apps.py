@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import auth_backends, user_envelope  # noqa: F401
+        # Register system checks
+        from . import checks  # noqa: F401
@@ -0,0 +1,55 @@
+"""
+Authentication backend that resolves session users from the cache.
+
+Together with the cached_db session engine this lets a warm session be
+authenticated without touching the database: the session comes from the
+cache tier (written through to django_session) and the user from here.
+Cached users are dropped on any User save (password changes included)
+and on logout. Those drops only reach other worker processes through a
+shared cache, so the backend requires one (see myapp/checks.py).
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import metrics
+
+AUTH_USER_CACHE_TIMEOUT = 3600  # 1 hour, invalidated explicitly on changes
+
+
+def auth_user_cache_key(user_id) -> str:
+    return f"auth_user_{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(auth_user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from the cache when possible."""
+
+    def get_user(self, user_id):
+        cache_key = auth_user_cache_key(user_id)
+        user = cache.get(cache_key)
+        metrics.record_cache('auth_user', user is not None)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(cache_key, user, AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_user_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
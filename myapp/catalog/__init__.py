@@ -0,0 +1,26 @@
+from .index import CatalogIndex, get_catalog
+from .filters import (
+    LIST_FILTER_PARAMS,
+    FilterUnavailable,
+    InvalidFilter,
+    parse_sort,
+    normalize_filters,
+    filter_fingerprint,
+    resolve_filters
+)
+from .pagination import (
+    InvalidCursor,
+    parse_limit,
+    encode_cursor,
+    decode_cursor,
+    page_after,
+    page_at_offset
+)
+from .fields import (
+    CATALOG_FIELDS,
+    InvalidFields,
+    parse_fields,
+    needs_details,
+    select_fields,
+    catalog_fields
+)
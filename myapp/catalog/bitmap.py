@@ -0,0 +1,49 @@
+"""
+Set operations over catalog positions using Python ints as bitmaps.
+
+Bit i is set when the Pokémon at catalog position i is in the set.
+Intersections are a single `&`, counts a popcount, and iteration walks
+only the set bits. Bitmaps convert to and from NumPy boolean masks for
+the column indexes.
+"""
+
+from typing import Iterable, Iterator
+import numpy as np
+
+
+def from_positions(positions: Iterable[int]) -> int:
+    bitmap = 0
+    for position in positions:
+        bitmap |= 1 << position
+    return bitmap
+
+
+def full(size: int) -> int:
+    return (1 << size) - 1
+
+
+def count(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+def iter_positions(bitmap: int, start: int = 0) -> Iterator[int]:
+    """Yield the set positions >= start in ascending order."""
+    bitmap >>= start
+    position = start
+    while bitmap:
+        shift = (bitmap & -bitmap).bit_length() - 1
+        position += shift
+        yield position
+        bitmap >>= shift + 1
+        position += 1
+
+
+def from_mask(mask: np.ndarray) -> int:
+    """Bitmap of the True entries of a boolean mask over catalog positions."""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+def to_mask(bitmap: int, size: int) -> np.ndarray:
+    """Boolean mask of length `size` with the bitmap's positions set."""
+    packed = np.frombuffer(bitmap.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder='little')[:size].astype(bool)
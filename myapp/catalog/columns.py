@@ -0,0 +1,73 @@
+"""
+Numeric columns (base stats, height, weight) over the catalog.
+
+Values sit in one float array with a row per catalog position; missing
+data is NaN. For every column the positions are presorted once, so a
+range filter is two binary searches (searchsorted) over the sorted
+values, turned into a bitmap that intersects with the other filters,
+and sort= is the presorted order restricted to the matches. Neither
+scans the catalog nor fetches details.
+
+Rows come from the refresher's snapshot, which covers the whole catalog;
+without one they are read from whatever details are cached.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from . import bitmap
+
+STAT_COLUMNS = ('hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed')
+NUMERIC_COLUMNS = STAT_COLUMNS + ('height', 'weight')
+COLUMN_INDEX = {name: i for i, name in enumerate(NUMERIC_COLUMNS)}
+
+
+def numeric_row(detail: Optional[Dict]) -> Optional[List[float]]:
+    """A Pokémon's values in NUMERIC_COLUMNS order, or None if its detail has no stats."""
+    if not detail or not detail.get('stats'):
+        return None
+    stats = detail['stats']
+    return [
+        float(value) if value is not None else None
+        for value in [stats.get(name) for name in STAT_COLUMNS] + [detail.get('height'), detail.get('weight')]
+    ]
+
+
+def detail_traits(detail: Optional[Dict]) -> Optional[List[List[str]]]:
+    """A Pokémon's [types, abilities], or None if its detail is missing."""
+    if not detail or not detail.get('types'):
+        return None
+    return [list(detail['types']), list(detail.get('abilities', []))]
+
+
+class NumericColumns:
+    def __init__(self, rows: List[Optional[List[float]]]):
+        self.size = len(rows)
+        self.values = np.full((self.size, len(NUMERIC_COLUMNS)), np.nan)
+        for position, row in enumerate(rows):
+            if row is not None:
+                self.values[position] = [np.nan if value is None else value for value in row]
+        self.covered = int((~np.isnan(self.values).all(axis=1)).sum())
+
+        # argsort puts NaN last in both directions; stable keeps catalog order within ties
+        self._ascending = np.argsort(self.values, axis=0, kind='stable')
+        self._descending = np.argsort(-self.values, axis=0, kind='stable')
+        self._present = (~np.isnan(self.values)).sum(axis=0)
+        self._sorted = [
+            self.values[self._ascending[:self._present[c], c], c]
+            for c in range(len(NUMERIC_COLUMNS))
+        ]
+
+    def order(self, column: str, descending: bool = False) -> np.ndarray:
+        """Every catalog position sorted by a column; positions without a value come last."""
+        c = COLUMN_INDEX[column]
+        return (self._descending if descending else self._ascending)[:, c]
+
+    def range_bitmap(self, column: str, low: Optional[float], high: Optional[float]) -> int:
+        """Bitmap of positions whose value lies in [low, high]; either bound may be None."""
+        c = COLUMN_INDEX[column]
+        values = self._sorted[c]
+        start = np.searchsorted(values, low, side='left') if low is not None else 0
+        end = np.searchsorted(values, high, side='right') if high is not None else len(values)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._ascending[start:end, c]] = True
+        return bitmap.from_mask(mask)
@@ -0,0 +1,55 @@
+"""
+Sparse fieldsets for Pokémon list-style responses.
+
+Clients pass ?fields=name,sprite to get only those members. Fields in
+CATALOG_FIELDS are known from the catalog itself, so when a request
+only asks for those the detail-fetch stage is skipped entirely.
+"""
+
+from typing import Dict, Optional, Tuple
+from ..api_integrations.pokemon.pokemon_api import POKEMON_URL
+
+CATALOG_FIELDS = ('name', 'id', 'url')
+DETAIL_FIELDS = ('sprite', 'types', 'abilities', 'height', 'weight', 'stats')
+ALL_FIELDS = CATALOG_FIELDS + DETAIL_FIELDS
+
+
+class InvalidFields(Exception):
+    pass
+
+
+def parse_fields(value: str) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a fields= parameter into a tuple in canonical order.
+    Returns None when no selection was requested (all fields).
+    """
+    requested = {field.strip().lower() for field in value.split(',') if field.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(ALL_FIELDS)
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(ALL_FIELDS)}.")
+    return tuple(field for field in ALL_FIELDS if field in requested)
+
+
+def needs_details(fields: Optional[Tuple[str, ...]]) -> bool:
+    return fields is None or any(field not in CATALOG_FIELDS for field in fields)
+
+
+def select_fields(entry: Dict, fields: Optional[Tuple[str, ...]]) -> Dict:
+    if fields is None:
+        return entry
+    return {field: entry.get(field) for field in fields}
+
+
+def catalog_fields(catalog, identifier: str) -> Optional[Dict]:
+    """
+    Catalog-level fields for a canonical name or ID, or None if the catalog doesn't know it.
+    Without a catalog (upstream unavailable) names still resolve to their PokeAPI URL.
+    """
+    position = catalog.lookup(identifier) if catalog is not None else None
+    if position is not None:
+        return catalog.catalog_entry(position)
+    if catalog is None and not identifier.isdigit():
+        return {'name': identifier, 'id': None, 'url': f"{POKEMON_URL}/{identifier}/"}
+    return None
@@ -0,0 +1,166 @@
+"""
+Filter planning for pokemon_list.
+
+Each filter resolves to a bitmap over the catalog (memoized per dataset
+version) and the result set is their intersection. min_<column> and
+max_<column> bound the numeric columns (base stats, height, weight);
+sort= orders the matches by one of them, descending with a leading '-'.
+move= is answered from the learnset index when the refresher has
+harvested one, and from PokeAPI's move resource otherwise.
+generation=, legendary= (true, false or mythical) and family=<name>
+read the species columns, which also come from the refresher; without
+them family= falls back to the Pokémon's evolution chain, and an unknown
+name is an invalid filter rather than an upstream failure.
+"""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+from ..api_integrations.pokemon.pokemon_api import (
+    fetch_pokemon_by_type,
+    fetch_pokemon_by_ability,
+    fetch_pokemon_by_move,
+    fetch_pokemon_evolution_chain,
+    canonical_pokemon_identifier,
+    PokemonNotFound
+)
+from ..api_integrations.pokemon.pokemon_serializer import EvolutionChainSerializer
+from .. import timing
+from .columns import NUMERIC_COLUMNS
+
+RANGE_FILTER_PARAMS = tuple(f"{bound}_{column}" for column in NUMERIC_COLUMNS for bound in ('min', 'max'))
+SPECIES_FILTER_PARAMS = ('generation', 'legendary', 'family')
+LIST_FILTER_PARAMS = ('search', 'type', 'ability', 'move', 'sort') + SPECIES_FILTER_PARAMS + RANGE_FILTER_PARAMS
+LEGENDARY_VALUES = {
+    'true': ('is_legendary', True),
+    'false': ('is_legendary', False),
+    'mythical': ('is_mythical', True),
+}
+
+
+class FilterUnavailable(Exception):
+    """Raised when a filter needs upstream data that could not be fetched."""
+
+
+class InvalidFilter(Exception):
+    """Raised when a filter or sort parameter has an invalid value."""
+
+
+def normalize_filters(query) -> Dict[str, str]:
+    return {name: query.get(name, '').strip().lower() for name in LIST_FILTER_PARAMS}
+
+
+def filter_fingerprint(filters: Dict[str, str]) -> str:
+    canonical = '&'.join(f"{name}={filters[name]}" for name in sorted(filters) if filters[name])
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+def parse_sort(filters: Dict[str, str]) -> Optional[Tuple[str, bool]]:
+    """The (column, descending) to order matches by, or None for catalog order."""
+    value = filters.get('sort')
+    if not value:
+        return None
+    column = value.lstrip('-')
+    if column not in NUMERIC_COLUMNS:
+        raise InvalidFilter(f"Unknown sort field: {column}. Allowed: {', '.join(NUMERIC_COLUMNS)}.")
+    return column, value.startswith('-')
+
+
+def _parse_ranges(filters: Dict[str, str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    ranges = {}
+    for column in NUMERIC_COLUMNS:
+        bounds = []
+        for bound in ('min', 'max'):
+            value = filters.get(f"{bound}_{column}")
+            try:
+                bounds.append(float(value) if value else None)
+            except ValueError:
+                raise InvalidFilter(f"{bound}_{column} must be a number.")
+        if bounds != [None, None]:
+            ranges[column] = tuple(bounds)
+    return ranges
+
+
+def _species_columns(catalog):
+    if catalog.species is None:
+        raise FilterUnavailable('Species data is not available until the catalog has been synced.')
+    return catalog.species
+
+
+@timing.span('filter')
+def resolve_filters(catalog, filters: Dict[str, str]) -> int:
+    """Return the bitmap of catalog positions matching every active filter."""
+    ranges = _parse_ranges(filters)
+    generation = filters.get('generation')
+    if generation and not generation.isdigit():
+        raise InvalidFilter('generation must be a number.')
+    legendary = filters.get('legendary')
+    if legendary and legendary not in LEGENDARY_VALUES:
+        raise InvalidFilter(f"legendary must be one of: {', '.join(LEGENDARY_VALUES)}.")
+    result = catalog.all
+
+    for column, (low, high) in ranges.items():
+        result &= catalog.memoized(
+            ('range', column, low, high),
+            lambda column=column, low=low, high=high: catalog.columns.range_bitmap(column, low, high)
+        )
+
+    if filters.get('search'):
+        result &= catalog.search(filters['search'])
+
+    if filters.get('type'):
+        def build_type():
+            names = fetch_pokemon_by_type(filters['type'])
+            if names is None:
+                raise FilterUnavailable('Failed to fetch Pokémon by type.')
+            return catalog.names_bitmap(names)
+        result &= catalog.memoized(('type', filters['type']), build_type)
+
+    if filters.get('ability'):
+        def build_ability():
+            names = fetch_pokemon_by_ability(filters['ability'])
+            if names is None:
+                raise FilterUnavailable('Failed to fetch Pokémon by ability.')
+            return catalog.names_bitmap(names)
+        result &= catalog.memoized(('ability', filters['ability']), build_ability)
+
+    if filters.get('move'):
+        def build_move():
+            if catalog.moves is not None:
+                return catalog.moves.get(filters['move'], 0)
+            names = fetch_pokemon_by_move(filters['move'])
+            if names is None:
+                raise FilterUnavailable('Failed to fetch Pokémon by move.')
+            return catalog.names_bitmap(names)
+        result &= catalog.memoized(('move', filters['move']), build_move)
+
+    if generation:
+        result &= catalog.memoized(
+            ('generation', int(generation)),
+            lambda: _species_columns(catalog).generation_bitmap(int(generation))
+        )
+
+    if legendary:
+        result &= catalog.memoized(
+            ('legendary', legendary),
+            lambda: _species_columns(catalog).flag_bitmap(*LEGENDARY_VALUES[legendary])
+        )
+
+    if filters.get('family'):
+        def build_family():
+            identifier = canonical_pokemon_identifier(filters['family'])
+            position = catalog.lookup(identifier or '')
+            if catalog.species is not None:
+                # The species index covers the whole catalog: nothing outside it has a family
+                return catalog.species.family_bitmap(position) if position is not None else 0
+            if not identifier:
+                raise InvalidFilter(f"Unknown Pokémon: {filters['family']}.")
+            try:
+                chain = fetch_pokemon_evolution_chain(catalog.names[position] if position is not None else identifier)
+            except PokemonNotFound:
+                raise InvalidFilter(f"Unknown Pokémon: {filters['family']}.")
+            if chain is None:
+                raise FilterUnavailable('Failed to fetch the evolution chain.')
+            return catalog.names_bitmap(EvolutionChainSerializer.chain_names(chain))
+        result &= catalog.memoized(('family', filters['family']), build_family)
+
+    return result
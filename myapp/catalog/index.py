@@ -0,0 +1,169 @@
+"""
+In-process index over the Pokémon catalog.
+
+The catalog is the upstream base list (name + detail URL) in PokeAPI
+order, taken from the refresher's snapshot when one exists and from the
+cached base list otherwise. It is built once per dataset version and
+per process, and memoizes the filter bitmaps computed against it, so
+repeat filters and follow-up pages never refilter the whole list. The
+memo is an LRU of BITMAP_MEMO_MAX_ENTRIES bitmaps, since search terms and
+range bounds come straight from the query string.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+from django.core.cache import cache
+from ..api_integrations.pokemon.pokemon_api import fetch_pokemon_list
+from ..dataset import get_dataset_version
+from .. import timing
+from .refresh import get_catalog_snapshot
+from . import bitmap
+from .columns import NumericColumns, numeric_row, detail_traits
+from .species import SpeciesColumns
+import logging
+
+CATALOG_FETCH_LIMIT = 1000
+BITMAP_MEMO_MAX_ENTRIES = 1024
+
+logger = logging.getLogger(__name__)
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+class CatalogIndex:
+    def __init__(self, entries: List[Dict], version: int, snapshot: Optional[Dict] = None):
+        self.version = version
+        self.entries = entries
+        self.names = [entry['name'] for entry in entries]
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.ids = [_id_from_url(entry['url']) for entry in entries]
+        self.id_positions = {pokemon_id: position for position, pokemon_id in enumerate(self.ids) if pokemon_id}
+        self.all = bitmap.full(len(entries))
+        self._bitmaps = OrderedDict()
+        self._bitmaps_lock = threading.Lock()
+        self._snapshot = snapshot or {}
+        self._columns = None
+        self._traits = None
+        self._moves = None
+        self._species = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def catalog_entry(self, position: int) -> Dict:
+        """The catalog-level fields (name, id, url) of the Pokémon at a position."""
+        return {
+            'name': self.names[position],
+            'id': self.ids[position],
+            'url': self.entries[position]['url'],
+        }
+
+    def lookup(self, identifier: str) -> Optional[int]:
+        """Catalog position for a canonical name or numeric ID, if known."""
+        if identifier.isdigit():
+            return self.id_positions.get(int(identifier))
+        return self.positions.get(identifier)
+
+    def names_bitmap(self, names) -> int:
+        """Bitmap of the given names; names outside the catalog are ignored."""
+        return bitmap.from_positions(self.positions[name] for name in names if name in self.positions)
+
+    def memoized(self, key, build) -> int:
+        """Return the bitmap stored under key, building it with build() on first use."""
+        with self._bitmaps_lock:
+            cached = self._bitmaps.get(key)
+            if cached is not None:
+                self._bitmaps.move_to_end(key)
+                return cached
+        cached = build()
+        with self._bitmaps_lock:
+            self._bitmaps[key] = cached
+            if len(self._bitmaps) > BITMAP_MEMO_MAX_ENTRIES:
+                self._bitmaps.popitem(last=False)
+        return cached
+
+    def _per_position(self, snapshot_key: str, from_detail) -> List:
+        """
+        One value per catalog position from the refresher snapshot, or
+        derived with from_detail() from the cached details when there is no
+        snapshot. Positions without data get None.
+        """
+        values = self._snapshot.get(snapshot_key)
+        if values is None:
+            keys = {f"pokemon_detail_{entry['url']}": entry['name'] for entry in self.entries}
+            values = {keys[key]: from_detail(detail) for key, detail in cache.get_many(list(keys)).items()}
+        return [values.get(name) for name in self.names]
+
+    @property
+    def columns(self) -> NumericColumns:
+        """Numeric columns, built on first use."""
+        if self._columns is None:
+            self._columns = NumericColumns(self._per_position('columns', numeric_row))
+            logger.info(f"Built numeric columns for {self._columns.covered}/{len(self)} Pokémon")
+        return self._columns
+
+    @property
+    def traits(self) -> List[Optional[List[List[str]]]]:
+        """[types, abilities] of every position, or None where unknown; built on first use."""
+        if self._traits is None:
+            self._traits = self._per_position('traits', detail_traits)
+        return self._traits
+
+    @property
+    def moves(self) -> Optional[Dict[str, int]]:
+        """
+        Inverted learnset index: move name -> bitmap of the positions that
+        learn it. Only the refresher harvests learnsets, so this is None
+        without a snapshot.
+        """
+        if self._moves is None and 'learnsets' in self._snapshot:
+            move_names = self._snapshot['moves']
+            learners = np.zeros((len(move_names), len(self)), dtype=bool)
+            for position, name in enumerate(self.names):
+                learners[self._snapshot['learnsets'].get(name, []), position] = True
+            self._moves = {move: bitmap.from_mask(learners[move_id]) for move_id, move in enumerate(move_names)}
+            logger.info(f"Built learnset index of {len(move_names)} moves")
+        return self._moves
+
+    @property
+    def species(self) -> Optional[SpeciesColumns]:
+        """Species attributes per position; None without a snapshot, since only the refresher collects them."""
+        if self._species is None and 'species' in self._snapshot:
+            species = self._snapshot['species']
+            self._species = SpeciesColumns([species.get(name) for name in self.names])
+            logger.info(f"Built species columns for {self._species.covered}/{len(self)} Pokémon")
+        return self._species
+
+    def search(self, term: str) -> int:
+        return self.memoized(
+            ('search', term),
+            lambda: bitmap.from_positions(i for i, name in enumerate(self.names) if term in name.lower())
+        )
+
+
+def _id_from_url(url: str) -> Optional[int]:
+    last_segment = url.rstrip('/').rsplit('/', 1)[-1]
+    return int(last_segment) if last_segment.isdigit() else None
+
+
+@timing.span('catalog')
+def get_catalog() -> Optional[CatalogIndex]:
+    """The catalog index for the current dataset version, or None if upstream is unavailable."""
+    global _catalog
+    version = get_dataset_version()
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is not None and _catalog.version == version:
+            return _catalog
+        base_data = get_catalog_snapshot() or fetch_pokemon_list(offset=0, limit=CATALOG_FETCH_LIMIT)
+        if not base_data:
+            return None
+        _catalog = CatalogIndex(base_data['results'], version, base_data)
+        logger.info(f"Built catalog index v{version} with {len(_catalog)} Pokémon")
+        return _catalog
@@ -0,0 +1,100 @@
+"""
+Keyset (cursor) pagination over catalog bitmaps.
+
+A cursor is an opaque token holding the name of the last Pokémon served
+and the fingerprint of the filters it was served under. The next page
+continues from that name's catalog position, so it costs O(page size)
+regardless of how deep the client has scrolled.
+
+With sort= the page functions take the column's presorted positions as
+`order` and walk the matches in that order instead of catalog order.
+"""
+
+import base64
+import json
+from typing import List, Optional, Tuple
+import numpy as np
+from . import bitmap
+
+DEFAULT_PAGE_SIZE = 9
+MAX_PAGE_SIZE = 50
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def parse_limit(value: str) -> int:
+    if not value or not value.isdigit():
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def encode_cursor(last_name: str, fingerprint: str) -> str:
+    payload = json.dumps({'k': last_name, 'f': fingerprint}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> str:
+    """Return the last served name, validating the cursor against the current filters."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_name, cursor_fingerprint = payload['k'], payload['f']
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor('Invalid cursor.')
+    if not isinstance(last_name, str):
+        raise InvalidCursor('Invalid cursor.')
+    if cursor_fingerprint != fingerprint:
+        raise InvalidCursor('Cursor does not match the current filters.')
+    return last_name
+
+
+def _ordered_matches(matches: int, order: np.ndarray) -> np.ndarray:
+    return order[bitmap.to_mask(matches, len(order))[order]]
+
+
+def page_after(catalog, matches: int, last_name: Optional[str], limit: int,
+               order: Optional[np.ndarray] = None) -> Tuple[List[int], bool]:
+    """
+    Positions of the next `limit` matches after last_name (or from the start).
+    Returns (positions, has_more).
+    """
+    start = 0
+    if last_name is not None:
+        if last_name not in catalog.positions:
+            raise InvalidCursor('Cursor refers to a Pokémon that is no longer in the catalog.')
+        start = catalog.positions[last_name] + 1
+
+    if order is not None:
+        ordered = _ordered_matches(matches, order)
+        if last_name is not None:
+            index = np.flatnonzero(ordered == start - 1)
+            if not len(index):
+                raise InvalidCursor('Cursor refers to a Pokémon that no longer matches the filters.')
+            ordered = ordered[index[0] + 1:]
+        return ordered[:limit].tolist(), len(ordered) > limit
+
+    positions = []
+    for position in bitmap.iter_positions(matches, start):
+        if len(positions) == limit:
+            return positions, True
+        positions.append(position)
+    return positions, False
+
+
+def page_at_offset(matches: int, offset: int, limit: int,
+                   order: Optional[np.ndarray] = None) -> Tuple[List[int], bool]:
+    """Positions for classic page/offset requests. Returns (positions, has_more)."""
+    if order is not None:
+        ordered = _ordered_matches(matches, order)
+        return ordered[offset:offset + limit].tolist(), len(ordered) > offset + limit
+
+    positions = []
+    for index, position in enumerate(bitmap.iter_positions(matches)):
+        if index < offset:
+            continue
+        if len(positions) == limit:
+            return positions, True
+        positions.append(position)
+    return positions, False
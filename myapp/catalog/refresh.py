@@ -0,0 +1,209 @@
+"""
+Incremental refresh of the Pokémon catalog from PokeAPI.
+
+The refresher keeps a snapshot of the upstream base list plus a
+fingerprint, the numeric column values (base stats, height, weight),
+the types and abilities of every Pokémon's processed detail, its
+learnset as IDs into an interned list of move names, and its species
+attributes (generation, legendary/mythical, evolution chain). Each run diffs the
+upstream list against the snapshot and only re-fetches the entities
+that are new, moved, or due for re-verification. When anything changed
+the new snapshot is stored first and the dataset version is bumped
+last, so web processes switch to the rebuilt catalog, response caches
+and ETags in one step.
+"""
+
+import json
+import hashlib
+import concurrent.futures
+from typing import Dict, Optional
+from django.core.cache import cache
+from ..api_integrations.pokemon.pokemon_api import (
+    POKEMON_URL,
+    _make_http_request,
+    fetch_pokemon_detail,
+    fetch_pokemon_species,
+    PokemonNotFound,
+    fetch_pokemon_by_type,
+    fetch_pokemon_by_ability
+)
+from ..dataset import bump_dataset_version, state_cache
+from .columns import numeric_row, detail_traits
+from .species import species_entry
+import logging
+
+CATALOG_SNAPSHOT_CACHE_KEY = "pokedex_catalog_snapshot"
+REFRESH_INTERVAL = 3600  # seconds between runs of the worker
+REFRESH_MAX_WORKERS = 4  # concurrent upstream detail requests
+REFRESH_VERIFY_BATCH = 50  # unchanged Pokémon re-checked per run
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshError(Exception):
+    """Upstream could not be read; the snapshot and dataset version are left as they were."""
+
+
+def get_catalog_snapshot() -> Optional[Dict]:
+    return state_cache().get(CATALOG_SNAPSHOT_CACHE_KEY)
+
+
+def detail_fingerprint(detail: Dict) -> str:
+    return hashlib.sha1(json.dumps(detail, sort_keys=True).encode()).hexdigest()
+
+
+def _fetch_upstream_catalog() -> Dict:
+    head = _make_http_request(f"{POKEMON_URL}?offset=0&limit=1")
+    if not head or 'count' not in head:
+        raise RefreshError("Failed to read the upstream catalog count")
+    listing = _make_http_request(f"{POKEMON_URL}?offset=0&limit={head['count']}")
+    if not listing or 'results' not in listing:
+        raise RefreshError("Failed to read the upstream catalog")
+    return listing
+
+
+def _verify_sample(names, offset: int, size: int):
+    """The next `size` names after `offset`, wrapping around, and the offset to resume from."""
+    if not names or size <= 0:
+        return [], offset
+    offset %= len(names)
+    sample = (names[offset:] + names[:offset])[:size]
+    return sample, (offset + len(sample)) % len(names)
+
+
+def _refresh_detail(url: str):
+    previous = cache.get(f"pokemon_detail_{url}")
+    # Whatever upstream no longer serves counts as failed and is retried
+    try:
+        detail = fetch_pokemon_detail(url, refresh=True, harvest=True)
+    except PokemonNotFound:
+        return previous, {}, None
+    try:
+        species = fetch_pokemon_species(detail['species'], refresh=True) if detail.get('species') else None
+    except PokemonNotFound:
+        species = None
+    return previous, detail, species
+
+
+def refresh_catalog(max_workers: int = REFRESH_MAX_WORKERS, verify: int = REFRESH_VERIFY_BATCH) -> Dict:
+    """
+    Bring the catalog snapshot up to date with upstream.
+
+    Returns a summary of what changed. The dataset version is only bumped
+    when the catalog or at least one Pokémon's data actually changed.
+    """
+    listing = _fetch_upstream_catalog()
+    snapshot = get_catalog_snapshot() or {'results': [], 'fingerprints': {}, 'verify_offset': 0}
+    previous_urls = {entry['name']: entry['url'] for entry in snapshot['results']}
+    fingerprints = dict(snapshot['fingerprints'])
+    columns = dict(snapshot.get('columns', {}))
+    traits = dict(snapshot.get('traits', {}))
+    learnsets = dict(snapshot.get('learnsets', {}))
+    species = dict(snapshot.get('species', {}))
+    move_names = list(snapshot.get('moves', []))
+    move_ids = {move: move_id for move_id, move in enumerate(move_names)}
+
+    def intern_move(move: str) -> int:
+        if move not in move_ids:
+            move_ids[move] = len(move_names)
+            move_names.append(move)
+        return move_ids[move]
+
+    results = [{'name': entry['name'], 'url': entry['url']} for entry in listing['results']]
+    current_urls = {entry['name']: entry['url'] for entry in results}
+    added = [name for name in current_urls if name not in previous_urls]
+    moved = [name for name, url in current_urls.items() if name in previous_urls and previous_urls[name] != url]
+    removed = [name for name in previous_urls if name not in current_urls]
+
+    unchanged = [name for name in current_urls if name in previous_urls and name not in moved]
+    # Entities whose detail fetch failed on an earlier run, or that predate
+    # any of the harvested attributes, are fetched first
+    retried = [
+        name for name in unchanged
+        if any(name not in harvested for harvested in (fingerprints, columns, traits, learnsets, species))
+    ]
+    verified, verify_offset = _verify_sample(
+        [name for name in unchanged if name in fingerprints], snapshot['verify_offset'], verify
+    )
+
+    changed, failed = [], []
+    rows_changed = 0
+    affected_types, affected_abilities = set(), set()
+    to_fetch = added + moved + retried + verified
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_refresh_detail, current_urls[name]): name for name in to_fetch}
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            previous, detail, species_data = future.result()
+            moves = detail.pop('moves', [])
+            detail.pop('species', None)
+            if not detail.get('id'):
+                failed.append(name)
+                continue
+            if species_data is None:
+                # Retried on the next run; the rest of the detail is still current
+                failed.append(name)
+            elif species.get(name) != species_entry(species_data):
+                species[name] = species_entry(species_data)
+                rows_changed += 1
+            row, trait = numeric_row(detail), detail_traits(detail)
+            learnset = sorted(intern_move(move) for move in moves)
+            if (name not in columns or columns[name] != row or name not in traits or traits[name] != trait
+                    or learnsets.get(name) != learnset):
+                columns[name] = row
+                traits[name] = trait
+                learnsets[name] = learnset
+                rows_changed += 1
+            fingerprint = detail_fingerprint(detail)
+            if fingerprints.get(name) == fingerprint:
+                continue
+            fingerprints[name] = fingerprint
+            if name in verified:
+                changed.append(name)
+            for data in (previous, detail):
+                if data:
+                    affected_types.update(data.get('types', []))
+                    affected_abilities.update(data.get('abilities', []))
+
+    for name in removed:
+        fingerprints.pop(name, None)
+        columns.pop(name, None)
+        traits.pop(name, None)
+        learnsets.pop(name, None)
+        species.pop(name, None)
+
+    # Membership lists of types and abilities touched by a change
+    for type_name in affected_types:
+        fetch_pokemon_by_type(type_name, refresh=True)
+    for ability_name in affected_abilities:
+        fetch_pokemon_by_ability(ability_name, refresh=True)
+
+    state_cache().set(CATALOG_SNAPSHOT_CACHE_KEY, {
+        'count': listing['count'],
+        'results': results,
+        'fingerprints': fingerprints,
+        'columns': columns,
+        'traits': traits,
+        'moves': move_names,
+        'learnsets': learnsets,
+        'species': species,
+        'verify_offset': verify_offset,
+    }, None)
+
+    version = None
+    if added or removed or moved or changed or rows_changed:
+        version = bump_dataset_version()
+        logger.info(
+            f"Catalog refreshed to v{version}: {len(added)} added, {len(removed)} removed, "
+            f"{len(moved) + len(changed)} changed"
+        )
+
+    return {
+        'count': len(results),
+        'added': len(added),
+        'removed': len(removed),
+        'changed': len(moved) + len(changed),
+        'verified': len(verified),
+        'failed': len(failed),
+        'version': version,
+    }
@@ -0,0 +1,47 @@
+"""
+Species attributes (generation, legendary/mythical, evolution family)
+over the catalog.
+
+The refresher stores each Pokémon's species attributes in the snapshot;
+here they become one array per attribute with a row per catalog
+position, so generation=, legendary= and family= resolve to bitmaps
+with a single vectorized comparison. Positions without species data
+never match.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from . import bitmap
+
+SPECIES_FIELDS = ('generation', 'is_legendary', 'is_mythical', 'chain_id')
+
+
+def species_entry(species: Optional[Dict]) -> Optional[Dict]:
+    """The SPECIES_FIELDS of fetch_pokemon_species() output, as kept in the snapshot."""
+    if not species:
+        return None
+    return {field: species.get(field) for field in SPECIES_FIELDS}
+
+
+class SpeciesColumns:
+    def __init__(self, entries: List[Optional[Dict]]):
+        self.size = len(entries)
+        self.covered = sum(1 for entry in entries if entry)
+        # 0 stands for unknown: PokeAPI IDs start at 1
+        self.generation = np.array([(entry or {}).get('generation') or 0 for entry in entries], dtype=np.int32)
+        self.chain_id = np.array([(entry or {}).get('chain_id') or 0 for entry in entries], dtype=np.int32)
+        self.known = np.array([bool(entry) for entry in entries])
+        self.is_legendary = np.array([bool((entry or {}).get('is_legendary')) for entry in entries])
+        self.is_mythical = np.array([bool((entry or {}).get('is_mythical')) for entry in entries])
+
+    def generation_bitmap(self, generation: int) -> int:
+        return bitmap.from_mask(self.generation == generation)
+
+    def flag_bitmap(self, flag: str, value: bool) -> int:
+        """Bitmap of the positions whose is_legendary or is_mythical flag equals value."""
+        return bitmap.from_mask(self.known & (getattr(self, flag) == value))
+
+    def family_bitmap(self, position: int) -> int:
+        """Bitmap of the positions in the same evolution chain as position."""
+        chain_id = self.chain_id[position]
+        return bitmap.from_mask(self.chain_id == chain_id) if chain_id else 0
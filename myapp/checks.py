@@ -0,0 +1,44 @@
+"""
+System checks for settings that are only safe with a shared cache.
+
+The cached session engine and CachedModelBackend invalidate sessions and
+users (logout, password changes, deactivation) by deleting cache entries.
+With a process-local cache those deletes never reach the other worker
+processes, which keep authenticating with the stale entries.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def default_cache_is_shared() -> bool:
+    """Whether cache writes and deletes in one process are seen by the others."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register()
+def check_cached_auth(app_configs, **kwargs):
+    if default_cache_is_shared():
+        return []
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        errors.append(Error(
+            f"SESSION_ENGINE {settings.SESSION_ENGINE!r} needs a cache shared by all workers.",
+            hint="Set POKEDEX_CACHE_DIR or use 'django.contrib.sessions.backends.db'.",
+            id='myapp.E001',
+        ))
+    if 'myapp.auth_backends.CachedModelBackend' in settings.AUTHENTICATION_BACKENDS:
+        errors.append(Error(
+            "CachedModelBackend needs a cache shared by all workers.",
+            hint="Set POKEDEX_CACHE_DIR or use 'django.contrib.auth.backends.ModelBackend'.",
+            id='myapp.E002',
+        ))
+    return errors
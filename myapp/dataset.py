@@ -0,0 +1,49 @@
+"""
+Dataset version for the Pokémon catalog.
+
+Anything derived from upstream data (HTTP validators, response caches,
+indexes) keys on this version, so bumping it after a catalog refresh
+invalidates all of them at once. The version is the unix timestamp of
+the last bump, which also makes it usable as Last-Modified.
+
+The version (and the refresher's catalog snapshot) live in the `state`
+cache rather than the default one: they never expire, must not be culled
+to make room for details, and must be the same for every worker process.
+"""
+
+import time
+from django.core.cache import caches
+
+DATASET_VERSION_CACHE_KEY = "pokedex_dataset_version"
+DATASET_VERSION_LOCAL_TTL = 1.0  # seconds a process reuses the version it last read
+STATE_CACHE_ALIAS = 'state'
+
+_local = {'version': None, 'read_at': 0.0}
+
+
+def state_cache():
+    """The cache holding the dataset version and the catalog snapshot."""
+    return caches[STATE_CACHE_ALIAS]
+
+
+def get_dataset_version() -> int:
+    now = time.monotonic()
+    if _local['version'] is not None and now - _local['read_at'] < DATASET_VERSION_LOCAL_TTL:
+        return _local['version']
+
+    cache = state_cache()
+    version = cache.get(DATASET_VERSION_CACHE_KEY)
+    if version is None:
+        # First reader initializes it; add() keeps concurrent readers consistent
+        cache.add(DATASET_VERSION_CACHE_KEY, int(time.time()), None)
+        version = cache.get(DATASET_VERSION_CACHE_KEY)
+    _local.update(version=version, read_at=now)
+    return version
+
+
+def bump_dataset_version() -> int:
+    """Move to a new dataset version and return it."""
+    version = max(int(time.time()), get_dataset_version() + 1)
+    state_cache().set(DATASET_VERSION_CACHE_KEY, version, None)
+    _local.update(version=version, read_at=time.monotonic())
+    return version
@@ -1,7 +1,12 @@
 from functools import wraps
+import hashlib
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from . import timing
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,38 +30,36 @@ def handle_api_errors(view_func):
             )
     return wrapper
 
-def require_authentication(view_func):
+def require_authentication(view_func=None, *, envelope=True):
     """
     A decorator to ensure the user is authenticated and return user data.
-    Automatically adds user and profile data to the response.
+    Automatically adds the cached user/profile envelope to the response.
+    Use @require_authentication(envelope=False) for endpoints that don't need it.
     """
-    @wraps(view_func)
-    def wrapper(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return Response(
-                {'error': 'Authentication required.'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        
-        # Get the original response
-        response = view_func(request, *args, **kwargs)
-        
-        # If the response is a dict and doesn't already have user data, add it
-        if isinstance(response.data, dict) and 'user' not in response.data:
-            from .my_api_serializers.user.user_read import UserReadSerializer, UserProfileReadSerializer
-            user_data = UserReadSerializer(request.user).data
-            profile_data = UserProfileReadSerializer(request.user.profile).data
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return Response(
+                    {'error': 'Authentication required.'},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
             
-            response.data = {
-                **response.data,
-                'user': {
-                    **user_data,
-                    'profile': profile_data
-                }
-            }
-        
-        return response
-    return wrapper
+            # Get the original response
+            response = view_func(request, *args, **kwargs)
+            
+            # If the response is a dict and doesn't already have user data, add it
+            if envelope and isinstance(response.data, dict) and 'user' not in response.data:
+                from .user_envelope import get_user_envelope
+                with timing.span('envelope'):
+                    response.data['user'] = get_user_envelope(request.user)
+            
+            return response
+        return wrapper
+
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
 
 def validate_with_serializer(serializer_class):
     """
@@ -88,44 +91,106 @@ def validate_with_serializer(serializer_class):
         return wrapper
     return decorator
 
-def paginate_response(limit=9):
+def http_cache(max_age=300, stale_while_revalidate=86400):
     """
-    A decorator to handle pagination of list responses.
-    Automatically adds pagination metadata to the response.
+    A decorator adding HTTP caching semantics to public, dataset-backed GET endpoints.
+    The strong ETag is derived from the dataset version plus the normalized path
+    and query, so a matching If-None-Match (or a fresh If-Modified-Since) is
+    answered with 304 before the view runs. Successful responses get ETag,
+    Last-Modified and Cache-Control headers. Degraded responses (the view set
+    `response.skip_response_cache`, e.g. after failed upstream fetches) get
+    no validators and `Cache-Control: no-store`: the ETag doesn't cover the
+    body, so a validator on them would pin the broken body until the
+    version changes.
     """
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            # Get pagination parameters
-            page = max(1, int(request.GET.get('page', 1))) if request.GET.get('page', '').isdigit() else 1
-            offset = (page - 1) * limit
-            
-            # Add pagination info to request
-            request.pagination = {
-                'page': page,
-                'limit': limit,
-                'offset': offset
-            }
-            
-            # Get the original response
-            response = view_func(request, *args, **kwargs)
-            
-            # If the response is a dict and contains results, add pagination metadata
-            if isinstance(response.data, dict) and 'results' in response.data:
-                total_count = response.data.get('count', len(response.data['results']))
-                total_pages = (total_count + limit - 1) // limit
-                
-                response.data.update({
-                    'pagination': {
-                        'current_page': page,
-                        'total_pages': total_pages,
-                        'total_items': total_count,
-                        'items_per_page': limit,
-                        'has_next': page < total_pages,
-                        'has_previous': page > 1
-                    }
-                })
-            
+            from .dataset import get_dataset_version
+
+            version = get_dataset_version()
+            from .response_cache import negotiate_encoding, normalize_value
+            query = sorted((key, normalize_value(key, value)) for key, value in request.GET.items())
+            # The body varies on Accept (JSON vs browsable API) and on the
+            # negotiated content coding, so the strong ETag must too
+            accept = request.META.get('HTTP_ACCEPT', '')
+            encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            fingerprint = f"{version}|{request.path.lower()}|{query}|{accept}|{encoding}"
+            etag = f'"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+
+            if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+            if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+            if if_none_match:
+                not_modified = etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+            else:
+                not_modified = if_modified_since is not None and if_modified_since >= version
+
+            if not_modified:
+                response = HttpResponseNotModified()
+            else:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if getattr(response, 'skip_response_cache', False):
+                    patch_cache_control(response, no_store=True)
+                    return response
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(version)
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=max_age,
+                stale_while_revalidate=stale_while_revalidate
+            )
             return response
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
+
+def cache_rendered_response(route, params):
+    """
+    A decorator serving a GET endpoint from the rendered-response cache.
+    The key is the route, the dataset version and the normalized query
+    parameters listed in `params`. Hits return the stored JSON bytes
+    without running the view or the renderer; successful misses are
+    rendered once and stored, unless the view set `response.skip_response_cache`
+    (e.g. a page with failed upstream fetches). Bodies are served in the
+    negotiated Accept-Encoding from precompressed variants. Non-JSON
+    renderings (browsable API) bypass it.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            from .dataset import get_dataset_version
+            from .renderers import PokemonJSONRenderer
+            from . import response_cache
+
+            if getattr(request, 'accepted_renderer', None) and request.accepted_renderer.format != 'json':
+                return view_func(request, *args, **kwargs)
+
+            normalized = response_cache.normalize_params(request.GET, params) + tuple(sorted(kwargs.items()))
+            cache_key = response_cache.response_cache_key(route, normalized, get_dataset_version())
+            encoding = response_cache.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            with timing.span('response_cache'):
+                cached = response_cache.get_cached_body(cache_key, encoding)
+            response_cache.record_lookup(route, hit=cached is not None)
+
+            if cached is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or not isinstance(response, Response):
+                    return response
+                body = PokemonJSONRenderer().render(response.data)
+                if getattr(response, 'skip_response_cache', False):
+                    uncached = HttpResponse(body, content_type='application/json')
+                    uncached.skip_response_cache = True
+                    return uncached
+                cached = response_cache.set_cached_body(cache_key, body, encoding)
+
+            body, content_encoding = cached
+            response = HttpResponse(body, content_type='application/json')
+            if content_encoding:
+                response['Content-Encoding'] = content_encoding
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,177 @@
+"""
+Favorite Pokémon storage and server-side hydration.
+
+Favorites live in the FavoritePokemon table, one row per (user, Pokémon).
+Adds and removes are single atomic statements against its unique index,
+so concurrent toggles from several tabs cannot lose updates.
+
+A user's favorites page is materialized in the cache as the list of
+favorite names plus their hydrated details. Every write patches the
+entry in place, fetching only what changed, so a favorites page is
+normally one indexed query for the names plus a single cache read.
+Names whose details could not be fetched are left out of the page and
+retried after FAVORITES_RETRY_INTERVAL.
+"""
+
+import time
+
+from typing import Dict, Iterable, List, Set, Tuple
+from django.core.cache import cache
+from django.db import transaction
+from .api_integrations.pokemon.pokemon_api import fetch_pokemon_details_bulk, canonical_pokemon_identifier
+from .models import FavoritePokemon
+from .popularity import record_favorite_changes
+from .user_envelope import invalidate_user_envelope
+from . import metrics
+import logging
+
+FAVORITES_CACHE_TIMEOUT = 86400  # 24 hours, same as individual details
+FAVORITES_RETRY_INTERVAL = 60  # seconds before failed hydrations are fetched again
+
+logger = logging.getLogger(__name__)
+
+
+def favorites_cache_key(user_id: int) -> str:
+    return f"favorites_page_{user_id}"
+
+
+def _hydrate(names: List[str]) -> Dict[str, Dict]:
+    """Fetch details for the given favorite names, keyed by the stored name."""
+    identifiers = {name: canonical_pokemon_identifier(name) for name in names}
+    details = fetch_pokemon_details_bulk([i for i in dict.fromkeys(identifiers.values()) if i])
+
+    entries = {}
+    for name, identifier in identifiers.items():
+        detail = details.get(identifier) if identifier else None
+        if detail and detail.get('sprite') is not None:
+            entries[name] = {**detail, 'name': name}
+    return entries
+
+
+def sync_favorites_cache(user_id: int, favorite_names: List[str]) -> Dict:
+    """
+    Bring the user's materialized favorites page in line with favorite_names.
+    Entries already in the cache are reused; only newly added names, and
+    names whose hydration failed once the retry interval has passed, are fetched.
+    """
+    cache_key = favorites_cache_key(user_id)
+    cached = cache.get(cache_key)
+    now = time.time()
+    retry_due = cached is not None and cached.get('retry_at') is not None and now >= cached['retry_at']
+    if cached is not None and cached['favorites'] == favorite_names and not retry_due:
+        return cached
+
+    known = {entry['name']: entry for entry in cached['results']} if cached else {}
+    missing = [name for name in favorite_names if name not in known]
+    if missing:
+        known.update(_hydrate(missing))
+
+    results = [known[name] for name in favorite_names if name in known]
+    failed = len(results) < len(favorite_names)
+    materialized = {
+        'favorites': list(favorite_names),
+        'results': results,
+        'retry_at': now + FAVORITES_RETRY_INTERVAL if failed else None,
+    }
+    cache.set(cache_key, materialized, FAVORITES_CACHE_TIMEOUT)
+    logger.info(f"Materialized favorites for user {user_id}: {len(results)} entries, {len(missing)} fetched")
+    return materialized
+
+
+def get_favorites_payload(user) -> Dict:
+    """
+    Return the favorites page for a user as {'count', 'results'}.
+    The materialized page is checked against the table on every read: a
+    write handled by another worker re-syncs its own process-local cache,
+    not necessarily the one this worker reads.
+    """
+    names = favorite_names(user)
+    cached = cache.get(favorites_cache_key(user.id))
+    metrics.record_cache('favorites', cached is not None and cached['favorites'] == names)
+    materialized = sync_favorites_cache(user.id, names)
+    return {
+        'count': len(materialized['results']),
+        'results': materialized['results'],
+    }
+
+
+def invalidate_favorites_cache(user_id: int) -> None:
+    cache.delete(favorites_cache_key(user_id))
+
+
+def normalize_pokemon_name(name: str) -> str:
+    return str(name).strip().lower()
+
+
+def favorite_names(user) -> List[str]:
+    """The user's favorite Pokémon names in the order they were added."""
+    return list(FavoritePokemon.objects.filter(user=user).values_list('pokemon_name', flat=True))
+
+
+def favorited_names(user, names: Iterable[str]) -> Set[str]:
+    """Which of the given names the user has favorited, in one indexed query."""
+    names = {normalize_pokemon_name(name) for name in names}
+    return set(
+        FavoritePokemon.objects
+        .filter(user=user, pokemon_name__in=names)
+        .values_list('pokemon_name', flat=True)
+    )
+
+
+def toggle_favorite(user, pokemon_name: str) -> bool:
+    """
+    Add the Pokémon if it is not a favorite yet, otherwise remove it.
+    Returns True when it was added.
+    """
+    pokemon_name = normalize_pokemon_name(pokemon_name)
+    with transaction.atomic():
+        deleted, _ = FavoritePokemon.objects.filter(user=user, pokemon_name=pokemon_name).delete()
+        created = False
+        if not deleted:
+            _, created = FavoritePokemon.objects.get_or_create(user=user, pokemon_name=pokemon_name)
+        record_favorite_changes(
+            added=[pokemon_name] if created else [],
+            removed=[pokemon_name] if deleted else []
+        )
+    invalidate_user_envelope(user.id)
+    sync_favorites_cache(user.id, favorite_names(user))
+    return not deleted
+
+
+def update_favorites(user, add: Iterable[str] = (), remove: Iterable[str] = (),
+                     hydrate: bool = True) -> Tuple[List[str], List[str]]:
+    """
+    Add and remove several favorites in one transaction.
+    Returns (added, removed): only the names whose state actually changed.
+    With hydrate=False the materialized page is dropped instead of patched,
+    leaving the detail fetches to the first favorites read.
+    """
+    add = list(dict.fromkeys(normalize_pokemon_name(name) for name in add if str(name).strip()))
+    remove = {normalize_pokemon_name(name) for name in remove} - set(add)
+
+    with transaction.atomic():
+        # The pre-reads only narrow down the candidates. The counters follow
+        # the rows each statement actually deleted or created, so a
+        # concurrent request changing the same rows is never counted twice.
+        removed = []
+        for name in favorited_names(user, remove):
+            deleted, _ = FavoritePokemon.objects.filter(user=user, pokemon_name=name).delete()
+            if deleted:
+                removed.append(name)
+
+        existing = favorited_names(user, add)
+        added = []
+        for name in add:
+            if name not in existing:
+                _, created = FavoritePokemon.objects.get_or_create(user=user, pokemon_name=name)
+                if created:
+                    added.append(name)
+        record_favorite_changes(added, removed)
+
+    if added or removed:
+        invalidate_user_envelope(user.id)
+        if hydrate:
+            sync_favorites_cache(user.id, favorite_names(user))
+        else:
+            invalidate_favorites_cache(user.id)
+    return added, removed
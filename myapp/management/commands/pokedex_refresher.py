@@ -0,0 +1,52 @@
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from myapp.catalog.refresh import (
+    REFRESH_INTERVAL,
+    REFRESH_MAX_WORKERS,
+    REFRESH_VERIFY_BATCH,
+    RefreshError,
+    refresh_catalog
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep the Pokémon catalog in sync with PokeAPI, re-fetching only new or changed "
+        "entities and bumping the dataset version when something changed. Web workers only "
+        "see the refresh when they share its cache backend (see POKEDEX_CACHE_DIR)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run a single refresh and exit.")
+        parser.add_argument('--interval', type=int, default=REFRESH_INTERVAL,
+                            help="Seconds between refreshes.")
+        parser.add_argument('--workers', type=int, default=REFRESH_MAX_WORKERS,
+                            help="Concurrent upstream detail requests.")
+        parser.add_argument('--verify', type=int, default=REFRESH_VERIFY_BATCH,
+                            help="Unchanged Pokémon re-fetched per run to detect upstream edits.")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        while not stop.is_set():
+            try:
+                summary = refresh_catalog(max_workers=options['workers'], verify=options['verify'])
+            except RefreshError as e:
+                self.stderr.write(self.style.ERROR(str(e)))
+                if options['once']:
+                    return
+            else:
+                message = (
+                    f"{summary['count']} Pokémon: {summary['added']} added, {summary['removed']} removed, "
+                    f"{summary['changed']} changed, {summary['verified']} verified, {summary['failed']} failed"
+                )
+                if summary['version'] is not None:
+                    message += f"; dataset version {summary['version']}"
+                self.stdout.write(self.style.SUCCESS(message))
+
+            if options['once']:
+                return
+            stop.wait(options['interval'])
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from myapp.popularity import rebuild_popularity
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-Pokémon favorite counters from the favorites table."
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_popularity()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt favorite counters for {rebuilt} Pokémon."))
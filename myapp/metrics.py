@@ -0,0 +1,219 @@
+"""
+Process metrics exposed in the Prometheus text format at /api/metrics/.
+
+Counters and histograms are kept in a per-process registry. With
+POKEDEX_METRICS_DIR set, every process periodically writes its registry
+to <dir>/metrics_<pid>.json and a scrape sums the files of all
+processes, so whichever gunicorn worker answers reports for the whole
+pool. Gauges are sampled when a process flushes; only processes that are
+still alive contribute them. Clear the directory when the pool restarts.
+
+Full upstream payloads are not logged on the hot path anymore; they go to
+the `pokedex.payloads` logger at DEBUG, for a sampled fraction of calls.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from typing import Callable, Dict, List
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_FLUSH_INTERVAL = 1.0  # seconds between writes of this process's registry file
+PAYLOAD_LOG_SAMPLE_RATE = 0.01
+
+METRICS = {
+    'pokedex_http_requests_total': ('counter', "HTTP requests by route, method and status."),
+    'pokedex_http_request_duration_seconds': ('histogram', "HTTP request latency by route."),
+    'pokedex_cache_requests_total': ('counter', "Cache lookups by namespace and result."),
+    'pokedex_response_cache_requests_total': ('counter', "Rendered-response cache lookups by route and result."),
+    'pokedex_upstream_requests_total': ('counter', "PokeAPI requests by endpoint and outcome."),
+    'pokedex_upstream_request_duration_seconds': ('histogram', "PokeAPI request latency by endpoint."),
+    'pokedex_detail_fanout_pending': ('gauge', "Detail requests queued or running in foreground fan-outs."),
+    'pokedex_foreground_fanouts': ('gauge', "Foreground detail fan-outs waiting on PokeAPI."),
+    'pokedex_prefetch_queue_depth': ('gauge', "Tasks waiting in the background prefetch queue."),
+}
+
+payload_logger = logging.getLogger('pokedex.payloads')
+
+_counters = {}
+_histograms = {}
+_gauges = {}
+_lock = threading.Lock()
+_last_flush = [0.0]
+
+
+def _labels(labels: Dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            # One counter per bucket plus +Inf, then the sum of observations
+            histogram = _histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram[i] += 1
+                break
+        else:
+            histogram[len(LATENCY_BUCKETS)] += 1
+        histogram[-1] += value
+
+
+def register_gauge(name: str, sample: Callable[[], float]) -> None:
+    """Sample a gauge from this process with `sample()` at flush and scrape time."""
+    _gauges[name] = sample
+
+
+def record_cache(namespace: str, hit: bool, count: int = 1) -> None:
+    if count:
+        inc('pokedex_cache_requests_total', count, namespace=namespace, result='hit' if hit else 'miss')
+
+
+def record_request(route: str, method: str, status_code: int, duration: float) -> None:
+    inc('pokedex_http_requests_total', route=route, method=method, status=status_code)
+    observe('pokedex_http_request_duration_seconds', duration, route=route)
+    maybe_flush()
+
+
+def record_upstream(endpoint: str, outcome: str, duration: float) -> None:
+    inc('pokedex_upstream_requests_total', endpoint=endpoint, outcome=outcome)
+    observe('pokedex_upstream_request_duration_seconds', duration, endpoint=endpoint)
+
+
+def log_payload(message: str, *args) -> None:
+    """Log a payload-sized message on the sampled debug channel; formatting only happens when emitted."""
+    if payload_logger.isEnabledFor(logging.DEBUG) and random.random() < PAYLOAD_LOG_SAMPLE_RATE:
+        payload_logger.debug(message, *args)
+
+
+def _metrics_dir():
+    return getattr(settings, 'POKEDEX_METRICS_DIR', None)
+
+
+def _snapshot() -> Dict:
+    with _lock:
+        counters = [[name, list(labels), value] for (name, labels), value in _counters.items()]
+        histograms = [[name, list(labels), list(values)] for (name, labels), values in _histograms.items()]
+    gauges = {}
+    for name, sample in _gauges.items():
+        try:
+            gauges[name] = sample()
+        except Exception:
+            pass
+    return {'pid': os.getpid(), 'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+
+def flush() -> None:
+    """Write this process's registry to the shared metrics directory, if one is configured."""
+    directory = _metrics_dir()
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_snapshot(), f)
+    os.replace(tmp_path, path)
+    _last_flush[0] = time.monotonic()
+
+
+def maybe_flush() -> None:
+    if _metrics_dir() and time.monotonic() - _last_flush[0] >= METRICS_FLUSH_INTERVAL:
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _snapshots() -> List[Dict]:
+    directory = _metrics_dir()
+    if not directory:
+        return [_snapshot()]
+    flush()
+    snapshots = []
+    for filename in os.listdir(directory):
+        if not (filename.startswith('metrics_') and filename.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def collect() -> Dict:
+    """Counters, histograms and gauges summed over every process that reported."""
+    counters, histograms, gauges = {}, {}, {}
+    for snapshot in _snapshots():
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [0] * len(values))
+            histograms[key] = [a + b for a, b in zip(merged, values)]
+        if snapshot['pid'] == os.getpid() or _process_alive(snapshot['pid']):
+            for name, value in snapshot['gauges'].items():
+                gauges[name] = gauges.get(name, 0) + value
+    return {'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def render() -> str:
+    """The aggregated metrics in the Prometheus text exposition format."""
+    collected = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'counter':
+            for (metric, labels), value in sorted(collected['counters'].items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        elif kind == 'histogram':
+            for (metric, labels), values in sorted(collected['histograms'].items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), values):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', str(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-1]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        elif name in collected['gauges']:
+            lines.append(f"{name} {collected['gauges'][name]}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,98 @@
+import os
+import re
+import time
+import random
+import cProfile
+from django.conf import settings
+from . import metrics, timing
+import logging
+
+PROFILE_HEADER = 'HTTP_X_POKEDEX_PROFILE'
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Record latency and status of every request under its URL route pattern."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else 'unmatched'
+        metrics.record_request(route, request.method, response.status_code, time.perf_counter() - start)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Report the request's timing spans (see myapp/timing.py) in a Server-Timing header.
+    Disabled with POKEDEX_SERVER_TIMING = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'POKEDEX_SERVER_TIMING', True):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        token = timing.start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            spans = timing.stop_recording(token)
+        response['Server-Timing'] = timing.server_timing_header(spans, time.perf_counter() - start)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in cProfile capture of single requests, for offline flame graphs.
+
+    A request is profiled when a staff user sends `X-Pokedex-Profile: 1`,
+    or at random with probability POKEDEX_PROFILE_SAMPLE_RATE. The stats
+    are written to POKEDEX_PROFILE_DIR and the file name is returned in
+    the X-Pokedex-Profile response header. Only the request thread is
+    profiled; time in the detail fan-out shows up as waiting on futures.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _wants_profile(self, request) -> bool:
+        if request.META.get(PROFILE_HEADER) == '1' and request.user.is_staff:
+            return True
+        sample_rate = getattr(settings, 'POKEDEX_PROFILE_SAMPLE_RATE', 0.0)
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def __call__(self, request):
+        directory = getattr(settings, 'POKEDEX_PROFILE_DIR', None)
+        if not directory or not self._wants_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already running in this process
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+
+        path = re.sub(r'[^a-zA-Z0-9]+', '_', request.path).strip('_') or 'root'
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}_{request.method}_{path}_{os.getpid()}.prof"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(directory, filename))
+            response['X-Pokedex-Profile'] = filename
+        except OSError as e:
+            logger.warning(f"Failed to write profile {filename}: {str(e)}")
+        return response
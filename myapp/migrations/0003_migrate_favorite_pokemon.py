@@ -0,0 +1,46 @@
+# Generated by Django 4.2.20 on 2026-10-19 05:46
+
+from django.db import migrations
+
+
+def copy_json_favorites_to_table(apps, schema_editor):
+    """Move each profile's favorite_pokemon JSON list into FavoritePokemon rows, keeping order."""
+    UserProfile = apps.get_model('myapp', 'UserProfile')
+    FavoritePokemon = apps.get_model('myapp', 'FavoritePokemon')
+
+    rows = []
+    for profile in UserProfile.objects.iterator():
+        seen = set()
+        for name in profile.favorite_pokemon or []:
+            pokemon_name = str(name).strip().lower()
+            if pokemon_name and pokemon_name not in seen:
+                seen.add(pokemon_name)
+                rows.append(FavoritePokemon(user_id=profile.user_id, pokemon_name=pokemon_name))
+    FavoritePokemon.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+def copy_table_favorites_to_json(apps, schema_editor):
+    UserProfile = apps.get_model('myapp', 'UserProfile')
+    FavoritePokemon = apps.get_model('myapp', 'FavoritePokemon')
+
+    favorites = {}
+    for user_id, pokemon_name in FavoritePokemon.objects.order_by('created_at', 'id').values_list('user_id', 'pokemon_name'):
+        favorites.setdefault(user_id, []).append(pokemon_name)
+    for profile in UserProfile.objects.filter(user_id__in=favorites):
+        profile.favorite_pokemon = favorites[profile.user_id]
+        profile.save(update_fields=['favorite_pokemon'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0002_favoritepokemon'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_json_favorites_to_table, copy_table_favorites_to_json),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='favorite_pokemon',
+        ),
+    ]
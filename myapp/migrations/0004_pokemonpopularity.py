@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-19 05:46
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_popularity(apps, schema_editor):
+    FavoritePokemon = apps.get_model('myapp', 'FavoritePokemon')
+    PokemonPopularity = apps.get_model('myapp', 'PokemonPopularity')
+
+    counts = FavoritePokemon.objects.values('pokemon_name').annotate(total=Count('id'))
+    PokemonPopularity.objects.bulk_create(
+        [PokemonPopularity(pokemon_name=row['pokemon_name'], favorite_count=row['total']) for row in counts],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0003_migrate_favorite_pokemon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PokemonPopularity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pokemon_name', models.CharField(max_length=100, unique=True)),
+                ('favorite_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-favorite_count', 'pokemon_name'], name='popularity_leaderboard_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_popularity, migrations.RunPython.noop),
+    ]
@@ -7,17 +7,55 @@ from django.dispatch import receiver
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
-    favorite_pokemon = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username}'s profile"
 
-# Signal to automatically create/update UserProfile when User is created/updated
+    @property
+    def favorite_pokemon(self):
+        """Favorite Pokémon names in the order they were added."""
+        return list(self.user.favorites.values_list('pokemon_name', flat=True))
+
+
+class FavoritePokemon(models.Model):
+    """
+    One row per (user, Pokémon) favorite.
+    The unique constraint doubles as the index for per-user lookups.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='favorites')
+    pokemon_name = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('created_at', 'id')
+        constraints = [
+            models.UniqueConstraint(fields=('user', 'pokemon_name'), name='unique_user_favorite_pokemon'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} ♥ {self.pokemon_name}"
+
+class PokemonPopularity(models.Model):
+    """
+    Incrementally maintained favorite counter per Pokémon.
+    The (-favorite_count, pokemon_name) index keeps the leaderboard an ordered index scan.
+    """
+    pokemon_name = models.CharField(max_length=100, unique=True)
+    favorite_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('-favorite_count', 'pokemon_name'), name='popularity_leaderboard_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.pokemon_name}: {self.favorite_count}"
+
+# Signal to automatically create UserProfile when User is created
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
+def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
-    else:
-        instance.profile.save()
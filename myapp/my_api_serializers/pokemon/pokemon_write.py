@@ -0,0 +1,42 @@
+"""
+Write serializers for Pokemon API requests.
+
+These serializers validate request bodies sent by the frontend
+before they reach the Pokemon endpoints.
+"""
+
+from rest_framework import serializers
+from myapp.api_integrations.pokemon.pokemon_api import BATCH_MAX_ITEMS
+from myapp.analysis import TEAM_MAX_SIZE
+
+
+class PokemonBatchWriteSerializer(serializers.Serializer):
+    """
+    Serializer for batch detail requests.
+    Accepts a list of Pokémon names or numeric IDs.
+    """
+    pokemon = serializers.ListField(
+        child=serializers.CharField(max_length=100, allow_blank=True),
+        allow_empty=False,
+        max_length=BATCH_MAX_ITEMS,
+        error_messages={
+            'empty': 'At least one Pokémon name or ID is required.',
+            'max_length': f'At most {BATCH_MAX_ITEMS} Pokémon can be requested at once.'
+        }
+    )
+
+
+class TeamAnalyzeWriteSerializer(serializers.Serializer):
+    """
+    Serializer for team analysis requests.
+    Accepts up to six Pokémon names or numeric IDs.
+    """
+    team = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        allow_empty=False,
+        max_length=TEAM_MAX_SIZE,
+        error_messages={
+            'empty': 'A team needs at least one Pokémon.',
+            'max_length': f'A team has at most {TEAM_MAX_SIZE} Pokémon.'
+        }
+    )
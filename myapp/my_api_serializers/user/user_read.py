@@ -3,11 +3,18 @@ from django.contrib.auth.models import User
 from myapp.models import UserProfile
 
 class UserProfileReadSerializer(serializers.ModelSerializer):
+    favorite_pokemon = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfile
         fields = ('favorite_pokemon', 'created_at', 'updated_at')
         read_only_fields = ('created_at', 'updated_at')
 
+    def get_favorite_pokemon(self, profile):
+        # Callers that loaded the names along with the profile pass them in
+        names = self.context.get('favorite_pokemon')
+        return names if names is not None else profile.favorite_pokemon
+
 class UserReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -2,6 +2,9 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from myapp.favorites import update_favorites
+from myapp.api_integrations.pokemon.pokemon_api import BATCH_MAX_ITEMS
 
 class UserRegisterWriteSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
@@ -90,15 +93,33 @@ class UserRegisterWriteSerializer(serializers.ModelSerializer):
         # Set username to email
         validated_data['username'] = validated_data['email']
         
-        # Create user
-        user = User.objects.create_user(**validated_data)
-        
-        # Update profile with favorite pokemon list
-        user.profile.favorite_pokemon = favorite_pokemon
-        user.profile.save()
+        # Create the user and the initial favorite pokemon list together; the
+        # favorites page is hydrated on first read rather than during signup
+        with transaction.atomic():
+            user = User.objects.create_user(**validated_data)
+            update_favorites(user, add=favorite_pokemon, hydrate=False)
         
         return user
 
 class UserLoginWriteSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
+
+class FavoritePokemonBulkWriteSerializer(serializers.Serializer):
+    add = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        required=False,
+        default=list,
+        max_length=BATCH_MAX_ITEMS
+    )
+    remove = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        required=False,
+        default=list,
+        max_length=BATCH_MAX_ITEMS
+    )
+
+    def validate(self, attrs):
+        if not attrs['add'] and not attrs['remove']:
+            raise serializers.ValidationError("Provide at least one Pokémon to add or remove.")
+        return attrs
@@ -0,0 +1,75 @@
+"""
+Per-Pokémon favorite counters and the "most favorited" leaderboard.
+
+Counters in PokemonPopularity are adjusted inside the same transaction
+that adds or removes FavoritePokemon rows, so they never need a scan of
+the favorites table. The leaderboard is a short index scan over
+(-favorite_count, pokemon_name), snapshotted in the cache.
+"""
+
+from typing import Dict, List
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from .models import FavoritePokemon, PokemonPopularity
+from . import metrics
+import logging
+
+POPULAR_MAX_LIMIT = 100
+POPULAR_CACHE_KEY = "popular_pokemon_top"
+POPULAR_CACHE_TIMEOUT = 60  # seconds, counters change on every favorite toggle
+
+logger = logging.getLogger(__name__)
+
+
+def record_favorite_changes(added: List[str], removed: List[str]) -> None:
+    """
+    Adjust the counters for names that were just favorited or unfavorited.
+    Must be called inside the transaction that changed FavoritePokemon.
+    """
+    if added:
+        PokemonPopularity.objects.bulk_create(
+            [PokemonPopularity(pokemon_name=name) for name in added],
+            ignore_conflicts=True
+        )
+        PokemonPopularity.objects.filter(pokemon_name__in=added).update(
+            favorite_count=F('favorite_count') + 1
+        )
+    if removed:
+        PokemonPopularity.objects.filter(pokemon_name__in=removed, favorite_count__gt=0).update(
+            favorite_count=F('favorite_count') - 1
+        )
+
+
+def top_favorited(limit: int = 10) -> List[Dict]:
+    """Return the most favorited Pokémon as [{'name', 'favorite_count'}], highest first."""
+    top = cache.get(POPULAR_CACHE_KEY)
+    metrics.record_cache('popular', top is not None)
+    if top is None:
+        top = [
+            {'name': name, 'favorite_count': count}
+            for name, count in PokemonPopularity.objects
+            .filter(favorite_count__gt=0)
+            .order_by('-favorite_count', 'pokemon_name')
+            .values_list('pokemon_name', 'favorite_count')[:POPULAR_MAX_LIMIT]
+        ]
+        cache.set(POPULAR_CACHE_KEY, top, POPULAR_CACHE_TIMEOUT)
+    return top[:limit]
+
+
+def rebuild_popularity() -> int:
+    """
+    Recompute every counter from the FavoritePokemon table.
+    Returns the number of Pokémon with at least one favorite.
+    """
+    counts = FavoritePokemon.objects.values('pokemon_name').annotate(total=Count('id'))
+    with transaction.atomic():
+        PokemonPopularity.objects.all().delete()
+        PokemonPopularity.objects.bulk_create(
+            [PokemonPopularity(pokemon_name=row['pokemon_name'], favorite_count=row['total']) for row in counts],
+            batch_size=1000
+        )
+        rebuilt = PokemonPopularity.objects.count()
+    cache.delete(POPULAR_CACHE_KEY)
+    logger.info(f"Rebuilt popularity counters for {rebuilt} Pokémon")
+    return rebuilt
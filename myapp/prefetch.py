@@ -0,0 +1,98 @@
+"""
+Opt-in background prefetching of likely-next Pokémon data.
+
+After a pokemon_list page is served, the next page's details and the
+evolution chains of both pages are queued for warming; after a detail
+view, that Pokémon's evolution chain. A single low-priority worker
+drains a bounded queue: work already queued or in flight is deduplicated,
+the queue drops new work when full, and the worker pauses whenever a
+foreground request is fanning out to PokeAPI.
+
+Enabled with POKEDEX_PREFETCH_ENABLED = True in settings.
+"""
+
+import queue
+import threading
+import time
+from typing import Iterable
+from django.conf import settings
+from .api_integrations.pokemon.pokemon_api import (
+    fetch_pokemon_detail,
+    fetch_pokemon_evolution_chain,
+    foreground_fanouts_active
+)
+from . import metrics
+import logging
+
+PREFETCH_QUEUE_SIZE = 64
+PREFETCH_PAUSE = 0.05  # seconds between prefetches, and while foreground work is running
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+_pending = set()
+_pending_lock = threading.Lock()
+_worker = None
+
+
+def prefetch_enabled() -> bool:
+    return getattr(settings, 'POKEDEX_PREFETCH_ENABLED', False)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        with _pending_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(target=_run, name='pokedex-prefetch', daemon=True)
+                _worker.start()
+
+
+def _schedule(task) -> bool:
+    with _pending_lock:
+        if task in _pending:
+            return False
+        try:
+            _queue.put_nowait(task)
+        except queue.Full:
+            return False
+        _pending.add(task)
+    return True
+
+
+def _run() -> None:
+    while True:
+        task = _queue.get()
+        try:
+            # Never compete with requests that are waiting on PokeAPI
+            while foreground_fanouts_active():
+                time.sleep(PREFETCH_PAUSE)
+
+            kind, key = task
+            if kind == 'detail':
+                fetch_pokemon_detail(key)
+            elif kind == 'evolution':
+                fetch_pokemon_evolution_chain(key)
+        except Exception as e:
+            logger.warning(f"Prefetch of {task} failed: {str(e)}")
+        finally:
+            with _pending_lock:
+                _pending.discard(task)
+            _queue.task_done()
+        time.sleep(PREFETCH_PAUSE)
+
+
+def prefetch(detail_urls: Iterable[str] = (), evolution_names: Iterable[str] = ()) -> int:
+    """Queue details and evolution chains for background warming. Returns how many were queued."""
+    if not prefetch_enabled():
+        return 0
+    _ensure_worker()
+    tasks = [('detail', url) for url in detail_urls] + [('evolution', name) for name in evolution_names]
+    return sum(_schedule(task) for task in tasks)
+
+
+def queue_depth() -> int:
+    return _queue.qsize()
+
+
+metrics.register_gauge('pokedex_prefetch_queue_depth', queue_depth)
@@ -0,0 +1,158 @@
+"""
+JSON rendering with pre-encoded per-Pokémon fragments.
+
+A Pokémon's entry only changes when the dataset does, so its JSON
+members are encoded once per dataset version and kept in a process-local
+table. Views put PreEncoded objects in their response data and
+PokemonJSONRenderer splices the stored bytes into the envelope instead
+of re-encoding every dict on every response.
+"""
+
+import json
+import threading
+from typing import Dict, List
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+from . import timing
+
+FRAGMENT_CACHE_MAX_ENTRIES = 8192
+
+_fragments = {}
+_fragments_version = None
+_fragments_lock = threading.Lock()
+
+# Same options as DRF's JSONRenderer defaults: compact, unicode, no NaN.
+# Built once: constructing an encoder per call costs more than encoding
+# a small value.
+_encoder = encoders.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+
+
+def _dumps(value) -> bytes:
+    encoded = _encoder.encode(value)
+    return encoded.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class PreEncoded:
+    """A JSON object whose members are already encoded to bytes."""
+    __slots__ = ('members',)
+
+    def __init__(self, members: bytes):
+        self.members = members
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PreEncoded':
+        return cls(_dumps(data)[1:-1])
+
+    def prepend(self, **fields) -> 'PreEncoded':
+        """A new object with `fields` encoded in front of the existing members."""
+        head = _dumps(fields)[1:-1]
+        if not self.members:
+            return PreEncoded(head)
+        return PreEncoded(head + b',' + self.members if head else self.members)
+
+    def encode(self) -> bytes:
+        return b'{' + self.members + b'}'
+
+
+def pokemon_fragments(entries: List[Dict]) -> List[PreEncoded]:
+    """
+    Return the pre-encoded form of Pokémon entries ({'name', 'sprite', ...}).
+    Fragments are stored per name and field set for the current dataset
+    version, together with the values they were encoded from, and only
+    reused while the entry still has those values, so a refetched detail
+    never serves stale bytes. Entries from a failed upstream fetch (no
+    sprite) are encoded but never stored.
+    """
+    global _fragments_version
+    from .dataset import get_dataset_version
+
+    version = get_dataset_version()
+    if _fragments_version != version:
+        with _fragments_lock:
+            _fragments.clear()
+            _fragments_version = version
+
+    fragments = []
+    for entry in entries:
+        key = (entry.get('name'), *entry)
+        values = tuple(entry.values())
+        stored = _fragments.get(key)
+        # Tuple equality compares the nested lists and dicts in C, far
+        # cheaper than hashing or re-encoding the entry
+        if stored is not None and stored[0] == values:
+            fragments.append(stored[1])
+            continue
+        fragment = PreEncoded.from_dict(entry)
+        if entry.get('sprite') is not None:
+            if len(_fragments) >= FRAGMENT_CACHE_MAX_ENTRIES:
+                _fragments.clear()
+            _fragments[key] = (values, fragment)
+        fragments.append(fragment)
+    return fragments
+
+
+def pokemon_fragment(entry: Dict) -> PreEncoded:
+    return pokemon_fragments([entry])[0]
+
+
+def _has_fragments(value) -> bool:
+    return isinstance(value, PreEncoded) or (
+        isinstance(value, (list, tuple)) and any(isinstance(item, PreEncoded) for item in value)
+    )
+
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, PreEncoded):
+        return value.encode()
+    if isinstance(value, (list, tuple)) and any(isinstance(item, PreEncoded) for item in value):
+        return b'[' + b','.join(_encode_value(item) for item in value) + b']'
+    return _dumps(value)
+
+
+def contains_fragments(data) -> bool:
+    """Fragments are only looked for in top-level values and top-level lists."""
+    values = data.values() if isinstance(data, dict) else [data]
+    return any(_has_fragments(value) for value in values)
+
+
+def encode_json(data) -> bytes:
+    """Encode response data to JSON bytes, splicing in any PreEncoded values."""
+    if not isinstance(data, dict):
+        return _encode_value(data)
+    # Consecutive plain members are encoded together, one call per run
+    members, plain = [], {}
+    for key, value in data.items():
+        if not _has_fragments(value):
+            plain[key] = value
+            continue
+        if plain:
+            members.append(_dumps(plain)[1:-1])
+            plain = {}
+        members.append(_dumps(str(key)) + b':' + _encode_value(value))
+    if plain:
+        members.append(_dumps(plain)[1:-1])
+    return b'{' + b','.join(members) + b'}'
+
+
+class PokemonJSONRenderer(JSONRenderer):
+    """JSONRenderer that understands PreEncoded fragments."""
+
+    @timing.span('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not contains_fragments(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # Pretty-printing (e.g. the browsable API) goes through the regular path
+            return super().render(_decode_fragments(data), accepted_media_type, renderer_context)
+        return encode_json(data)
+
+
+def _decode_fragments(data):
+    if isinstance(data, PreEncoded):
+        return json.loads(data.encode())
+    if isinstance(data, dict):
+        return {key: _decode_fragments(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_decode_fragments(item) for item in data]
+    return data
@@ -0,0 +1,129 @@
+"""
+Cache of fully rendered response bodies.
+
+Entries hold the final encoded JSON bytes for a route and a normalized
+set of query parameters, keyed on the dataset version so a catalog
+refresh invalidates them all. A hit is one cache lookup and no JSON
+encoding. Hits and misses are counted per route in the metrics registry.
+
+Next to the raw bytes an entry stores compressed variants (gzip, and
+Brotli when the optional `brotli` package is installed). Each variant
+is produced the first time a client asks for that encoding and then
+served precompressed.
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Iterable, Optional, Tuple
+from django.core.cache import cache
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+RESPONSE_CACHE_TIMEOUT = 3600  # 1 hour, same as the base list
+# Opaque tokens whose case carries meaning; every other value is case-folded
+CASE_SENSITIVE_PARAMS = ('cursor',)
+
+# Compression settings
+COMPRESSION_MIN_SIZE = 512  # bytes, smaller bodies aren't worth a variant
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def normalize_value(name: str, value: str) -> str:
+    """A query value stripped, and lowercased unless it is an opaque token."""
+    value = value.strip()
+    return value if name in CASE_SENSITIVE_PARAMS else value.lower()
+
+
+def normalize_params(query, params: Iterable[str]) -> tuple:
+    """The (name, value) pairs that identify a response, normalized with normalize_value()."""
+    return tuple((name, normalize_value(name, query.get(name, ''))) for name in params)
+
+
+def response_cache_key(route: str, normalized: tuple, version: int) -> str:
+    digest = hashlib.sha1(repr(normalized).encode()).hexdigest()
+    return f"response_{route}_{version}_{digest}"
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best content coding we support from an Accept-Encoding header."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+
+    for coding in supported_encodings():
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _variant(cache_key: str, entry: Dict, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Return (body, content coding) for an entry, compressing and storing the variant once."""
+    if encoding is None or len(entry['body']) < COMPRESSION_MIN_SIZE:
+        return entry['body'], None
+    if encoding not in entry:
+        entry[encoding] = compress(entry['body'], encoding)
+        cache.set(cache_key, entry, RESPONSE_CACHE_TIMEOUT)
+    return entry[encoding], encoding
+
+
+def get_cached_body(cache_key: str, encoding: Optional[str] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Return (body, content coding) for a cached response, or None on a miss."""
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None
+    return _variant(cache_key, entry, encoding)
+
+
+def set_cached_body(cache_key: str, body: bytes, encoding: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+    """Store a rendered body and return it in the requested encoding."""
+    entry = {'body': body}
+    cache.set(cache_key, entry, RESPONSE_CACHE_TIMEOUT)
+    return _variant(cache_key, entry, encoding)
+
+
+def record_lookup(route: str, hit: bool) -> None:
+    metrics.record_cache('response', hit)
+    metrics.inc('pokedex_response_cache_requests_total', route=route, result='hit' if hit else 'miss')
+
+
+def response_cache_stats() -> Dict[str, Dict]:
+    """Hits, misses and hit rate for every route that has used the response cache."""
+    counts = {}
+    for (name, labels), value in metrics.collect()['counters'].items():
+        if name == 'pokedex_response_cache_requests_total':
+            labels = dict(labels)
+            counts.setdefault(labels['route'], {'hit': 0, 'miss': 0})[labels['result']] += value
+
+    stats = {}
+    for route in sorted(counts):
+        hits, misses = int(counts[route]['hit']), int(counts[route]['miss'])
+        total = hits + misses
+        stats[route] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return stats
@@ -1,3 +1,734 @@
+import base64
+import json
+from unittest import mock
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
 from django.test import TestCase
+from django.urls import reverse
+from .api_integrations.pokemon.pokemon_api import BASE_URL, POKEMON_URL, PokemonNotFound, fetch_pokemon_details_bulk
+from .analysis import aggregate, analyze_team
+from .analysis.similarity import SimilarityIndex
+from .analysis.typechart import TYPE_INDEX, build_effectiveness_matrix
+from .catalog import bitmap
+from .catalog.columns import NUMERIC_COLUMNS
+from .catalog.filters import FilterUnavailable, InvalidFilter, normalize_filters, resolve_filters
+from .catalog.index import CatalogIndex
+from .catalog.pagination import InvalidCursor, encode_cursor, decode_cursor, page_after
+from .catalog.refresh import RefreshError, get_catalog_snapshot, refresh_catalog
+from .dataset import get_dataset_version
+from .favorites import update_favorites, favorite_names
+from .models import PokemonPopularity
+from . import metrics
 
-# Create your tests here.
+
+def sprite(pokemon_id: int) -> str:
+    return f"https://sprites.example/{pokemon_id}.png"
+
+
+class FakePokeAPI:
+    """
+    Stands in for _make_http_request: serves payloads by URL, answers 404
+    for unknown URLs and fails the URLs in `failing`, as a timeout would.
+    """
+
+    def __init__(self, payloads: dict):
+        self.payloads = payloads
+        self.failing = set()
+
+    def __call__(self, url, raise_not_found=False):
+        if url in self.failing:
+            return None
+        if url not in self.payloads:
+            if raise_not_found:
+                raise PokemonNotFound(url)
+            return None
+        return self.payloads[url]
+
+
+def pokemon_payload(pokemon_id: int, name: str, types=('normal',)) -> dict:
+    return {
+        'id': pokemon_id,
+        'name': name,
+        'sprites': {'front_default': sprite(pokemon_id)},
+        'types': [{'slot': slot, 'type': {'name': t}} for slot, t in enumerate(types, 1)],
+        'abilities': [],
+        'height': 10,
+        'weight': 100,
+        'stats': [],
+        'species': {'name': name},
+    }
+
+
+def species_payload(name: str, chain_id: int, default: tuple, generation: int = 3,
+                    legendary: bool = False, mythical: bool = False) -> dict:
+    default_id, default_name = default
+    return {
+        'name': name,
+        'generation': {'url': f"{BASE_URL}/generation/{generation}/"},
+        'is_legendary': legendary,
+        'is_mythical': mythical,
+        'evolution_chain': {'url': f"{BASE_URL}/evolution-chain/{chain_id}/"},
+        'varieties': [{'is_default': True, 'pokemon': {'name': default_name, 'url': f"{POKEMON_URL}/{default_id}/"}}],
+    }
+
+
+def chain_payload(*names) -> dict:
+    node = None
+    for name in reversed(names):
+        node = {'species': {'name': name}, 'evolves_to': [node] if node else []}
+    return {'chain': node}
+
+
+# name: (id, types)
+POKEMON = {
+    'bulbasaur': (1, [45, 49, 49, 65, 65, 45, 7, 69], ['grass', 'poison'], (1, False, False, 1)),
+    'ivysaur': (2, [60, 62, 63, 80, 80, 60, 10, 130], ['grass', 'poison'], (1, False, False, 1)),
+    'charmander': (4, [39, 52, 43, 60, 50, 65, 6, 85], ['fire'], (1, False, False, 2)),
+    'charizard': (6, [78, 84, 78, 109, 85, 100, 17, 905], ['fire', 'flying'], (1, False, False, 2)),
+    'mewtwo': (150, [106, 110, 90, 154, 90, 130, 20, 1220], ['psychic'], (1, True, False, 63)),
+    'mew': (151, [100, 100, 100, 100, 100, 100, 4, 40], ['psychic'], (1, False, True, 64)),
+    'chikorita': (152, [45, 49, 65, 49, 65, 45, 9, 64], ['grass'], (2, False, False, 79)),
+}
+
+
+def pokemon_url(name: str) -> str:
+    return f"{POKEMON_URL}/{POKEMON[name][0]}/"
+
+
+def build_catalog(version: int = 1) -> CatalogIndex:
+    entries = [{'name': name, 'url': pokemon_url(name)} for name in POKEMON]
+    snapshot = {
+        'columns': {name: row for name, (_, row, _, _) in POKEMON.items()},
+        'traits': {name: [types, []] for name, (_, _, types, _) in POKEMON.items()},
+        'species': {
+            name: {'generation': generation, 'is_legendary': legendary, 'is_mythical': mythical, 'chain_id': chain_id}
+            for name, (_, _, _, (generation, legendary, mythical, chain_id)) in POKEMON.items()
+        },
+    }
+    return CatalogIndex(entries, version, snapshot)
+
+
+def pokemon_detail(url: str, sprite: bool = True) -> dict:
+    name = next(name for name in POKEMON if pokemon_url(name) == url)
+    return {
+        'id': POKEMON[name][0],
+        'sprite': f"https://sprites.example/{name}.png" if sprite else None,
+        'types': POKEMON[name][2],
+        'abilities': [],
+        'height': POKEMON[name][1][6],
+        'weight': POKEMON[name][1][7],
+        'stats': {},
+    }
+
+
+def names(catalog, matches: int) -> list:
+    return [catalog.names[position] for position in bitmap.iter_positions(matches)]
+
+
+class EvolutionExpandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.upstream = FakePokeAPI({
+            f"{BASE_URL}/pokemon-species/deoxys": species_payload('deoxys', 202, (386, 'deoxys-normal')),
+            f"{BASE_URL}/evolution-chain/202/": chain_payload('deoxys'),
+            f"{POKEMON_URL}/386/": pokemon_payload(386, 'deoxys-normal', ['psychic']),
+            f"{BASE_URL}/pokemon-species/budew": species_payload('budew', 204, (406, 'budew')),
+            f"{BASE_URL}/pokemon-species/roselia": species_payload('roselia', 204, (315, 'roselia')),
+            f"{BASE_URL}/evolution-chain/204/": chain_payload('budew', 'roselia', 'roserade'),
+            f"{POKEMON_URL}/406/": pokemon_payload(406, 'budew', ['grass']),
+            f"{POKEMON_URL}/315/": pokemon_payload(315, 'roselia', ['grass']),
+        })
+        for target, kwargs in (
+            ('myapp.api_integrations.pokemon.pokemon_api._make_http_request', {'new': self.upstream}),
+            ('myapp.catalog.get_catalog', {'return_value': None}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get(self, name):
+        return self.client.get(reverse('pokemon-evolution-chain', args=[name]) + '?expand=details')
+
+    def test_resolves_species_through_default_variety(self):
+        response = self.get('deoxys')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['details']['sprite'], sprite(386))
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_missing_pokemon_keeps_chain_cacheable(self):
+        # roserade's species is unknown upstream: a permanent gap, not a failure
+        response = self.get('budew')
+        chain = response.json()
+        self.assertEqual(chain['evolves_to'][0]['details']['sprite'], sprite(315))
+        self.assertIsNone(chain['evolves_to'][0]['evolves_to'][0]['details'])
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_failed_fetch_is_not_stored(self):
+        self.upstream.failing.add(f"{POKEMON_URL}/315/")
+        response = self.get('budew')
+        self.assertIsNone(response.json()['evolves_to'][0]['details'])
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIn('no-store', response['Cache-Control'])
+
+        self.upstream.failing.clear()
+        response = self.get('budew')
+        self.assertEqual(response.json()['evolves_to'][0]['details']['sprite'], sprite(315))
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_unknown_and_unavailable_species(self):
+        self.assertEqual(self.get('missingno').status_code, 404)
+        self.upstream.failing.add(f"{BASE_URL}/pokemon-species/deoxys")
+        self.assertEqual(self.get('deoxys').status_code, 502)
+
+
+class DetailsBulkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.catalog = build_catalog()
+        self.upstream = FakePokeAPI({
+            pokemon_url(name): pokemon_payload(pokemon_id, name, types)
+            for name, (pokemon_id, _, types, _) in POKEMON.items()
+        })
+        for target, kwargs in (
+            ('myapp.api_integrations.pokemon.pokemon_api._make_http_request', {'new': self.upstream}),
+            ('myapp.catalog.get_catalog', {'return_value': self.catalog}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def detail_lookups(self):
+        return {
+            result: metrics._counters.get(
+                ('pokedex_cache_requests_total', (('namespace', 'pokemon_detail'), ('result', result))), 0
+            )
+            for result in ('hit', 'miss')
+        }
+
+    def test_each_lookup_counted_once(self):
+        before = self.detail_lookups()
+        fetch_pokemon_details_bulk(['bulbasaur', 'charmander'])
+        fetch_pokemon_details_bulk(['bulbasaur', 'charmander'])
+        after = self.detail_lookups()
+        self.assertEqual(after['miss'] - before['miss'], 2)
+        self.assertEqual(after['hit'] - before['hit'], 2)
+
+    def test_cache_hits_skip_upstream(self):
+        fetch_pokemon_details_bulk(['bulbasaur'])
+        self.upstream.failing.update(self.upstream.payloads)
+        details = fetch_pokemon_details_bulk(['bulbasaur', 'charmander'])
+        self.assertEqual(details['bulbasaur']['sprite'], sprite(1))
+        self.assertIsNone(details['charmander']['sprite'])
+
+    def test_names_and_ids_read_the_list_cache_entry(self):
+        cache.set(f"pokemon_detail_{pokemon_url('charmander')}", pokemon_detail(pokemon_url('charmander')))
+        self.upstream.failing.update(self.upstream.payloads)
+        details = fetch_pokemon_details_bulk(['charmander', '4'])
+        self.assertEqual(details['charmander']['types'], ['fire'])
+        self.assertEqual(details['4'], details['charmander'])
+
+    def test_batch_statuses(self):
+        self.upstream.failing.add(pokemon_url('mew'))
+        response = self.client.post(
+            reverse('pokemon-batch'), {'pokemon': ['bulbasaur', 'missingno', '??', 'mew']}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['status'] for item in response.json()['results']],
+            ['ok', 'not_found', 'invalid', 'unavailable']
+        )
+
+    def test_catalog_fields_skip_upstream(self):
+        self.upstream.failing.update(self.upstream.payloads)
+        with mock.patch('myapp.views.get_catalog', return_value=self.catalog):
+            response = self.client.post(
+                reverse('pokemon-batch') + '?fields=name,id', {'pokemon': ['Charmander', '152', 'missingno']},
+                content_type='application/json'
+            )
+        self.assertEqual(response.json()['results'], [
+            {'query': 'Charmander', 'status': 'ok', 'name': 'charmander', 'id': 4},
+            {'query': '152', 'status': 'ok', 'name': 'chikorita', 'id': 152},
+            {'query': 'missingno', 'status': 'not_found'},
+        ])
+
+
+@mock.patch('myapp.favorites.fetch_pokemon_details_bulk', side_effect=lambda identifiers: {
+    identifier: {'sprite': f"https://sprites.example/{identifier}.png"} for identifier in identifiers
+})
+class FavoritesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ash', password='pikachu-123')
+        self.other = User.objects.create_user('misty', password='starmie-123')
+
+    def counts(self):
+        return dict(PokemonPopularity.objects.filter(favorite_count__gt=0).values_list('pokemon_name', 'favorite_count'))
+
+    def test_bulk_add_and_remove(self, fetch):
+        added, removed = update_favorites(self.user, add=['Pikachu', ' eevee ', 'pikachu'])
+        self.assertEqual((added, removed), (['pikachu', 'eevee'], []))
+        self.assertEqual(favorite_names(self.user), ['pikachu', 'eevee'])
+
+        added, removed = update_favorites(self.user, add=['eevee', 'mew'], remove=['pikachu', 'snorlax'])
+        self.assertEqual((added, removed), (['mew'], ['pikachu']))
+        self.assertEqual(favorite_names(self.user), ['eevee', 'mew'])
+
+    def test_counters_follow_changed_rows(self, fetch):
+        update_favorites(self.user, add=['pikachu', 'eevee'])
+        update_favorites(self.other, add=['pikachu'])
+        self.assertEqual(self.counts(), {'pikachu': 2, 'eevee': 1})
+
+        # Repeats and names that were never favorited change nothing
+        update_favorites(self.user, add=['pikachu'], remove=['snorlax'])
+        self.assertEqual(self.counts(), {'pikachu': 2, 'eevee': 1})
+
+        update_favorites(self.user, remove=['pikachu', 'eevee'])
+        update_favorites(self.user, remove=['pikachu'])
+        self.assertEqual(self.counts(), {'pikachu': 1})
+
+    def test_name_in_add_and_remove_is_added(self, fetch):
+        added, removed = update_favorites(self.user, add=['pikachu'], remove=['pikachu'])
+        self.assertEqual((added, removed), (['pikachu'], []))
+        self.assertEqual(self.counts(), {'pikachu': 1})
+
+    def test_register_stores_favorites_without_fetching(self, fetch):
+        response = self.client.post(reverse('register'), {
+            'email': 'brock@example.com', 'password': 'onix-rock-123', 'password2': 'onix-rock-123',
+            'favorite_pokemon': ['Onix', 'geodude'],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user']['profile']['favorite_pokemon'], ['onix', 'geodude'])
+        fetch.assert_not_called()
+        self.assertEqual(self.counts(), {'onix': 1, 'geodude': 1})
+
+    def test_register_rolls_back_when_favorites_fail(self, fetch):
+        with mock.patch('myapp.favorites.record_favorite_changes', side_effect=RuntimeError):
+            response = self.client.post(reverse('register'), {
+                'email': 'brock@example.com', 'password': 'onix-rock-123', 'password2': 'onix-rock-123',
+                'favorite_pokemon': ['onix'],
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(User.objects.filter(email='brock@example.com').exists())
+
+
+class ListCachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog = build_catalog()
+        patcher = mock.patch('myapp.views.get_catalog', return_value=catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('pokemon-list') + '?limit=3'
+
+    def get(self, sprite=True, **headers):
+        with mock.patch('myapp.views.fetch_multiple_pokemon_details',
+                        side_effect=lambda urls: [pokemon_detail(url, sprite) for url in urls]):
+            return self.client.get(self.url, **headers)
+
+    def test_revalidation_returns_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['name'] for p in response.json()['results']], ['bulbasaur', 'ivysaur', 'charmander'])
+        etag = response['ETag']
+
+        revalidated = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], etag)
+
+    def test_repeat_request_is_served_from_the_response_cache(self):
+        body = self.get().content
+        with mock.patch('myapp.views.fetch_multiple_pokemon_details', side_effect=AssertionError):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, body)
+
+        exposition = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('pokedex_response_cache_requests_total{result="hit",route="pokemon_list"}', exposition)
+
+    def test_degraded_response_is_not_stored(self):
+        response = self.get(sprite=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['results'][0]['sprite'])
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIn('no-store', response['Cache-Control'])
+
+        # Once upstream recovers the page is served fresh, then revalidates
+        recovered = self.get()
+        self.assertIsNotNone(recovered.json()['results'][0]['sprite'])
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=recovered['ETag']).status_code, 304)
+
+    def test_cursor_from_next_link(self):
+        next_url = self.get().json()['next']
+        self.url = reverse('pokemon-list') + next_url
+        response = self.get()
+        self.assertEqual([p['name'] for p in response.json()['results']], ['charizard', 'mewtwo', 'mew'])
+
+    def test_invalid_cursor_is_bad_request(self):
+        not_a_string = base64.urlsafe_b64encode(json.dumps({'k': ['x'], 'f': 'abc'}).encode()).decode()
+        for cursor in ('garbage', not_a_string):
+            with self.subTest(cursor=cursor):
+                self.url = reverse('pokemon-list') + f"?cursor={cursor}"
+                self.assertEqual(self.get().status_code, 400)
+
+    def test_sorted_pages_follow_the_column(self):
+        self.url = reverse('pokemon-list') + '?limit=2&sort=-attack'
+        first = self.get().json()
+        self.assertEqual([p['name'] for p in first['results']], ['mewtwo', 'mew'])
+        self.url = reverse('pokemon-list') + first['next']
+        self.assertEqual([p['name'] for p in self.get().json()['results']], ['charizard', 'ivysaur'])
+
+        self.url = reverse('pokemon-list') + '?sort=shininess'
+        self.assertEqual(self.get().status_code, 400)
+
+
+class CursorTests(TestCase):
+    def setUp(self):
+        self.catalog = build_catalog()
+
+    def test_round_trip(self):
+        cursor = encode_cursor('charmander', 'abc')
+        self.assertEqual(decode_cursor(cursor, 'abc'), 'charmander')
+
+    def test_continues_after_last_name(self):
+        last_name = decode_cursor(encode_cursor('ivysaur', 'abc'), 'abc')
+        positions, has_more = page_after(self.catalog, self.catalog.all, last_name, 2)
+        self.assertEqual([self.catalog.names[p] for p in positions], ['charmander', 'charizard'])
+        self.assertTrue(has_more)
+
+    def test_rejects_malformed_cursors(self):
+        not_a_string = base64.urlsafe_b64encode(json.dumps({'k': 1, 'f': 'abc'}).encode()).decode()
+        missing_key = base64.urlsafe_b64encode(json.dumps({'f': 'abc'}).encode()).decode()
+        for cursor in ('not base64!', 'bm90IGpzb24', not_a_string, missing_key):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, 'abc')
+
+    def test_rejects_cursor_from_other_filters(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor('charmander', 'abc'), 'def')
+
+    def test_rejects_unknown_last_name(self):
+        with self.assertRaises(InvalidCursor):
+            page_after(self.catalog, self.catalog.all, 'missingno', 2)
+
+
+class FilterTests(TestCase):
+    def setUp(self):
+        self.catalog = build_catalog()
+
+    def resolve(self, **query):
+        return names(self.catalog, resolve_filters(self.catalog, normalize_filters(query)))
+
+    def test_no_filters_match_everything(self):
+        self.assertEqual(self.resolve(), list(POKEMON))
+
+    def test_search_and_range(self):
+        self.assertEqual(self.resolve(search='char', min_attack='80'), ['charizard'])
+        self.assertEqual(self.resolve(min_speed='60', max_speed='100'), ['ivysaur', 'charmander', 'charizard', 'mew'])
+
+    def test_species_filters(self):
+        self.assertEqual(self.resolve(generation='1', legendary='true'), ['mewtwo'])
+        self.assertEqual(self.resolve(legendary='mythical'), ['mew'])
+        self.assertEqual(self.resolve(generation='2'), ['chikorita'])
+        self.assertEqual(self.resolve(family='charmander'), ['charmander', 'charizard'])
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_evolution_chain')
+    def test_family_outside_catalog_matches_nothing(self, fetch_pokemon_evolution_chain):
+        self.assertEqual(self.resolve(family='missingno'), [])
+        fetch_pokemon_evolution_chain.assert_not_called()
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_evolution_chain')
+    def test_family_without_species_index(self, fetch_pokemon_evolution_chain):
+        self.catalog = CatalogIndex(self.catalog.entries, 1)
+        fetch_pokemon_evolution_chain.return_value = {
+            'name': 'bulbasaur', 'evolves_to': [{'name': 'ivysaur', 'evolves_to': []}]
+        }
+        self.assertEqual(self.resolve(family='ivysaur'), ['bulbasaur', 'ivysaur'])
+
+        fetch_pokemon_evolution_chain.side_effect = PokemonNotFound('missingno')
+        with self.assertRaises(InvalidFilter):
+            self.resolve(family='missingno')
+
+        fetch_pokemon_evolution_chain.side_effect = None
+        fetch_pokemon_evolution_chain.return_value = None
+        with self.assertRaises(FilterUnavailable):
+            self.resolve(family='charmander')
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_by_type')
+    def test_type_with_species_and_range(self, fetch_pokemon_by_type):
+        fetch_pokemon_by_type.return_value = ['bulbasaur', 'ivysaur', 'chikorita', 'not-in-catalog']
+        self.assertEqual(self.resolve(type='grass', generation='1', min_hp='50'), ['ivysaur'])
+        self.assertEqual(self.resolve(type='Grass '), ['bulbasaur', 'ivysaur', 'chikorita'])
+        # Memoized per catalog
+        fetch_pokemon_by_type.assert_called_once_with('grass')
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_by_type', return_value=None)
+    def test_unavailable_upstream_filter(self, fetch_pokemon_by_type):
+        with self.assertRaises(FilterUnavailable):
+            self.resolve(type='grass')
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_by_move')
+    def test_move_without_learnsets(self, fetch_pokemon_by_move):
+        fetch_pokemon_by_move.return_value = ['charmander', 'charizard', 'not-in-catalog']
+        self.assertEqual(self.resolve(move='ember'), ['charmander', 'charizard'])
+        fetch_pokemon_by_move.return_value = None
+        with self.assertRaises(FilterUnavailable):
+            self.resolve(move='surf')
+
+    def test_invalid_values(self):
+        for query in ({'generation': 'one'}, {'legendary': 'maybe'}, {'min_hp': 'lots'}, {'max_speed': '-'}):
+            with self.subTest(query=query), self.assertRaises(InvalidFilter):
+                self.resolve(**query)
+
+
+class RefreshTests(TestCase):
+    def setUp(self):
+        for each in caches.all():
+            each.clear()
+        self.listing = [{'name': name, 'url': pokemon_url(name)} for name in ('bulbasaur', 'charmander', 'mew')]
+        self.upstream = FakePokeAPI({
+            pokemon_url(name): pokemon_payload(pokemon_id, name, types)
+            for name, (pokemon_id, _, types, _) in POKEMON.items()
+        })
+        for name, (pokemon_id, _, _, (generation, legendary, mythical, chain_id)) in POKEMON.items():
+            self.upstream.payloads[f"{BASE_URL}/pokemon-species/{name}"] = species_payload(
+                name, chain_id, (pokemon_id, name), generation, legendary, mythical
+            )
+        self.upstream.payloads[f"{POKEMON_URL}?offset=0&limit=1"] = {'count': 3}
+        self.upstream.payloads[f"{POKEMON_URL}?offset=0&limit=3"] = {'count': 3, 'results': self.listing}
+        patcher = mock.patch('myapp.api_integrations.pokemon.pokemon_api._make_http_request', new=self.upstream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('myapp.catalog.refresh._make_http_request', new=self.upstream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_only_changes_bump_the_version(self):
+        summary = refresh_catalog(verify=10)
+        self.assertEqual((summary['added'], summary['failed']), (3, 0))
+        self.assertEqual(summary['version'], get_dataset_version())
+        self.assertEqual([entry['name'] for entry in get_catalog_snapshot()['results']], ['bulbasaur', 'charmander', 'mew'])
+
+        summary = refresh_catalog(verify=10)
+        self.assertEqual((summary['verified'], summary['changed'], summary['version']), (3, 0, None))
+
+        self.upstream.payloads[pokemon_url('mew')] = pokemon_payload(151, 'mew', ['psychic', 'fairy'])
+        summary = refresh_catalog(verify=10)
+        self.assertEqual(summary['changed'], 1)
+        self.assertIsNotNone(summary['version'])
+
+    def test_failed_details_are_retried(self):
+        self.upstream.failing.add(pokemon_url('mew'))
+        self.assertEqual(refresh_catalog(verify=0)['failed'], 1)
+
+        self.upstream.failing.clear()
+        summary = refresh_catalog(verify=0)
+        self.assertEqual((summary['failed'], summary['verified']), (0, 0))
+        self.assertIn('mew', get_catalog_snapshot()['fingerprints'])
+
+    def test_species_failures_are_retried(self):
+        self.upstream.failing.add(f"{BASE_URL}/pokemon-species/mew")
+        self.assertEqual(refresh_catalog(verify=0)['failed'], 1)
+        self.assertNotIn('mew', get_catalog_snapshot()['species'])
+
+        self.upstream.failing.clear()
+        self.assertEqual(refresh_catalog(verify=0)['failed'], 0)
+        self.assertEqual(get_catalog_snapshot()['species']['mew'], {
+            'generation': 1, 'is_legendary': False, 'is_mythical': True, 'chain_id': 64,
+        })
+
+    def test_upstream_failure_keeps_the_snapshot(self):
+        refresh_catalog()
+        version = get_dataset_version()
+        self.upstream.failing.add(f"{POKEMON_URL}?offset=0&limit=1")
+        with self.assertRaises(RefreshError):
+            refresh_catalog()
+        self.assertEqual(get_dataset_version(), version)
+        self.assertEqual(len(get_catalog_snapshot()['results']), 3)
+
+    @mock.patch('myapp.catalog.filters.fetch_pokemon_by_move')
+    def test_learnsets_back_the_move_filter(self, fetch_pokemon_by_move):
+        for name, moves in (('bulbasaur', ['tackle', 'vine-whip']), ('charmander', ['tackle', 'ember'])):
+            self.upstream.payloads[pokemon_url(name)]['moves'] = [{'move': {'name': move}} for move in moves]
+        refresh_catalog()
+        self.assertNotIn('moves', cache.get(f"pokemon_detail_{pokemon_url('bulbasaur')}"))
+
+        snapshot = get_catalog_snapshot()
+        catalog = CatalogIndex(snapshot['results'], 1, snapshot)
+        for move, expected in (('tackle', ['bulbasaur', 'charmander']), ('ember', ['charmander']), ('surf', [])):
+            with self.subTest(move=move):
+                self.assertEqual(names(catalog, resolve_filters(catalog, normalize_filters({'move': move}))), expected)
+        fetch_pokemon_by_move.assert_not_called()
+
+
+# Just the relations the matchups below need; every other pairing is neutral
+DAMAGE_RELATIONS = {
+    'ground': {'double_damage_to': ['fire', 'electric', 'poison', 'rock', 'steel'],
+               'half_damage_to': ['grass', 'bug'], 'no_damage_to': ['flying']},
+    'rock': {'double_damage_to': ['fire', 'ice', 'flying', 'bug'],
+             'half_damage_to': ['fighting', 'ground', 'steel'], 'no_damage_to': []},
+    'electric': {'double_damage_to': ['water', 'flying'],
+                 'half_damage_to': ['electric', 'grass', 'dragon'], 'no_damage_to': ['ground']},
+}
+
+
+def effectiveness_matrix():
+    with mock.patch('myapp.analysis.typechart.fetch_type_damage_relations', side_effect=lambda name: DAMAGE_RELATIONS.get(
+        name, {'double_damage_to': [], 'half_damage_to': [], 'no_damage_to': []}
+    )):
+        return build_effectiveness_matrix()
+
+
+class TeamAnalysisTests(TestCase):
+    def setUp(self):
+        self.matrix = effectiveness_matrix()
+
+    def multiplier(self, attacker, *defender):
+        primary, secondary = (list(defender) + [None])[:2]
+        taken = self.matrix[TYPE_INDEX[attacker], TYPE_INDEX[primary]]
+        return taken * (self.matrix[TYPE_INDEX[attacker], TYPE_INDEX[secondary]] if secondary else 1)
+
+    def test_known_matchups(self):
+        self.assertEqual(self.multiplier('rock', 'fire', 'flying'), 4)
+        self.assertEqual(self.multiplier('ground', 'fire', 'flying'), 0)
+        self.assertEqual(self.multiplier('electric', 'water', 'ground'), 0)
+        self.assertEqual(self.multiplier('ground', 'grass', 'bug'), 0.25)
+
+    def test_defense(self):
+        by_type = {row['type']: row for row in analyze_team(self.matrix, [['fire', 'flying'], ['water']])['defense']['by_type']}
+        self.assertEqual(by_type['rock'], {'type': 'rock', 'weak': 1, 'resist': 0, 'immune': 0})
+        self.assertEqual(by_type['ground'], {'type': 'ground', 'weak': 0, 'resist': 0, 'immune': 1})
+        self.assertEqual(by_type['electric'], {'type': 'electric', 'weak': 2, 'resist': 0, 'immune': 0})
+
+    def test_offense(self):
+        offense = analyze_team(self.matrix, [['ground']])['offense']
+        self.assertEqual(offense['combinations'], 171)
+        # Flying alone and its 17 dual types
+        self.assertEqual(offense['immune'], 18)
+        self.assertIn(['flying'], offense['walls'])
+
+
+class TeamAnalyzeViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.upstream = FakePokeAPI({
+            pokemon_url(name): pokemon_payload(pokemon_id, name, types)
+            for name, (pokemon_id, _, types, _) in POKEMON.items()
+        })
+        for target, kwargs in (
+            ('myapp.api_integrations.pokemon.pokemon_api._make_http_request', {'new': self.upstream}),
+            ('myapp.catalog.get_catalog', {'return_value': build_catalog()}),
+            ('myapp.views.get_effectiveness_matrix', {'return_value': effectiveness_matrix()}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def analyze(self, *team):
+        return self.client.post(reverse('team-analyze'), {'team': list(team)}, content_type='application/json')
+
+    def test_team(self):
+        response = self.analyze('charizard', 'mew')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['team'][0], {'name': 'charizard', 'types': ['fire', 'flying']})
+
+    def test_unknown_and_unavailable_members(self):
+        self.assertEqual(self.analyze('charizard', 'missingno').status_code, 404)
+        self.upstream.failing.add(pokemon_url('mew'))
+        self.assertEqual(self.analyze('charizard', 'mew').status_code, 502)
+
+
+class SimilarityTests(TestCase):
+    def setUp(self):
+        self.catalog = build_catalog()
+        self.index = SimilarityIndex(self.catalog)
+
+    def nearest(self, name, limit, metric='cosine'):
+        return [self.catalog.names[i] for i, _ in self.index.nearest(self.catalog.positions[name], limit, metric)]
+
+    def test_nearest_share_types_and_stats(self):
+        for metric in ('cosine', 'euclidean'):
+            with self.subTest(metric=metric):
+                self.assertEqual(self.nearest('ivysaur', 1, metric), ['bulbasaur'])
+                self.assertEqual(self.nearest('mewtwo', 1, metric), ['mew'])
+
+    def test_query_is_never_its_own_neighbour(self):
+        self.assertEqual(len(self.nearest('mew', 20)), len(POKEMON) - 1)
+        self.assertNotIn('mew', self.nearest('mew', 20))
+
+    def test_positions_without_stats_are_skipped(self):
+        catalog = CatalogIndex(self.catalog.entries, 2, {
+            'columns': {name: row for name, (_, row, _, _) in POKEMON.items() if name != 'ivysaur'},
+            'traits': {name: [types, []] for name, (_, _, types, _) in POKEMON.items()},
+        })
+        index = SimilarityIndex(catalog)
+        self.assertFalse(index.valid[catalog.positions['ivysaur']])
+        nearest = [catalog.names[i] for i, _ in index.nearest(catalog.positions['bulbasaur'], 20)]
+        self.assertNotIn('ivysaur', nearest)
+
+
+class AggregateTests(TestCase):
+    def setUp(self):
+        self.catalog = build_catalog()
+
+    def groups(self, matches):
+        return {group['type']: group for group in aggregate(self.catalog, matches, 'type')['groups']}
+
+    def test_group_summaries(self):
+        grass = self.groups(self.catalog.all)['grass']
+        self.assertEqual(grass['count'], 3)
+        self.assertEqual(grass['columns']['hp'], {
+            'count': 3, 'mean': 50.0, 'min': 45.0, 'p25': 45.0, 'median': 45.0, 'p75': 52.5, 'max': 60.0,
+        })
+
+    def test_quantiles_match_numpy(self):
+        for group_type, group in self.groups(self.catalog.all).items():
+            members = [row for _, row, types, _ in POKEMON.values() if group_type in types]
+            for c, column in enumerate(NUMERIC_COLUMNS):
+                values = [row[c] for row in members]
+                with self.subTest(type=group_type, column=column):
+                    self.assertEqual(group['columns'][column]['p25'], round(float(np.quantile(values, 0.25)), 2))
+                    self.assertEqual(group['columns'][column]['p75'], round(float(np.quantile(values, 0.75)), 2))
+
+    def test_only_matching_groups(self):
+        result = aggregate(self.catalog, self.catalog.search('char'), 'type')
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['overall']['speed']['max'], 100.0)
+        self.assertEqual({group['type']: group['count'] for group in result['groups']}, {'fire': 2, 'flying': 1})
+
+
+@mock.patch('myapp.views.fetch_all_abilities', return_value=[{'name': 'overgrow'}])
+@mock.patch('myapp.views.fetch_all_types', return_value=[{'name': 'grass'}])
+class BootstrapTests(TestCase):
+    def setUp(self):
+        for each in caches.all():
+            each.clear()
+        patcher = mock.patch('myapp.views.get_catalog', return_value=build_catalog())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('myapp.views.fetch_multiple_pokemon_details',
+                             side_effect=lambda urls: [pokemon_detail(url) for url in urls])
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sections(self, fetch_all_types, fetch_all_abilities):
+        response = self.client.get(reverse('bootstrap') + '?limit=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['csrf_token'])
+        self.assertEqual(data['auth'], {'authenticated': False, 'user': None})
+        self.assertEqual((data['types'], data['abilities']), ([{'name': 'grass'}], [{'name': 'overgrow'}]))
+        self.assertEqual([p['name'] for p in data['pokemon']['results']], ['bulbasaur', 'ivysaur'])
+
+    def test_first_page_shares_the_list_cache(self, fetch_all_types, fetch_all_abilities):
+        self.client.get(reverse('bootstrap') + '?limit=2')
+        self.fetch.reset_mock()
+        response = self.client.get(reverse('pokemon-list') + '?limit=2')
+        self.assertEqual([p['name'] for p in response.json()['results']], ['bulbasaur', 'ivysaur'])
+        self.fetch.assert_not_called()
+
+    def test_failed_page_leaves_the_other_sections(self, fetch_all_types, fetch_all_abilities):
+        self.fetch.side_effect = RuntimeError
+        data = self.client.get(reverse('bootstrap')).json()
+        self.assertIsNone(data['pokemon'])
+        self.assertEqual(data['types'], [{'name': 'grass'}])
@@ -0,0 +1,47 @@
+"""
+Named timing spans for the current request, reported as Server-Timing.
+
+ServerTimingMiddleware starts a recorder per request; code on the
+request path wraps its phases in span('name'), as a context manager or
+a decorator. Time spent under the same name is summed, and spans may
+nest (e.g. 'details' around 'detail_fanout'). Outside a request, and in
+fan-out worker threads, span() only costs a context-variable lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+_spans: ContextVar[Optional[Dict[str, float]]] = ContextVar('pokedex_timing_spans', default=None)
+
+
+def start_recording():
+    """Begin collecting spans for the current request; returns a token for stop_recording()."""
+    return _spans.set({})
+
+
+def stop_recording(token) -> Dict[str, float]:
+    """Stop collecting and return {span name: seconds}."""
+    spans = _spans.get() or {}
+    _spans.reset(token)
+    return spans
+
+
+@contextmanager
+def span(name: str):
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[name] = spans.get(name, 0.0) + time.perf_counter() - start
+
+
+def server_timing_header(spans: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries)
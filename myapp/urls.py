@@ -2,7 +2,10 @@ from django.urls import path
 from .views import (
     login_view, logout_view, check_auth, pokemon_list,
     register_view, user_profile_view, pokemon_detail, update_favorite_pokemon,
-    favorite_pokemon_list, pokemon_evolution_chain_view, types_list, abilities_list
+    favorite_pokemon_list, pokemon_evolution_chain_view, types_list, abilities_list,
+    pokemon_batch, update_favorite_pokemon_bulk, favorite_pokemon_status,
+    popular_pokemon, response_cache_stats_view, metrics_view, team_analyze, pokemon_similar,
+    pokemon_stats, move_pokemon, bootstrap
 )
 from . import views
 
@@ -12,12 +15,23 @@ urlpatterns = [
     path('auth/logout/', logout_view, name='logout'),
     path('auth/me/', check_auth, name='check-auth'),
     path('csrf/', views.get_csrf_token, name='csrf-token'),
+    path('bootstrap/', bootstrap, name='bootstrap'),
     path('pokemon/favorites/', favorite_pokemon_list, name='favorite-pokemon-list'),
+    path('pokemon/batch/', pokemon_batch, name='pokemon-batch'),
+    path('pokemon/popular/', popular_pokemon, name='pokemon-popular'),
+    path('pokemon/stats/', pokemon_stats, name='pokemon-stats'),
+    path('pokemon/<str:name>/similar/', pokemon_similar, name='pokemon-similar'),
     path('pokemon/<str:name>/evolution/', pokemon_evolution_chain_view, name='pokemon-evolution-chain'),
     path('pokemon/<str:name>/', pokemon_detail, name='pokemon-detail'),
     path('pokemon/', pokemon_list, name='pokemon-list'),
+    path('teams/analyze/', team_analyze, name='team-analyze'),
     path('profile/', user_profile_view, name='user-profile'),
     path('user/favorite-pokemon/', update_favorite_pokemon, name='update_favorite_pokemon'),
+    path('user/favorite-pokemon/bulk/', update_favorite_pokemon_bulk, name='update-favorite-pokemon-bulk'),
+    path('user/favorite-pokemon/status/', favorite_pokemon_status, name='favorite-pokemon-status'),
+    path('moves/<str:name>/pokemon/', move_pokemon, name='move-pokemon'),
     path('types/', types_list, name='types-list'),
     path('abilities/', abilities_list, name='abilities-list'),
+    path('cache/stats/', response_cache_stats_view, name='response-cache-stats'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,78 @@
+"""
+The serialized user + profile block attached to authenticated responses.
+
+Building it means loading the profile and running two ModelSerializers,
+so the result is cached per user and invalidated whenever the user,
+their profile or their favorites change. Invalidation is a cache delete,
+so the envelope is only cached when the default cache is shared by all
+workers; with a process-local cache it is built on every request.
+"""
+
+from typing import Dict
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import UserProfile
+from . import metrics
+from .checks import default_cache_is_shared
+import logging
+
+USER_ENVELOPE_CACHE_TIMEOUT = 3600  # 1 hour, invalidated explicitly on changes
+
+logger = logging.getLogger(__name__)
+
+
+def user_envelope_cache_key(user_id: int) -> str:
+    return f"user_envelope_{user_id}"
+
+
+def build_user_envelope(user) -> Dict:
+    """Serialize a user and their profile as {'id', ..., 'profile': {...}}."""
+    from .my_api_serializers.user.user_read import UserReadSerializer, UserProfileReadSerializer
+
+    # The user is already loaded by authentication; the profile and the
+    # favorite names come in one query, a row per favorite (one row with
+    # no name when there are none)
+    rows = list(
+        UserProfile.objects
+        .filter(user_id=user.pk)
+        .values_list('pk', 'created_at', 'updated_at', 'user__favorites__pokemon_name')
+        .order_by('user__favorites__created_at', 'user__favorites__id')
+    )
+    if not rows:
+        raise UserProfile.DoesNotExist(f"No profile for user {user.pk}")
+    pk, created_at, updated_at, _ = rows[0]
+    profile = UserProfile(pk=pk, user_id=user.pk, created_at=created_at, updated_at=updated_at)
+    favorites = [name for *_, name in rows if name is not None]
+    return {
+        **UserReadSerializer(user).data,
+        'profile': UserProfileReadSerializer(profile, context={'favorite_pokemon': favorites}).data
+    }
+
+
+def get_user_envelope(user) -> Dict:
+    """Return the cached envelope for a user, building it on a miss."""
+    if not default_cache_is_shared():
+        return build_user_envelope(user)
+    cache_key = user_envelope_cache_key(user.pk)
+    envelope = cache.get(cache_key)
+    metrics.record_cache('user_envelope', envelope is not None)
+    if envelope is None:
+        envelope = build_user_envelope(user)
+        cache.set(cache_key, envelope, USER_ENVELOPE_CACHE_TIMEOUT)
+    return envelope
+
+
+def invalidate_user_envelope(user_id: int) -> None:
+    cache.delete(user_envelope_cache_key(user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_envelope_on_user_save(sender, instance, **kwargs):
+    invalidate_user_envelope(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_envelope_on_profile_save(sender, instance, **kwargs):
+    invalidate_user_envelope(instance.user_id)
@@ -1,29 +1,89 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, HttpRequest
+from django.middleware.csrf import get_token
+from django.urls import reverse
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.authentication import SessionAuthentication
 from django.contrib.auth import authenticate, login, logout
-from .my_api_serializers.user.user_read import UserReadSerializer, UserProfileReadSerializer
-from .my_api_serializers.user.user_write import UserRegisterWriteSerializer, UserLoginWriteSerializer
+from .my_api_serializers.user.user_write import (
+    UserRegisterWriteSerializer,
+    UserLoginWriteSerializer,
+    FavoritePokemonBulkWriteSerializer
+)
+from .my_api_serializers.pokemon.pokemon_write import PokemonBatchWriteSerializer, TeamAnalyzeWriteSerializer
 from .api_integrations.pokemon.pokemon_api import (
-    fetch_pokemon_list,
     fetch_multiple_pokemon_details,
-    fetch_pokemon_by_type,
-    fetch_pokemon_by_ability,
     fetch_pokemon_detail,
-    POKEMON_URL,
+    fetch_pokemon_details_bulk,
+    pokemon_detail_url,
+    canonical_pokemon_identifier,
+    BATCH_MAX_ITEMS,
     fetch_pokemon_evolution_chain,
+    hydrate_evolution_chain,
+    PokemonNotFound,
     fetch_all_types,
     fetch_all_abilities
 )
-from .models import UserProfile
-from .decorators import handle_api_errors, require_authentication, validate_with_serializer, paginate_response
+from .favorites import (
+    get_favorites_payload,
+    favorite_names,
+    favorited_names,
+    toggle_favorite,
+    update_favorites
+)
+from .popularity import top_favorited, POPULAR_MAX_LIMIT
+from .user_envelope import get_user_envelope
+from .decorators import (
+    handle_api_errors,
+    require_authentication,
+    validate_with_serializer,
+    http_cache,
+    cache_rendered_response
+)
+from .response_cache import response_cache_stats
+from . import metrics, timing
+from .renderers import PreEncoded, pokemon_fragment, pokemon_fragments
+from .catalog import (
+    LIST_FILTER_PARAMS,
+    FilterUnavailable,
+    InvalidFilter,
+    parse_sort,
+    InvalidCursor,
+    get_catalog,
+    normalize_filters,
+    filter_fingerprint,
+    resolve_filters,
+    parse_limit,
+    encode_cursor,
+    decode_cursor,
+    page_after,
+    page_at_offset,
+    InvalidFields,
+    parse_fields,
+    needs_details,
+    select_fields,
+    catalog_fields
+)
+from .catalog import bitmap
+from .analysis import (
+    get_effectiveness_matrix,
+    analyze_team,
+    SIMILARITY_METRICS,
+    SIMILAR_DEFAULT_LIMIT,
+    SIMILAR_MAX_LIMIT,
+    get_similarity_index,
+    AGGREGATE_GROUPS,
+    aggregate
+)
+from .prefetch import prefetch, prefetch_enabled
+from urllib.parse import urlencode
+from typing import Optional
+import concurrent.futures
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -39,10 +99,7 @@ def login_view(request):
         login(request, user)
         return Response({
             'message': 'Logged in successfully.',
-            'user': {
-                **UserReadSerializer(user).data,
-                'profile': UserProfileReadSerializer(user.profile).data
-            }
+            'user': get_user_envelope(user)
         })
     return Response({'error': 'Invalid credentials.'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -57,10 +114,7 @@ def register_view(request):
         login(request, user)
         return Response({
             'message': 'User registered successfully.',
-            'user': {
-                **UserReadSerializer(user).data,
-                'profile': UserProfileReadSerializer(user.profile).data
-            }
+            'user': get_user_envelope(user)
         }, status=status.HTTP_201_CREATED)
     logger.error(f"Registration validation errors: {serializer.errors}")
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -85,82 +139,213 @@ def get_csrf_token(request):
 def check_auth(request):
     return Response({'authenticated': True})
 
+def _first_page(query) -> Optional[PreEncoded]:
+    """
+    The pokemon_list response for a query, run in-process so it is served
+    from (and fills) the list's rendered-response cache. Safe in a worker
+    thread: pokemon_list neither authenticates nor touches the database.
+    """
+    internal = HttpRequest()
+    internal.method = 'GET'
+    internal.path = reverse('pokemon-list')
+    internal.GET = query.copy()
+    internal.META = {'HTTP_ACCEPT': 'application/json'}
+    response = pokemon_list(internal)
+    if response.status_code != 200:
+        return None
+    # Embed the cached body as-is instead of decoding and re-encoding it
+    return PreEncoded(response.content.strip()[1:-1])
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @handle_api_errors
-def pokemon_list(request):
-    # Parse query parameters
-    page = int(request.GET.get('page', 1))
-    search = request.GET.get('search', '').strip().lower()
-    pokemon_type = request.GET.get('type', '').strip().lower()
-    ability = request.GET.get('ability', '').strip().lower()
-    limit = 9
-    offset = (page - 1) * limit
-
-    # Start with full base list
-    base_data = fetch_pokemon_list(offset=0, limit=1000)
-    if not base_data:
-        return Response({'error': 'Failed to fetch Pokémon list.'}, status=status.HTTP_502_BAD_GATEWAY)
+def bootstrap(request):
+    """
+    Everything the frontend needs for its first render in one round trip:
+    the CSRF token (and cookie), the auth state with the user envelope, all
+    types and abilities, and the first pokemon_list page for the given
+    query parameters (its `next` link is relative to /api/pokemon/). The
+    sections are resolved concurrently, each from its own cache; auth stays
+    on the request thread since it reads the session.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        types = executor.submit(fetch_all_types)
+        abilities = executor.submit(fetch_all_abilities)
+        page = executor.submit(_first_page, request.GET)
 
-    pokemon_list = base_data['results']
+        csrf_token = get_token(request)
+        user = get_user_envelope(request.user) if request.user.is_authenticated else None
 
-    # Apply search filter
-    if search:
-        pokemon_list = [p for p in pokemon_list if search in p['name'].lower()]
+        try:
+            first_page = page.result()
+        except Exception as e:
+            logger.error(f"Error building bootstrap page: {str(e)}")
+            first_page = None
+        return Response({
+            'csrf_token': csrf_token,
+            'auth': {'authenticated': user is not None, 'user': user},
+            'types': types.result(),
+            'abilities': abilities.result(),
+            'pokemon': first_page,
+        })
 
-    # Apply type filter
-    if pokemon_type:
-        type_filtered = fetch_pokemon_by_type(pokemon_type)
-        if type_filtered is None:
-            return Response({'error': 'Failed to fetch Pokémon by type.'}, status=status.HTTP_502_BAD_GATEWAY)
-        pokemon_list = [p for p in pokemon_list if p['name'] in type_filtered]
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@handle_api_errors
+@http_cache()
+@cache_rendered_response('pokemon_list', params=('page', 'cursor', 'limit', 'fields') + LIST_FILTER_PARAMS)
+def pokemon_list(request):
+    """
+    List Pokémon, optionally filtered by search, type, ability, move and
+    min_/max_ bounds on base stats, height and weight, and ordered by
+    ?sort=<column> (or -<column> for descending). Pages are addressed
+    either by ?page=N or by the opaque ?cursor= from the previous
+    response's `next` link; ?limit= sets the page size and ?fields=
+    selects the returned fields.
+    """
+    # Parse query parameters
+    try:
+        fields = parse_fields(request.GET.get('fields', ''))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    filters = normalize_filters(request.GET)
+    limit = parse_limit(request.GET.get('limit', ''))
+    cursor = request.GET.get('cursor', '').strip()
+    page = request.GET.get('page', '')
+    page = max(1, int(page)) if page.isdigit() else 1
 
-    # Apply ability filter
-    if ability:
-        ability_filtered = fetch_pokemon_by_ability(ability)
-        if ability_filtered is None:
-            return Response({'error': 'Failed to fetch Pokémon by ability.'}, status=status.HTTP_502_BAD_GATEWAY)
-        pokemon_list = [p for p in pokemon_list if p['name'] in ability_filtered]
+    catalog = get_catalog()
+    if catalog is None:
+        return Response({'error': 'Failed to fetch Pokémon list.'}, status=status.HTTP_502_BAD_GATEWAY)
 
-    # Calculate total count before pagination
-    total_count = len(pokemon_list)
+    try:
+        sort = parse_sort(filters)
+        matches = resolve_filters(catalog, filters)
+    except InvalidFilter as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except FilterUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+    order = catalog.columns.order(*sort) if sort else None
 
-    # Apply pagination
-    paginated_list = pokemon_list[offset:offset + limit]
+    # Select the page: keyset continuation for cursors, offset for page numbers
+    fingerprint = filter_fingerprint(filters)
+    try:
+        with timing.span('page'):
+            if cursor:
+                positions, has_more = page_after(catalog, matches, decode_cursor(cursor, fingerprint), limit, order)
+            else:
+                positions, has_more = page_at_offset(matches, (page - 1) * limit, limit, order)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Fetch details for paginated results
-    urls = [p['url'] for p in paginated_list]
-    details = fetch_multiple_pokemon_details(urls)
+    # Fetch details for paginated results, unless only catalog fields were requested
+    paginated_list = [catalog.entries[position] for position in positions]
+    if needs_details(fields):
+        urls = [p['url'] for p in paginated_list]
+        details = fetch_multiple_pokemon_details(urls)
+    else:
+        details = [{} for _ in paginated_list]
     
-    # Combine the data
-    results = [
-        {
-            'name': paginated_list[i]['name'],
-            **details[i]
-        } for i in range(len(paginated_list))
-    ]
+    # Combine the data into pre-encoded fragments
+    if fields is None:
+        entries = [
+            {
+                'name': paginated_list[i]['name'],
+                **details[i]
+            } for i in range(len(paginated_list))
+        ]
+    else:
+        entries = [
+            select_fields({**details[i], **catalog.catalog_entry(position)}, fields)
+            for i, position in enumerate(positions)
+        ]
+    with timing.span('fragments'):
+        results = pokemon_fragments(entries)
 
-    # Build next/previous URLs
+    # Build next/previous URLs, carrying the filters along
+    filter_query = ''.join(f"&{urlencode({name: value})}" for name, value in filters.items() if value)
+    if fields is not None:
+        filter_query += f"&fields={','.join(fields)}"
     next_url = None
-    if offset + limit < total_count:
-        next_url = f"?page={page + 1}&limit={limit}"
-        if search: next_url += f"&search={search}"
-        if pokemon_type: next_url += f"&type={pokemon_type}"
-        if ability: next_url += f"&ability={ability}"
-    
+    if has_more:
+        next_cursor = encode_cursor(paginated_list[-1]['name'], fingerprint)
+        next_url = f"?cursor={next_cursor}&limit={limit}{filter_query}"
+
     previous_url = None
-    if page > 1:
-        previous_url = f"?page={page - 1}&limit={limit}"
-        if search: previous_url += f"&search={search}"
-        if pokemon_type: previous_url += f"&type={pokemon_type}"
-        if ability: previous_url += f"&ability={ability}"
+    if not cursor and page > 1:
+        previous_url = f"?page={page - 1}&limit={limit}{filter_query}"
 
-    return Response({
-        'count': total_count,
+    response = Response({
+        'count': bitmap.count(matches),
         'next': next_url,
         'previous': previous_url,
         'results': results,
     })
+    # Don't pin a page with failed upstream fetches in the response cache
+    response.skip_response_cache = needs_details(fields) and any(detail.get('sprite') is None for detail in details)
+
+    # Warm what infinite scroll and click-through will most likely ask for next
+    if needs_details(fields) and prefetch_enabled():
+        next_positions = []
+        if has_more:
+            next_positions, _ = page_after(catalog, matches, paginated_list[-1]['name'], limit, order)
+        prefetch(
+            detail_urls=[catalog.entries[position]['url'] for position in next_positions],
+            evolution_names=[catalog.names[position] for position in positions + next_positions]
+        )
+    return response
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@handle_api_errors
+@http_cache()
+@cache_rendered_response('pokemon_stats', params=('group_by',) + LIST_FILTER_PARAMS)
+def pokemon_stats(request):
+    """
+    Count, mean, min, quartiles and max of base stats, height and weight
+    for the Pokémon matching the pokemon_list filters, overall and per
+    ?group_by=type (default) or ability.
+    """
+    group_by = request.GET.get('group_by', 'type').strip().lower()
+    if group_by not in AGGREGATE_GROUPS:
+        return Response(
+            {'error': f"Invalid group_by: {group_by}. Use one of: {', '.join(AGGREGATE_GROUPS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    filters = normalize_filters(request.GET)
+
+    catalog = get_catalog()
+    if catalog is None:
+        return Response({'error': 'Failed to fetch Pokémon list.'}, status=status.HTTP_502_BAD_GATEWAY)
+
+    try:
+        matches = resolve_filters(catalog, filters)
+    except InvalidFilter as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except FilterUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+    with timing.span('aggregate'):
+        return Response(aggregate(catalog, matches, group_by))
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@handle_api_errors
+def popular_pokemon(request):
+    """
+    Return the most favorited Pokémon, highest count first.
+    Example: ?limit=10 (at most POPULAR_MAX_LIMIT)
+    """
+    limit = request.GET.get('limit', '10')
+    limit = min(int(limit), POPULAR_MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else 10
+
+    results = top_favorited(limit)
+    return Response({
+        'count': len(results),
+        'results': results,
+    })
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -169,33 +354,25 @@ def pokemon_list(request):
 def user_profile_view(request):
     """
     Get the authenticated user's profile with nested user data.
-    Each field is explicitly defined for better clarity and control.
+    Served from the cached user envelope.
     """
-    user_data = UserReadSerializer(request.user).data
-    profile_data = UserProfileReadSerializer(request.user.profile).data
-
     return Response({
-        'user': {
-            'id': user_data['id'],
-            'username': user_data['username'],
-            'email': user_data['email'],
-            'first_name': user_data['first_name'],
-            'last_name': user_data['last_name'],
-            'profile': {
-                'favorite_pokemon': profile_data['favorite_pokemon'],
-                'created_at': profile_data['created_at'],
-                'updated_at': profile_data['updated_at']
-            }
-        }
+        'user': get_user_envelope(request.user)
     })
 
 @api_view(['GET'])
+@authentication_classes([])
 @permission_classes([AllowAny])
 @handle_api_errors
+@http_cache()
+@cache_rendered_response('pokemon_detail', params=())
 def pokemon_detail(request, name):
     """Fetch detailed information for a specific Pokémon."""
-    url = f"{POKEMON_URL}/{name.lower()}"
-    result = fetch_pokemon_detail(url)
+    identifier = canonical_pokemon_identifier(name)
+    try:
+        result = fetch_pokemon_detail(pokemon_detail_url(identifier)) if identifier else None
+    except PokemonNotFound:
+        result = None
     
     if not result or not result.get('sprite'):
         return Response(
@@ -204,14 +381,162 @@ def pokemon_detail(request, name):
         )
     
     result['name'] = name
+    prefetch(evolution_names=[name.lower()])
     return Response(result)
 
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@handle_api_errors
+@http_cache()
+@cache_rendered_response('pokemon_similar', params=('limit', 'metric'))
+def pokemon_similar(request, name):
+    """
+    The Pokémon most similar to this one by base stats, types and abilities.
+    ?metric=cosine (default) or euclidean; ?limit= sets how many (at most
+    SIMILAR_MAX_LIMIT).
+    """
+    metric = request.GET.get('metric', 'cosine').strip().lower()
+    if metric not in SIMILARITY_METRICS:
+        return Response(
+            {'error': f"Invalid metric: {metric}. Use one of: {', '.join(SIMILARITY_METRICS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    limit = request.GET.get('limit', '')
+    limit = min(int(limit), SIMILAR_MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else SIMILAR_DEFAULT_LIMIT
+
+    index = get_similarity_index()
+    if index is None:
+        return Response({'error': 'Failed to fetch Pokémon list.'}, status=status.HTTP_502_BAD_GATEWAY)
+    catalog = index.catalog
+    position = catalog.lookup(canonical_pokemon_identifier(name) or '')
+    if position is None or not index.valid[position]:
+        return Response({'error': f'Pokémon {name} not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    neighbours = index.nearest(position, limit, metric)
+    names = [catalog.names[i] for i, _ in neighbours]
+    details = fetch_pokemon_details_bulk(names)
+    score_field = 'similarity' if metric == 'cosine' else 'distance'
+    results = [
+        pokemon_fragment({**details.get(neighbour, {}), **catalog.catalog_entry(i)}).prepend(
+            **{score_field: round(score, 4)}
+        )
+        for neighbour, (i, score) in zip(names, neighbours)
+    ]
+    response = Response({
+        'pokemon': catalog.names[position],
+        'metric': metric,
+        'count': len(results),
+        'results': results,
+    })
+    # Don't pin neighbours with failed upstream fetches in the response cache
+    response.skip_response_cache = any(not details.get(neighbour, {}).get('sprite') for neighbour in names)
+    return response
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@handle_api_errors
+@validate_with_serializer(PokemonBatchWriteSerializer)
+def pokemon_batch(request):
+    """
+    Fetch details for many Pokémon (names or IDs) in one request.
+    Results keep the input order and carry a per-item status: ok, not_found,
+    invalid, or unavailable when PokeAPI failed or timed out for that item.
+    ?fields= selects the returned fields; catalog-only fields (name, id, url)
+    are answered from the catalog without fetching details.
+    """
+    try:
+        fields = parse_fields(request.GET.get('fields', ''))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    queries = request.validated_data['pokemon']
+    identifiers = [canonical_pokemon_identifier(query) for query in queries]
+
+    # Dedupe before touching the cache or upstream
+    unique_identifiers = list(dict.fromkeys(i for i in identifiers if i))
+    catalog = get_catalog() if fields is not None else None
+    if needs_details(fields):
+        details = fetch_pokemon_details_bulk(unique_identifiers)
+    else:
+        details = {
+            identifier: entry for identifier in unique_identifiers
+            if (entry := catalog_fields(catalog, identifier)) is not None
+        }
+
+    results = []
+    for query, identifier in zip(queries, identifiers):
+        if not identifier:
+            results.append({'query': query, 'status': 'invalid'})
+            continue
+
+        detail = details.get(identifier)
+        if detail is None:
+            results.append({'query': query, 'status': 'not_found'})
+            continue
+        if needs_details(fields) and detail.get('sprite') is None:
+            results.append({'query': query, 'status': 'unavailable'})
+            continue
+
+        entry = {**detail, 'name': detail.get('name') or identifier}
+        if fields is not None:
+            entry = select_fields({**(catalog_fields(catalog, identifier) or {}), **entry}, fields)
+        results.append(pokemon_fragment(entry).prepend(query=query, status='ok'))
+
+    return Response({
+        'count': len(results),
+        'results': results,
+    })
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@handle_api_errors
+@validate_with_serializer(TeamAnalyzeWriteSerializer)
+def team_analyze(request):
+    """
+    Analyze a team of up to six Pokémon (names or IDs): which attacking types
+    it is weak to or resists, and how well its own types cover every
+    mono- and dual-type defender.
+    """
+    queries = request.validated_data['team']
+    identifiers = [canonical_pokemon_identifier(query) for query in queries]
+    invalid = [query for query, identifier in zip(queries, identifiers) if not identifier]
+    if invalid:
+        return Response({'error': f"Invalid Pokémon: {', '.join(invalid)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    details = fetch_pokemon_details_bulk(list(dict.fromkeys(identifiers)))
+    missing = [query for query, identifier in zip(queries, identifiers) if identifier not in details]
+    if missing:
+        return Response({'error': f"Unknown Pokémon: {', '.join(missing)}"}, status=status.HTTP_404_NOT_FOUND)
+    unavailable = [query for query, identifier in zip(queries, identifiers) if not details[identifier].get('types')]
+    if unavailable:
+        return Response(
+            {'error': f"Failed to fetch Pokémon: {', '.join(unavailable)}"},
+            status=status.HTTP_502_BAD_GATEWAY
+        )
+
+    matrix = get_effectiveness_matrix()
+    if matrix is None:
+        return Response({'error': 'Failed to fetch type data.'}, status=status.HTTP_502_BAD_GATEWAY)
+
+    team = [
+        {'name': details[identifier].get('name') or identifier, 'types': details[identifier]['types']}
+        for identifier in identifiers
+    ]
+    return Response({
+        'team': team,
+        **analyze_team(matrix, [member['types'] for member in team]),
+    })
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @handle_api_errors
 @require_authentication
 def update_favorite_pokemon(request):
-    """Add or remove a Pokémon from the user's favorites."""
+    """
+    Add or remove a Pokémon from the user's favorites.
+    By default the favorite is toggled; pass action "add" or "remove" for idempotent updates.
+    """
     pokemon_name = request.data.get('pokemon_name')
     if not pokemon_name:
         return Response(
@@ -219,19 +544,64 @@ def update_favorite_pokemon(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    profile = request.user.profile
-    if pokemon_name in profile.favorite_pokemon:
-        profile.favorite_pokemon.remove(pokemon_name)
-        action = 'removed from'
+    requested_action = request.data.get('action', 'toggle')
+    if requested_action == 'toggle':
+        added = toggle_favorite(request.user, pokemon_name)
+    elif requested_action == 'add':
+        update_favorites(request.user, add=[pokemon_name])
+        added = True
+    elif requested_action == 'remove':
+        update_favorites(request.user, remove=[pokemon_name])
+        added = False
     else:
-        profile.favorite_pokemon.append(pokemon_name)
-        action = 'added to'
-    
-    profile.save()
+        return Response(
+            {'error': 'Action must be one of: toggle, add, remove.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
+    action = 'added to' if added else 'removed from'
     return Response({
         'message': f'Pokemon {pokemon_name} {action} favorites.',
-        'favorite_pokemon': profile.favorite_pokemon
+        'favorite_pokemon': favorite_names(request.user)
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@handle_api_errors
+@require_authentication
+@validate_with_serializer(FavoritePokemonBulkWriteSerializer)
+def update_favorite_pokemon_bulk(request):
+    """Add and remove several favorites in one atomic request."""
+    added, removed = update_favorites(
+        request.user,
+        add=request.validated_data['add'],
+        remove=request.validated_data['remove']
+    )
+    return Response({
+        'added': added,
+        'removed': removed,
+        'favorite_pokemon': favorite_names(request.user)
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@handle_api_errors
+@require_authentication(envelope=False)
+def favorite_pokemon_status(request):
+    """
+    Tell which of the given Pokémon are favorites of the user, for a whole list page at once.
+    Example: ?names=bulbasaur,ivysaur,venusaur
+    """
+    names = [name for name in request.GET.get('names', '').split(',') if name.strip()]
+    if len(names) > BATCH_MAX_ITEMS:
+        return Response(
+            {'error': f'At most {BATCH_MAX_ITEMS} Pokémon can be checked at once.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    favorited = favorited_names(request.user, names)
+    return Response({
+        'favorited': {name: name.strip().lower() in favorited for name in names}
     })
 
 @api_view(['GET'])
@@ -239,87 +609,109 @@ def update_favorite_pokemon(request):
 @handle_api_errors
 @require_authentication
 def favorite_pokemon_list(request):
-    """Fetch detailed information for favorite Pokémon."""
+    """
+    Fetch detailed information for the user's favorite Pokémon.
+    Favorites are read from the profile and served from the per-user materialized cache.
+    ?fields= selects the returned fields; catalog-only fields skip detail hydration.
+    """
     try:
-        # Get and parse favorite pokemon list from request parameters
-        favorite_pokemon_str = request.GET.get('favorite_pokemon', '[]')
-        logger.info(f"Received favorite_pokemon_str: {favorite_pokemon_str}")
-        
-        try:
-            favorite_pokemon = json.loads(favorite_pokemon_str)
-            logger.info(f"Parsed favorite_pokemon: {favorite_pokemon}")
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {str(e)}")
-            return Response({
-                'error': 'Invalid favorite Pokémon list format'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        if not favorite_pokemon:
-            logger.info("No favorite pokemon found")
-            return Response({
-                'count': 0,
-                'results': []
-            })
-
-        # Create URLs for each favorite pokemon
-        urls = []
-        for name in favorite_pokemon:
-            formatted_name = name.lower().strip()
-            url = f"{POKEMON_URL}/{formatted_name}"
-            urls.append(url)
-            logger.info(f"Created URL for {name}: {url}")
-        
-        # Fetch details for all favorite pokemon
-        logger.info(f"Fetching details for {len(urls)} pokemon")
-        details = fetch_multiple_pokemon_details(urls)
-        logger.info(f"Fetched details: {details}")
-        
-        # Combine the data
-        results = []
-        for i, detail in enumerate(details):
-            if detail and detail.get('sprite') is not None:
-                results.append({
-                    'name': favorite_pokemon[i],
-                    **detail
-                })
-                logger.info(f"Added result for {favorite_pokemon[i]}")
-        
-        logger.info(f"Returning {len(results)} results")
+        fields = parse_fields(request.GET.get('fields', ''))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if fields is None:
+        payload = get_favorites_payload(request.user)
         return Response({
-            'count': len(results),
-            'results': results
+            'count': payload['count'],
+            'results': pokemon_fragments(payload['results']),
         })
-    except Exception as e:
-        logger.error(f"Unexpected error in favorite_pokemon_list: {str(e)}")
-        return Response({
-            'error': f'An unexpected error occurred: {str(e)}'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    catalog = get_catalog()
+    if needs_details(fields):
+        entries = get_favorites_payload(request.user)['results']
+    else:
+        entries = [{'name': name} for name in favorite_names(request.user)]
+    results = [
+        select_fields({**(catalog_fields(catalog, entry['name']) or {}), **entry}, fields)
+        for entry in entries
+    ]
+    return Response({
+        'count': len(results),
+        'results': pokemon_fragments(results),
+    })
 
 @api_view(['GET'])
+@authentication_classes([])
 @permission_classes([AllowAny])
 @handle_api_errors
+@http_cache()
+@cache_rendered_response('pokemon_evolution_chain', params=('expand',))
 def pokemon_evolution_chain_view(request, name):
     """
     Return a Pokémon's full evolution chain as a nested structure.
     Example: bulbasaur → ivysaur → venusaur
+    With ?expand=details every node also carries its sprite, types, abilities, etc.
     """
-    chain = fetch_pokemon_evolution_chain(name)
-    if not chain:
+    try:
+        chain = fetch_pokemon_evolution_chain(name)
+    except PokemonNotFound:
         return Response(
             {'error': f'Evolution chain for Pokémon "{name}" not found.'},
             status=status.HTTP_404_NOT_FOUND
         )
-    
-    return Response(chain)
+    if not chain:
+        return Response({'error': 'Failed to fetch the evolution chain.'}, status=status.HTTP_502_BAD_GATEWAY)
+
+    expand = request.GET.get('expand', '').strip().lower()
+    complete = True
+    if expand == 'details':
+        chain, complete = hydrate_evolution_chain(chain)
+
+    response = Response(chain)
+    # Don't pin a chain with failed upstream fetches in the response cache
+    response.skip_response_cache = not complete
+    return response
 
 @api_view(['GET'])
+@authentication_classes([])
 @permission_classes([AllowAny])
 @handle_api_errors
+@http_cache()
+@cache_rendered_response('move_pokemon', params=())
+def move_pokemon(request, name):
+    """Every Pokémon that learns a move, in catalog order, with its catalog fields (name, id, url)."""
+    move = name.strip().lower()
+    catalog = get_catalog()
+    if catalog is None:
+        return Response({'error': 'Failed to fetch Pokémon list.'}, status=status.HTTP_502_BAD_GATEWAY)
+
+    try:
+        matches = resolve_filters(catalog, {'move': move})
+    except FilterUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+    if not matches:
+        return Response({'error': f'Move {name} not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'move': move,
+        'count': bitmap.count(matches),
+        'results': [catalog.catalog_entry(position) for position in bitmap.iter_positions(matches)],
+    })
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@handle_api_errors
+@http_cache(max_age=3600)
+@cache_rendered_response('types_list', params=())
 def types_list(request):
     """Fetch all Pokémon types."""
     try:
         types = fetch_all_types()
-        return Response(types)
+        response = Response(types)
+        # An empty list means the upstream call failed; don't cache it
+        response.skip_response_cache = not types
+        return response
     except Exception as e:
         logger.error(f"Error fetching types: {str(e)}")
         return Response(
@@ -328,16 +720,36 @@ def types_list(request):
         )
 
 @api_view(['GET'])
+@authentication_classes([])
 @permission_classes([AllowAny])
 @handle_api_errors
+@http_cache(max_age=3600)
+@cache_rendered_response('abilities_list', params=())
 def abilities_list(request):
     """Fetch all Pokémon abilities."""
     try:
         abilities = fetch_all_abilities()
-        return Response(abilities)
+        response = Response(abilities)
+        # An empty list means the upstream call failed; don't cache it
+        response.skip_response_cache = not abilities
+        return response
     except Exception as e:
         logger.error(f"Error fetching abilities: {str(e)}")
         return Response(
             {'error': 'Failed to fetch abilities.'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@handle_api_errors
+def response_cache_stats_view(request):
+    """Hit/miss counters of the rendered-response cache, per route."""
+    return Response(response_cache_stats())
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def metrics_view(request):
+    """Request, cache, upstream and queue metrics of all workers, in the Prometheus text format."""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
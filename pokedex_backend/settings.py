@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,12 +45,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.middleware.MetricsMiddleware',
+    'myapp.middleware.ServerTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'myapp.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -143,8 +148,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'myapp.renderers.PokemonJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# PokeAPI root; point it at a local stub (python -m benchmarks.pokeapi_stub)
+# to run without network access
+POKEAPI_BASE_URL = os.environ.get('POKEAPI_BASE_URL', 'https://pokeapi.co/api/v2')
+
 # Cache settings
 CACHES = {
     'default': {
@@ -153,6 +166,69 @@ CACHES = {
     }
 }
 
+# The pokedex_refresher worker runs in its own process, so web workers only
+# pick up its snapshots and dataset version bumps through a shared cache
+if os.environ.get('POKEDEX_CACHE_DIR'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['POKEDEX_CACHE_DIR'],
+    }
+
+# Authentication and sessions
+# With a cache shared by every worker, sessions are written through to the
+# database but read from the cache, and session users are resolved from the
+# cache too, so a warm session costs no queries. Logout and password changes
+# invalidate those entries with cache deletes, which a per-process cache
+# can't propagate to the other workers, so without POKEDEX_CACHE_DIR both
+# are read from the database (myapp/checks.py enforces this).
+if os.environ.get('POKEDEX_CACHE_DIR'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTHENTICATION_BACKENDS = [
+        'myapp.auth_backends.CachedModelBackend',
+    ]
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = [
+        'django.contrib.auth.backends.ModelBackend',
+    ]
+
+# The dataset version and the refresher's catalog snapshot never expire and
+# must not be culled with the details, so they get a cache of their own. It
+# is file-based so every worker process on the host sees the same version
+# (and therefore the same ETags); point POKEDEX_STATE_DIR at shared storage
+# when the refresher runs elsewhere. It only ever holds a few keys.
+POKEDEX_STATE_DIR = os.environ.get('POKEDEX_STATE_DIR', str(BASE_DIR / 'pokedex_state'))
+CACHES['state'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': POKEDEX_STATE_DIR,
+    'TIMEOUT': None,
+    'OPTIONS': {'MAX_ENTRIES': 1000000},
+}
+
+# `manage.py test` keeps the state in memory so a test run never writes
+# (or reads a stale dataset version from) POKEDEX_STATE_DIR
+if sys.argv[1:2] == ['test']:
+    CACHES['state'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pokedex-state',
+        'TIMEOUT': None,
+    }
+
 # Cache timeouts (in seconds)
 CACHE_TTL = 3600  # 1 hour
 DETAIL_CACHE_TTL = 86400  # 24 hours
+
+# Background prefetching of the next pokemon_list page and likely-next
+# evolution chains (see myapp/prefetch.py)
+POKEDEX_PREFETCH_ENABLED = False
+
+# Directory where each worker process writes its metrics, so /api/metrics/
+# reports for the whole gunicorn pool (see myapp/metrics.py)
+POKEDEX_METRICS_DIR = os.environ.get('POKEDEX_METRICS_DIR')
+
+# Server-Timing spans on every response, and opt-in cProfile captures of
+# single requests (staff users sending `X-Pokedex-Profile: 1`, or a random
+# sample) written to POKEDEX_PROFILE_DIR (see myapp/middleware.py)
+POKEDEX_SERVER_TIMING = True
+POKEDEX_PROFILE_DIR = os.environ.get('POKEDEX_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+POKEDEX_PROFILE_SAMPLE_RATE = float(os.environ.get('POKEDEX_PROFILE_SAMPLE_RATE', '0'))